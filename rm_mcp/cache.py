@@ -21,6 +21,10 @@ _cached_collection = None
 _cached_root_hash: Optional[str] = None
 _cache_timestamp: float = 0.0
 
+# Bumped whenever the cached collection is replaced or dropped, so memos
+# built from a collection can tell a refresh from reuse of the same object
+_collection_generation = 0
+
 try:
     _CACHE_TTL_SECONDS = int(os.environ.get("REMARKABLE_CACHE_TTL", "60"))
 except ValueError:
@@ -33,15 +37,20 @@ def get_cached_collection() -> Tuple[Any, List]:
     Get the client and document collection, using a cache to avoid redundant fetches.
 
     Cache strategy:
-    - If cache is < 60s old, return it immediately (0 requests)
+    - If cache is younger than REMARKABLE_CACHE_TTL (default 60s), return it
+      immediately (0 requests)
     - Else fetch root hash (1 request), compare to cached hash
     - If unchanged, refresh timestamp and return cache (1 request total)
     - If changed, do a full re-fetch
 
+    Setting REMARKABLE_CACHE_TTL=0 makes the root hash the only freshness
+    check: every call costs one root-hash request, and the full collection
+    is only re-fetched when the hash changes.
+
     Returns:
         Tuple of (client, collection)
     """
-    global _cached_collection, _cached_root_hash, _cache_timestamp
+    global _cached_collection, _cached_root_hash, _cache_timestamp, _collection_generation
 
     from rm_mcp.api import get_rmapi
 
@@ -59,6 +68,7 @@ def get_cached_collection() -> Tuple[Any, List]:
     if not hasattr(client, "get_root_hash"):
         collection = client.get_meta_items()
         _cached_collection = collection
+        _collection_generation += 1
         _cache_timestamp = time.time()
         return client, collection
 
@@ -69,6 +79,7 @@ def get_cached_collection() -> Tuple[Any, List]:
         # If root hash fetch fails, do a full re-fetch
         collection = client.get_meta_items()
         _cached_collection = collection
+        _collection_generation += 1
         _cache_timestamp = time.time()
         return client, collection
 
@@ -82,11 +93,17 @@ def get_cached_collection() -> Tuple[Any, List]:
     logger.debug("Collection cache miss — fetching full collection")
     collection = client.get_meta_items(root_hash=current_hash)
     _cached_collection = collection
+    _collection_generation += 1
     _cached_root_hash = current_hash
     _cache_timestamp = time.time()
     return client, collection
 
 
+def collection_generation() -> int:
+    """Return the collection cache's refresh counter."""
+    return _collection_generation
+
+
 def set_cached_collection(client, collection, root_hash: Optional[str] = None) -> None:
     """
     Populate the collection cache from an external source (e.g., background loader).
@@ -100,7 +117,7 @@ def set_cached_collection(client, collection, root_hash: Optional[str] = None) -
         root_hash: Optional root hash to avoid an extra network call.
                    If not provided, will attempt to fetch from client.
     """
-    global _cached_collection, _cached_root_hash, _cache_timestamp
+    global _cached_collection, _cached_root_hash, _cache_timestamp, _collection_generation
 
     # Also set the client singleton in api.py
     import rm_mcp.api as api_mod
@@ -108,6 +125,7 @@ def set_cached_collection(client, collection, root_hash: Optional[str] = None) -
     api_mod._client_singleton = client
 
     _cached_collection = collection
+    _collection_generation += 1
     # Use provided root hash or try to get one for future comparisons
     if root_hash is not None:
         _cached_root_hash = root_hash
@@ -121,8 +139,9 @@ def set_cached_collection(client, collection, root_hash: Optional[str] = None) -
 
 def invalidate_collection_cache() -> None:
     """Force the next get_cached_collection() call to re-fetch."""
-    global _cached_collection, _cached_root_hash, _cache_timestamp
+    global _cached_collection, _cached_root_hash, _cache_timestamp, _collection_generation
     _cached_collection = None
+    _collection_generation += 1
     _cached_root_hash = None
     _cache_timestamp = 0.0
 
@@ -170,9 +189,11 @@ def clear_extraction_cache(doc_id: Optional[str] = None) -> None:
         keys_to_remove = [k for k in _page_ocr_cache if k[0] == doc_id]
         for key in keys_to_remove:
             _page_ocr_cache.pop(key, None)
+        _page_count_cache.pop(doc_id, None)
     else:
         _extraction_cache.clear()
         _page_ocr_cache.clear()
+        _page_count_cache.clear()
 
 
 def get_cached_page_ocr(
@@ -292,20 +313,17 @@ def get_cached_ocr_result(
     return None
 
 
-def cache_ocr_result(
+def cache_extraction_result(
     doc_id: str,
     result: Dict[str, Any],
-    include_ocr: bool = True,
+    include_ocr: bool,
 ) -> None:
     """
-    Cache an OCR result for a document.
-
-    Writes to both L1 (in-memory) and L2 (SQLite index).
+    Cache a document extraction result in memory (L1 only).
 
     Args:
         doc_id: Document ID
-        result: Extraction result dict with keys: typed_text, highlights,
-                handwritten_text, pages, page_ids, ocr_backend
+        result: Extraction result dict from extract_text_from_document_zip
         include_ocr: Whether this result includes OCR content
     """
     _extraction_cache[doc_id] = {
@@ -314,9 +332,29 @@ def cache_ocr_result(
         "timestamp": time.time(),
     }
     if len(_extraction_cache) > _MAX_EXTRACTION_CACHE_SIZE:
+        # Evict oldest entries (dicts keep insertion order)
         excess = len(_extraction_cache) - _MAX_EXTRACTION_CACHE_SIZE
         for key in list(_extraction_cache.keys())[:excess]:
-            del _extraction_cache[key]
+            _extraction_cache.pop(key, None)
+
+
+def cache_ocr_result(
+    doc_id: str,
+    result: Dict[str, Any],
+    include_ocr: bool = True,
+) -> None:
+    """
+    Cache an OCR result for a document.
+
+    Writes to both L1 (in-memory) and L2 (SQLite index).
+
+    Args:
+        doc_id: Document ID
+        result: Extraction result dict with keys: typed_text, highlights,
+                handwritten_text, pages, page_ids, ocr_backend
+        include_ocr: Whether this result includes OCR content
+    """
+    cache_extraction_result(doc_id, result, include_ocr)
 
     # L2: write-through to SQLite index
     try:
@@ -329,6 +367,99 @@ def cache_ocr_result(
         logger.debug("L2 write failed for extraction result", exc_info=True)
 
 
+# =============================================================================
+# Page count cache
+# =============================================================================
+
+# Per-document notebook page counts, so a cached sampling-OCR read can be
+# served without downloading the document just to count its pages.
+# Key: doc_id
+# Value: {"modified": Optional[str], "count": int}
+_page_count_cache: Dict[str, Dict[str, Any]] = {}
+_MAX_PAGE_COUNT_CACHE_SIZE = 500
+
+
+def _modified_key(modified: Any) -> Optional[str]:
+    """Normalize a ModifiedClient value into a comparable cache key."""
+    if modified is None:
+        return None
+    return str(modified)
+
+
+def get_cached_page_count(doc_id: str, modified: Any = None) -> Optional[int]:
+    """
+    Get the cached page count for a document version.
+
+    Checks L1 (in-memory) first, then falls back to L2 (SQLite index).
+    Entries are only returned if they were stored for the same ModifiedClient
+    value, so an edited document is re-counted.
+
+    Args:
+        doc_id: Document ID
+        modified: The document's ModifiedClient value
+
+    Returns:
+        Cached page count or None if not cached/stale
+    """
+    modified_key = _modified_key(modified)
+
+    # L1: in-memory cache
+    cached = _page_count_cache.get(doc_id)
+    if cached is not None:
+        if cached["modified"] == modified_key:
+            return cached["count"]
+        _page_count_cache.pop(doc_id, None)
+
+    # L2: SQLite index (only when we have a version to validate against)
+    if modified_key is None:
+        return None
+    try:
+        from rm_mcp.index import get_instance
+
+        index = get_instance()
+        if index is not None:
+            count = index.get_page_count(doc_id, modified_key)
+            if count is not None:
+                _page_count_cache[doc_id] = {"modified": modified_key, "count": count}
+                return count
+    except Exception:
+        logger.debug("L2 read failed for page count", exc_info=True)
+
+    return None
+
+
+def cache_page_count(doc_id: str, modified: Any, count: int) -> None:
+    """
+    Cache the page count for a document version.
+
+    Writes to both L1 (in-memory) and L2 (SQLite index).
+
+    Args:
+        doc_id: Document ID
+        modified: The document's ModifiedClient value
+        count: Number of pages in the document
+    """
+    modified_key = _modified_key(modified)
+    _page_count_cache[doc_id] = {"modified": modified_key, "count": count}
+    if len(_page_count_cache) > _MAX_PAGE_COUNT_CACHE_SIZE:
+        excess = len(_page_count_cache) - _MAX_PAGE_COUNT_CACHE_SIZE
+        for key in list(_page_count_cache.keys())[:excess]:
+            del _page_count_cache[key]
+
+    if modified_key is None:
+        return
+
+    # L2: write-through to SQLite index
+    try:
+        from rm_mcp.index import get_instance
+
+        index = get_instance()
+        if index is not None:
+            index.upsert_document(doc_id=doc_id, modified_at=modified_key, page_count=count)
+    except Exception:
+        logger.debug("L2 write failed for page count", exc_info=True)
+
+
 # =============================================================================
 # File type cache (from tools.py)
 # =============================================================================
@@ -10,6 +10,7 @@ Based on the protocol used by ddvk/rmapi.
 import json
 import logging
 import os
+import sys
 import threading
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timezone
@@ -27,6 +28,11 @@ logger = logging.getLogger(__name__)
 # Maximum number of parallel workers for fetching document metadata
 _PARALLEL_WORKERS = int(os.environ.get("REMARKABLE_PARALLEL_WORKERS", "5"))
 
+# (connect, read) timeouts: fail fast on an unreachable host, but allow
+# slow responses once connected
+_AUTH_TIMEOUT = (5, 30)
+_SYNC_TIMEOUT = (5, 60)
+
 # API endpoints
 # Note: my.remarkable.com endpoints redirect to doesnotexist.remarkable.com
 # So we use webapp-prod.cloud.remarkable.engineering for auth
@@ -72,7 +78,7 @@ class RemarkableClient:
         headers = {"Authorization": f"Bearer {self.device_token}"}
 
         try:
-            response = self._session.post(USER_TOKEN_URL, headers=headers, timeout=30)
+            response = self._session.post(USER_TOKEN_URL, headers=headers, timeout=_AUTH_TIMEOUT)
             if response.status_code == 200 and response.text:
                 self.user_token = response.text.strip()
                 return self.user_token
@@ -90,7 +96,7 @@ class RemarkableClient:
             self.renew_token()
 
         headers = {"Authorization": f"Bearer {self.user_token}"}
-        response = self._session.request(method, url, headers=headers, timeout=60)
+        response = self._session.request(method, url, headers=headers, timeout=_SYNC_TIMEOUT)
 
         if response.status_code == 401:
             # Token expired, try to renew (thread-safe)
@@ -100,7 +106,7 @@ class RemarkableClient:
                 if headers["Authorization"] == current_auth:
                     self.renew_token()
             headers = {"Authorization": f"Bearer {self.user_token}"}
-            response = self._session.request(method, url, headers=headers, timeout=60)
+            response = self._session.request(method, url, headers=headers, timeout=_SYNC_TIMEOUT)
 
         return response
 
@@ -219,12 +225,18 @@ class RemarkableClient:
             except (ValueError, TypeError):
                 pass
 
+        # IDs are repeated as the parent of every child; interning lets them
+        # share one string and makes ID/parent lookups identity hits
+        parent = metadata.get("parent", "")
+        if isinstance(parent, str):
+            parent = sys.intern(parent)
+
         return Document(
-            id=doc_id,
+            id=sys.intern(doc_id),
             hash=doc_hash,
             name=metadata.get("visibleName", doc_id),
             doc_type=metadata.get("type", "DocumentType"),
-            parent=metadata.get("parent", ""),
+            parent=parent,
             deleted=metadata.get("deleted", False),
             pinned=metadata.get("pinned", False),
             last_modified=last_modified,
@@ -369,7 +381,7 @@ def register_device(one_time_code: str) -> Dict[str, str]:
     }
 
     try:
-        response = requests.post(DEVICE_TOKEN_URL, json=body, timeout=30)
+        response = requests.post(DEVICE_TOKEN_URL, json=body, timeout=_AUTH_TIMEOUT)
         if response.status_code == 200 and response.text:
             device_token = response.text.strip()
             return {"devicetoken": device_token, "usertoken": ""}
@@ -9,6 +9,7 @@ from rm_mcp.cache import (  # noqa: F401
     _MAX_EXTRACTION_CACHE_SIZE,
     _extraction_cache,
     _is_cache_valid,
+    cache_extraction_result,
     cache_ocr_result,
     cache_page_ocr,
     clear_extraction_cache,
@@ -6,16 +6,14 @@ and document text extraction.
 """
 
 import json
-import tempfile
-import time
 import zipfile
-from pathlib import Path
-from typing import Any, Dict, List, Optional
+from pathlib import Path, PurePosixPath
+from typing import IO, Any, Callable, Dict, List, Optional, TypeVar
 
 from rm_mcp.cache import (
-    _MAX_EXTRACTION_CACHE_SIZE,
     _extraction_cache,
     _is_cache_valid,
+    cache_extraction_result,
 )
 
 
@@ -36,15 +34,23 @@ def extract_text_from_rm_file(rm_file_path: Path) -> List[str]:
     This extracts text that was typed via Type Folio or on-screen keyboard.
     Does NOT require OCR - text is stored natively in v6 .rm files.
     """
+    try:
+        with open(rm_file_path, "rb") as f:
+            return _extract_text_from_rm_stream(f)
+    except OSError:
+        return []
+
+
+def _extract_text_from_rm_stream(f: IO[bytes]) -> List[str]:
+    """Extract typed text from an open binary .rm stream (see extract_text_from_rm_file)."""
     try:
         from rmscene import read_blocks
         from rmscene.scene_items import Text
         from rmscene.scene_tree import SceneTree
 
-        with open(rm_file_path, "rb") as f:
-            tree = SceneTree()
-            for block in read_blocks(f):
-                tree.add_block(block)
+        tree = SceneTree()
+        for block in read_blocks(f):
+            tree.add_block(block)
 
         text_lines = []
 
@@ -66,6 +72,40 @@ def extract_text_from_rm_file(rm_file_path: Path) -> List[str]:
         return []
 
 
+_T = TypeVar("_T")
+
+
+def _page_order_from_content(data: Any) -> List[str]:
+    """Return the page IDs listed in parsed .content metadata, in order."""
+    # New format: cPages.pages array
+    if "cPages" in data and "pages" in data["cPages"]:
+        return [p["id"] for p in data["cPages"]["pages"]]
+    # Fallback: pages array directly
+    if "pages" in data and isinstance(data["pages"], list):
+        return data["pages"]
+    return []
+
+
+def _order_pages(
+    page_order: List[str], rm_files: List[_T], stem: Callable[[_T], str]
+) -> List[Optional[_T]]:
+    """Order .rm entries by page ID, with None for blank pages.
+
+    Entries not listed in page_order are appended; with no page order the
+    entries are returned as given.
+    """
+    if not page_order:
+        return list(rm_files)
+
+    rm_by_id = {stem(rm_file): rm_file for rm_file in rm_files}
+    # None for blank pages (no .rm file)
+    ordered: List[Optional[_T]] = [rm_by_id.get(page_id) for page_id in page_order]
+    # Add any remaining files not in page order
+    seen = set(page_order)
+    ordered.extend(rm_file for rm_file in rm_files if stem(rm_file) not in seen)
+    return ordered
+
+
 def _get_ordered_rm_files(tmpdir_path: Path) -> List[Optional[Path]]:
     """Extract and order .rm files from an extracted document directory.
 
@@ -83,39 +123,36 @@ def _get_ordered_rm_files(tmpdir_path: Path) -> List[Optional[Path]]:
     page_order = []
     for content_file in tmpdir_path.glob("*.content"):
         try:
-            data = json.loads(content_file.read_text())
-            # New format: cPages.pages array
-            if "cPages" in data and "pages" in data["cPages"]:
-                page_order = [p["id"] for p in data["cPages"]["pages"]]
-            # Fallback: pages array directly
-            elif "pages" in data and isinstance(data["pages"], list):
-                page_order = data["pages"]
+            page_order = _page_order_from_content(json.loads(content_file.read_text()))
         except Exception:
             # Ignore errors reading/parsing .content file; fallback to default page order
             pass
         break
 
     rm_files = list(tmpdir_path.glob("**/*.rm"))
+    return _order_pages(page_order, rm_files, lambda rm_file: rm_file.stem)
+
 
-    # Sort rm_files by page order if available
-    if page_order:
-        rm_by_id = {}
-        for rm_file in rm_files:
-            page_id = rm_file.stem
-            rm_by_id[page_id] = rm_file
+def _member_stem(name: str) -> str:
+    """Return the file stem of a zip member name."""
+    return PurePosixPath(name).stem
 
-        ordered: List[Optional[Path]] = []
-        for page_id in page_order:
-            # None for blank pages (no .rm file)
-            ordered.append(rm_by_id.get(page_id))
-        # Add any remaining files not in page order
-        seen = set(page_order)
-        for rm_file in rm_files:
-            if rm_file.stem not in seen:
-                ordered.append(rm_file)
-        return ordered
 
-    return rm_files
+def _get_ordered_rm_members(zf: zipfile.ZipFile, names: List[str]) -> List[Optional[str]]:
+    """Like _get_ordered_rm_files, but for member names read straight from the zip."""
+    page_order = []
+    for name in names:
+        if "/" not in name and name.endswith(".content"):
+            try:
+                with zf.open(name) as f:
+                    page_order = _page_order_from_content(json.load(f))
+            except Exception:
+                # Ignore errors reading/parsing .content file; fallback to default page order
+                pass
+            break
+
+    rm_members = [name for name in names if name.endswith(".rm")]
+    return _order_pages(page_order, rm_members, _member_stem)
 
 
 def get_document_page_count(zip_path: Path) -> int:
@@ -131,26 +168,25 @@ def get_document_page_count(zip_path: Path) -> int:
     Returns:
         Number of pages (0 if unable to determine)
     """
-    with tempfile.TemporaryDirectory() as tmpdir:
-        tmpdir_path = Path(tmpdir)
-
-        with zipfile.ZipFile(zip_path, "r") as zf:
-            _safe_extractall(zf, tmpdir_path)
+    with zipfile.ZipFile(zip_path, "r") as zf:
+        names = zf.namelist()
 
         # Read page count from .content metadata (includes blank pages)
-        for content_file in tmpdir_path.glob("*.content"):
-            try:
-                data = json.loads(content_file.read_text())
-                if "cPages" in data and "pages" in data["cPages"]:
-                    return len(data["cPages"]["pages"])
-                if "pages" in data and isinstance(data["pages"], list):
-                    return len(data["pages"])
-            except Exception:
-                pass
-            break
+        for name in names:
+            if "/" not in name and name.endswith(".content"):
+                try:
+                    with zf.open(name) as f:
+                        data = json.load(f)
+                    if "cPages" in data and "pages" in data["cPages"]:
+                        return len(data["cPages"]["pages"])
+                    if "pages" in data and isinstance(data["pages"], list):
+                        return len(data["pages"])
+                except Exception:
+                    pass
+                break
 
         # Fallback: count .rm files (misses blank pages)
-        return len(list(tmpdir_path.glob("**/*.rm")))
+        return sum(1 for name in names if name.endswith(".rm"))
 
 
 def extract_text_from_document_zip(
@@ -191,45 +227,41 @@ def extract_text_from_document_zip(
         "ocr_backend": None,
     }
 
-    with tempfile.TemporaryDirectory() as tmpdir:
-        tmpdir_path = Path(tmpdir)
+    # Members are streamed straight from the archive; nothing is extracted
+    # to disk and only one member is held in memory at a time
+    with zipfile.ZipFile(zip_path, "r") as zf:
+        names = [name for name in zf.namelist() if not name.endswith("/")]
 
-        with zipfile.ZipFile(zip_path, "r") as zf:
-            _safe_extractall(zf, tmpdir_path)
-
-        rm_files = _get_ordered_rm_files(tmpdir_path)
-        result["page_ids"] = [f.stem if f else None for f in rm_files]
-        result["pages"] = len(rm_files)
+        rm_members = _get_ordered_rm_members(zf, names)
+        result["page_ids"] = [_member_stem(name) if name else None for name in rm_members]
+        result["pages"] = len(rm_members)
 
         # Extract typed text from .rm files using rmscene (skip blank pages)
-        for rm_file in rm_files:
-            if rm_file is not None:
-                text_lines = extract_text_from_rm_file(rm_file)
-                result["typed_text"].extend(text_lines)
+        for name in rm_members:
+            if name is not None:
+                with zf.open(name) as f:
+                    result["typed_text"].extend(_extract_text_from_rm_stream(f))
 
         # Extract text from .txt and .md files
-        for txt_file in tmpdir_path.glob("**/*.txt"):
-            try:
-                content = txt_file.read_text(errors="ignore")
-                if content.strip():
-                    result["typed_text"].append(content)
-            except Exception:
-                # File read failed - skip this file and continue
-                pass
-
-        for md_file in tmpdir_path.glob("**/*.md"):
-            try:
-                content = md_file.read_text(errors="ignore")
-                if content.strip():
-                    result["typed_text"].append(content)
-            except Exception:
-                # File read failed - skip this file and continue
-                pass
+        for suffix in (".txt", ".md"):
+            for name in names:
+                if not name.endswith(suffix):
+                    continue
+                try:
+                    content = zf.read(name).decode(errors="ignore")
+                    if content.strip():
+                        result["typed_text"].append(content)
+                except Exception:
+                    # File read failed - skip this file and continue
+                    pass
 
         # Extract from .content files (metadata with text)
-        for content_file in tmpdir_path.glob("**/*.content"):
+        for name in names:
+            if not name.endswith(".content"):
+                continue
             try:
-                data = json.loads(content_file.read_text())
+                with zf.open(name) as f:
+                    data = json.load(f)
                 if "text" in data:
                     result["typed_text"].append(data["text"])
             except Exception:
@@ -237,9 +269,12 @@ def extract_text_from_document_zip(
                 pass
 
         # Extract PDF highlights
-        for json_file in tmpdir_path.glob("**/*.json"):
+        for name in names:
+            if not name.endswith(".json"):
+                continue
             try:
-                data = json.loads(json_file.read_text())
+                with zf.open(name) as f:
+                    data = json.load(f)
                 if isinstance(data, dict) and "highlights" in data:
                     for h in data.get("highlights", []):
                         if "text" in h and h["text"]:
@@ -253,16 +288,6 @@ def extract_text_from_document_zip(
 
     # Cache result if doc_id provided
     if doc_id:
-        _extraction_cache[doc_id] = {
-            "result": result,
-            "include_ocr": include_ocr,
-            "timestamp": time.time(),
-        }
-        if len(_extraction_cache) > _MAX_EXTRACTION_CACHE_SIZE:
-            # Evict oldest entries (by insertion order, dicts are ordered in Python 3.7+)
-            excess = len(_extraction_cache) - _MAX_EXTRACTION_CACHE_SIZE
-            keys_to_remove = list(_extraction_cache.keys())[:excess]
-            for key in keys_to_remove:
-                del _extraction_cache[key]
+        cache_extraction_result(doc_id, result, include_ocr)
 
     return result
@@ -7,13 +7,14 @@ Survives restarts and enables full-text content search across previously-read do
 DB location: ~/.cache/rm-mcp/index.db (override via REMARKABLE_INDEX_PATH env var)
 """
 
+import json
 import logging
 import os
 import sqlite3
 import threading
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
@@ -23,6 +24,25 @@ _DEFAULT_DB_PATH = _DEFAULT_DB_DIR / "index.db"
 
 _SCHEMA_VERSION = 1
 
+# Per-connection tuning. The index is a rebuildable cache, so NORMAL sync
+# (fsync on checkpoint only) is durable enough under WAL.
+_CONNECTION_PRAGMAS = """
+PRAGMA journal_mode=WAL;
+PRAGMA synchronous=NORMAL;
+PRAGMA temp_store=MEMORY;
+PRAGMA mmap_size=268435456;
+PRAGMA cache_size=-64000;
+PRAGMA busy_timeout=5000;
+PRAGMA foreign_keys=ON;
+"""
+
+# In-memory databases have no journal file to tune or sync
+_MEMORY_CONNECTION_PRAGMAS = """
+PRAGMA synchronous=OFF;
+PRAGMA temp_store=MEMORY;
+PRAGMA foreign_keys=ON;
+"""
+
 _SCHEMA_SQL = """
 CREATE TABLE IF NOT EXISTS _meta (
     key TEXT PRIMARY KEY,
@@ -117,6 +137,12 @@ class DocumentIndex:
 
         self._db_path = db_path
         self._local = threading.local()
+        # Every thread's connection, so close() can reach them all
+        self._connections: List[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
+        # Bumped after every write; counts and stats are cached against it
+        self._version = 0
+        self._snapshot_cache: Dict[str, Any] = {}
 
         # Ensure parent directory exists (skip for :memory:)
         if db_path != ":memory:":
@@ -150,11 +176,16 @@ class DocumentIndex:
         """Get a thread-local database connection."""
         conn = getattr(self._local, "conn", None)
         if conn is None:
-            conn = sqlite3.connect(self._db_path)
-            conn.execute("PRAGMA journal_mode=WAL")
-            conn.execute("PRAGMA foreign_keys=ON")
+            # Opened and used on one thread; only close() touches it from another
+            conn = sqlite3.connect(self._db_path, check_same_thread=False)
+            if self._db_path == ":memory:":
+                conn.executescript(_MEMORY_CONNECTION_PRAGMAS)
+            else:
+                conn.executescript(_CONNECTION_PRAGMAS)
             conn.row_factory = sqlite3.Row
             self._local.conn = conn
+            with self._connections_lock:
+                self._connections.append(conn)
         return conn
 
     # -----------------------------------------------------------------
@@ -185,12 +216,19 @@ class DocumentIndex:
                 path = COALESCE(excluded.path, documents.path),
                 file_type = COALESCE(excluded.file_type, documents.file_type),
                 modified_at = COALESCE(excluded.modified_at, documents.modified_at),
-                page_count = COALESCE(excluded.page_count, documents.page_count),
+                -- A count recorded for an older version must not outlive it
+                page_count = CASE
+                    WHEN excluded.modified_at IS NOT NULL
+                        AND excluded.modified_at IS NOT documents.modified_at
+                    THEN excluded.page_count
+                    ELSE COALESCE(excluded.page_count, documents.page_count)
+                END,
                 indexed_at = excluded.indexed_at
             """,
             (doc_id, doc_hash, name, path, file_type, modified_at, page_count, now),
         )
         conn.commit()
+        self._version += 1
 
     def get_document_hash(self, doc_id: str) -> Optional[str]:
         """Get the stored hash for a document."""
@@ -198,6 +236,15 @@ class DocumentIndex:
         row = conn.execute("SELECT doc_hash FROM documents WHERE doc_id = ?", (doc_id,)).fetchone()
         return row["doc_hash"] if row else None
 
+    def get_page_count(self, doc_id: str, modified_at: str) -> Optional[int]:
+        """Get the stored page count for a document, if recorded for this version."""
+        conn = self._get_connection()
+        row = conn.execute(
+            "SELECT page_count FROM documents WHERE doc_id = ? AND modified_at = ?",
+            (doc_id, modified_at),
+        ).fetchone()
+        return row["page_count"] if row else None
+
     def needs_reindex(self, doc_id: str, current_hash: str) -> bool:
         """Check if a document needs re-indexing based on hash comparison.
 
@@ -217,6 +264,7 @@ class DocumentIndex:
             )
             conn.execute("DELETE FROM pages WHERE doc_id = ?", (doc_id,))
             conn.commit()
+            self._version += 1
             logger.debug(f"Cleared stale pages for document {doc_id}")
             return True
         return False
@@ -234,44 +282,68 @@ class DocumentIndex:
         ocr_backend: Optional[str] = None,
     ) -> None:
         """Insert or update page content and sync FTS index."""
-        conn = self._get_connection()
-        now = datetime.now(timezone.utc).isoformat()
-
-        # Check if row already exists (for FTS cleanup)
-        existing = conn.execute(
-            "SELECT rowid FROM pages WHERE doc_id = ? AND page_number = ? AND content_type = ?",
-            (doc_id, page_number, content_type),
-        ).fetchone()
+        self.upsert_pages_bulk([(doc_id, page_number, content_type, content, ocr_backend)])
 
-        if existing:
-            old_rowid = existing[0]
-            # Delete old FTS entry
-            conn.execute("DELETE FROM pages_fts WHERE rowid = ?", (old_rowid,))
+    def upsert_pages_bulk(
+        self,
+        rows: List[Tuple[str, int, str, str, Optional[str]]],
+    ) -> None:
+        """Insert or update many pages and sync the FTS index in one transaction.
 
-        conn.execute(
-            """
-            INSERT INTO pages (doc_id, page_number, content_type, content, ocr_backend, indexed_at)
-            VALUES (?, ?, ?, ?, ?, ?)
-            ON CONFLICT(doc_id, page_number, content_type) DO UPDATE SET
-                content = excluded.content,
-                ocr_backend = excluded.ocr_backend,
-                indexed_at = excluded.indexed_at
-            """,
-            (doc_id, page_number, content_type, content, ocr_backend, now),
-        )
+        Args:
+            rows: (doc_id, page_number, content_type, content, ocr_backend) tuples
+        """
+        if not rows:
+            return
+        # A key repeated within one batch would hit the unique constraint on
+        # the second insert; keep only its last row, as per-row upserts would
+        latest = {row[:3]: row for row in rows}
+        keys = list(latest)
+        conn = self._get_connection()
+        now = datetime.now(timezone.utc).isoformat()
 
-        # Get the rowid of the upserted row and insert into FTS
-        row = conn.execute(
-            "SELECT rowid FROM pages WHERE doc_id = ? AND page_number = ? AND content_type = ?",
-            (doc_id, page_number, content_type),
-        ).fetchone()
-        if row:
-            conn.execute(
-                "INSERT INTO pages_fts(rowid, doc_id, content) VALUES (?, ?, ?)",
-                (row[0], doc_id, content),
+        # Take the write lock up front so the whole batch is one transaction
+        if not conn.in_transaction:
+            conn.execute("BEGIN IMMEDIATE")
+        try:
+            # Drop stale FTS entries for rows that already exist
+            conn.executemany(
+                """
+                DELETE FROM pages_fts WHERE rowid IN (
+                    SELECT rowid FROM pages
+                    WHERE doc_id = ? AND page_number = ? AND content_type = ?
+                )
+                """,
+                keys,
+            )
+            conn.executemany(
+                """
+                INSERT INTO pages
+                    (doc_id, page_number, content_type, content, ocr_backend, indexed_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT(doc_id, page_number, content_type) DO UPDATE SET
+                    content = excluded.content,
+                    ocr_backend = excluded.ocr_backend,
+                    indexed_at = excluded.indexed_at
+                """,
+                [(*row, now) for row in latest.values()],
+            )
+            # Re-index the upserted rows under their (possibly new) rowids
+            conn.executemany(
+                """
+                INSERT INTO pages_fts(rowid, doc_id, content)
+                SELECT rowid, doc_id, content FROM pages
+                WHERE doc_id = ? AND page_number = ? AND content_type = ?
+                """,
+                keys,
             )
+        except Exception:
+            # Leave nothing half-applied for the thread's next commit
+            conn.rollback()
+            raise
 
         conn.commit()
+        self._version += 1
 
     def get_page_ocr(
         self, doc_id: str, page_number: int, backend: str = "sampling"
@@ -303,61 +375,21 @@ class DocumentIndex:
                     handwritten_text, pages, ocr_backend
         """
         ocr_backend = result.get("ocr_backend")
-        conn = self._get_connection()
-        now = datetime.now(timezone.utc).isoformat()
-
-        parts = []  # (page_number, content_type, content, ocr_backend)
+        rows = []  # (doc_id, page_number, content_type, content, ocr_backend)
 
         typed_text = result.get("typed_text", [])
         if typed_text:
-            parts.append((0, "typed_text", "\n\n".join(typed_text), None))
+            rows.append((doc_id, 0, "typed_text", "\n\n".join(typed_text), None))
 
         highlights = result.get("highlights", [])
         if highlights:
-            parts.append((0, "highlight", "\n\n".join(highlights), None))
+            rows.append((doc_id, 0, "highlight", "\n\n".join(highlights), None))
 
         handwritten = result.get("handwritten_text", [])
         if handwritten:
-            parts.append((0, "ocr", "\n\n".join(handwritten), ocr_backend))
-
-        if not parts:
-            return
-
-        for page_number, content_type, content, backend in parts:
-            # Clean up existing FTS entry
-            existing = conn.execute(
-                "SELECT rowid FROM pages WHERE doc_id = ? AND page_number = ? AND content_type = ?",
-                (doc_id, page_number, content_type),
-            ).fetchone()
-            if existing:
-                conn.execute("DELETE FROM pages_fts WHERE rowid = ?", (existing[0],))
-
-            # Upsert the page
-            conn.execute(
-                """
-                INSERT INTO pages
-                    (doc_id, page_number, content_type, content, ocr_backend, indexed_at)
-                VALUES (?, ?, ?, ?, ?, ?)
-                ON CONFLICT(doc_id, page_number, content_type) DO UPDATE SET
-                    content = excluded.content,
-                    ocr_backend = excluded.ocr_backend,
-                    indexed_at = excluded.indexed_at
-                """,
-                (doc_id, page_number, content_type, content, backend, now),
-            )
-
-            # Insert new FTS entry
-            row = conn.execute(
-                "SELECT rowid FROM pages WHERE doc_id = ? AND page_number = ? AND content_type = ?",
-                (doc_id, page_number, content_type),
-            ).fetchone()
-            if row:
-                conn.execute(
-                    "INSERT INTO pages_fts(rowid, doc_id, content) VALUES (?, ?, ?)",
-                    (row[0], doc_id, content),
-                )
+            rows.append((doc_id, 0, "ocr", "\n\n".join(handwritten), ocr_backend))
 
-        conn.commit()
+        self.upsert_pages_bulk(rows)
 
     # -----------------------------------------------------------------
     # Search
@@ -444,21 +476,73 @@ class DocumentIndex:
         combined = "\n\n".join(parts)
         return combined[:max_chars]
 
+    def get_content_snippets(self, doc_ids: List[str], max_chars: int = 2000) -> Dict[str, str]:
+        """Get concatenated content for several documents in one query.
+
+        Same text as ``get_content_snippet`` per document; documents with no
+        indexed content are left out of the result.
+        """
+        if not doc_ids:
+            return {}
+        conn = self._get_connection()
+        # One fixed SQL string for any number of ids, so sqlite3's statement
+        # cache reuses the prepared query instead of compiling one per length
+        rows = conn.execute(
+            "SELECT doc_id, content FROM pages "
+            "WHERE doc_id IN (SELECT value FROM json_each(?)) "
+            "ORDER BY doc_id, page_number, content_type",
+            (json.dumps(list(doc_ids)),),
+        ).fetchall()
+        parts_by_doc: Dict[str, List[str]] = {}
+        for r in rows:
+            if r["content"]:
+                parts_by_doc.setdefault(r["doc_id"], []).append(r["content"])
+        return {doc_id: "\n\n".join(parts)[:max_chars] for doc_id, parts in parts_by_doc.items()}
+
+    def _snapshot_key(self, conn: sqlite3.Connection) -> Tuple[int, sqlite3.Connection, int]:
+        """Key for results cached against the database's current contents.
+
+        ``_version`` covers writes through this instance; ``data_version``
+        changes when any other connection (another thread's, or another
+        process sharing the database file) commits. It is per-connection,
+        so the connection is part of the key.
+        """
+        data_version = conn.execute("PRAGMA data_version").fetchone()[0]
+        return self._version, conn, data_version
+
+    def _cached_count(self, sql: str) -> int:
+        """Run a COUNT query, reusing its result until the database changes."""
+        conn = self._get_connection()
+        key = self._snapshot_key(conn)
+        cached = self._snapshot_cache.get(sql)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        row = conn.execute(sql).fetchone()
+        count = row[0] if row else 0
+        self._snapshot_cache[sql] = (key, count)
+        return count
+
     def get_indexed_document_count(self) -> int:
         """Count documents that have at least one indexed page."""
-        conn = self._get_connection()
-        row = conn.execute("SELECT COUNT(DISTINCT doc_id) FROM pages").fetchone()
-        return row[0] if row else 0
+        return self._cached_count("SELECT COUNT(DISTINCT doc_id) FROM pages")
 
     # -----------------------------------------------------------------
     # Management
     # -----------------------------------------------------------------
 
     def get_stats(self) -> Dict[str, Any]:
-        """Get index statistics."""
-        conn = self._get_connection()
-        doc_count = conn.execute("SELECT COUNT(*) FROM documents").fetchone()[0]
-        page_count = conn.execute("SELECT COUNT(*) FROM pages").fetchone()[0]
+        """Get index statistics.
+
+        The snapshot is rebuilt only after a write, from this or any other
+        connection to the database; callers get a copy.
+        """
+        key = self._snapshot_key(self._get_connection())
+        cached = self._snapshot_cache.get("stats")
+        if cached is not None and cached[0] == key:
+            return dict(cached[1])
+
+        doc_count = self._cached_count("SELECT COUNT(*) FROM documents")
+        page_count = self._cached_count("SELECT COUNT(*) FROM pages")
 
         db_size = 0
         if self._db_path != ":memory:":
@@ -467,12 +551,14 @@ class DocumentIndex:
             except OSError:
                 pass
 
-        return {
+        stats = {
             "index_documents": doc_count,
             "index_pages": page_count,
             "index_size": db_size,
             "index_path": self._db_path,
         }
+        self._snapshot_cache["stats"] = (key, stats)
+        return dict(stats)
 
     def rebuild(self) -> None:
         """Rebuild the FTS index."""
@@ -487,14 +573,25 @@ class DocumentIndex:
         conn.execute("DELETE FROM pages")
         conn.execute("DELETE FROM documents")
         conn.commit()
+        self._version += 1
         logger.info("Document index cleared")
 
     def close(self) -> None:
-        """Close the thread-local connection (if any)."""
-        conn = getattr(self._local, "conn", None)
-        if conn is not None:
+        """Close every thread's connection.
+
+        A thread that uses the index afterwards opens a fresh connection.
+        """
+        with self._connections_lock:
+            connections, self._connections = self._connections, []
+            # A new local drops the stale handle from every thread at once
+            self._local = threading.local()
+        for conn in connections:
             conn.close()
-            self._local.conn = None
+
+    @property
+    def version(self) -> int:
+        """Write counter, bumped after every committed write."""
+        return self._version
 
     @property
     def db_path(self) -> str:
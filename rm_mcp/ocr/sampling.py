@@ -21,6 +21,7 @@ API keys or services.
 - Returns None if sampling is not available or fails
 """
 
+import asyncio
 import base64
 from typing import TYPE_CHECKING, List, Optional
 
@@ -72,6 +73,9 @@ You are extracting handwritten notes from a reMarkable tablet. Focus on accuracy
 
 OCR_USER_PROMPT = "Extract all text from this image. Output only the text content, nothing else."
 
+# Maximum number of sampling requests in flight when OCR-ing several pages
+_MAX_CONCURRENT_SAMPLING = 4
+
 
 async def ocr_via_sampling(
     ctx: "Context",
@@ -163,35 +167,35 @@ async def ocr_pages_via_sampling(
     ctx: "Context",
     png_data_list: List[bytes],
     max_tokens: int = 2000,
+    max_concurrency: int = _MAX_CONCURRENT_SAMPLING,
 ) -> Optional[List[str]]:
     """
     Perform OCR on multiple pages using the client's LLM via MCP sampling.
 
+    Pages are sent concurrently (at most ``max_concurrency`` in flight), since
+    each sampling request is dominated by waiting on the client's model.
+
     Args:
         ctx: The FastMCP Context object from a tool function
         png_data_list: List of PNG image bytes to perform OCR on
         max_tokens: Maximum tokens for each response (default: 2000)
+        max_concurrency: Maximum simultaneous sampling requests (default: 4)
 
     Returns:
-        List of extracted text (one per page), or None if all pages failed
+        List of extracted text (one per page, in input order), or None if all pages failed
     """
-    results = []
-    has_any_result = False
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
 
-    for png_data in png_data_list:
+    async def ocr_one(png_data: bytes) -> str:
         # Skip empty PNG data (failed renders) - just mark as empty string
         if not png_data:
-            results.append("")
-            continue
-
-        text = await ocr_via_sampling(ctx, png_data, max_tokens)
-        if text:
-            results.append(text)
-            has_any_result = True
-        else:
-            results.append("")  # Empty string for failed pages
+            return ""
+        async with semaphore:
+            text = await ocr_via_sampling(ctx, png_data, max_tokens)
+        return text or ""  # Empty string for failed pages
 
-    return results if has_any_result else None
+    results = await asyncio.gather(*(ocr_one(png_data) for png_data in png_data_list))
+    return list(results) if any(results) else None
 
 
 def get_ocr_backend() -> str:
@@ -6,7 +6,9 @@ Root path filtering, item path building, document lookup, and fuzzy matching.
 
 import os
 from difflib import SequenceMatcher
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from rm_mcp.cache import collection_generation
 
 # --- Root path utilities ---
 
@@ -38,6 +40,24 @@ def _is_within_root(path: str, root: str) -> bool:
     return path_lower == root_lower or path_lower.startswith(root_lower + "/")
 
 
+def make_within_root_predicate(root: str) -> Callable[[str], bool]:
+    """Build an ``_is_within_root`` check for one root, for use inside loops.
+
+    The root is lowercased and its child prefix built once, instead of on
+    every call.
+    """
+    if root == "/":
+        return lambda path: True
+    root_lower = root.lower()
+    root_prefix = root_lower + "/"
+
+    def within(path: str) -> bool:
+        path_lower = path.lower()
+        return path_lower == root_lower or path_lower.startswith(root_prefix)
+
+    return within
+
+
 def _apply_root_filter(path: str, root: Optional[str] = None) -> str:
     """Apply root filter to a path for display/API purposes.
 
@@ -78,9 +98,34 @@ def _resolve_root_path(path: str) -> str:
 # --- Collection utility functions ---
 
 
+def collection_stamp(collection) -> Tuple[int, int]:
+    """Return (length, refresh generation) for validating memos built from a collection.
+
+    Memos hold the collection itself and compare identity plus this stamp:
+    the generation catches a refresh that reuses the same list object, and
+    the length catches items appended or removed in place.
+    """
+    return len(collection), collection_generation()
+
+
+# (collection, stamp, ID lookup dict), swapped in as one tuple
+_items_by_id_cache: Optional[Tuple[Any, Tuple[int, int], Dict[str, Any]]] = None
+
+
 def get_items_by_id(collection) -> Dict[str, Any]:
-    """Build a lookup dict of items by ID."""
-    return {item.ID: item for item in collection}
+    """Build a lookup dict of items by ID.
+
+    The dict is reused while the same, unchanged collection is passed, so
+    tools sharing the cached collection don't rebuild it on every call.
+    """
+    global _items_by_id_cache
+    stamp = collection_stamp(collection)
+    cached = _items_by_id_cache
+    if cached is not None and cached[0] is collection and cached[1] == stamp:
+        return cached[2]
+    items_by_id = {item.ID: item for item in collection}
+    _items_by_id_cache = (collection, stamp, items_by_id)
+    return items_by_id
 
 
 def get_items_by_parent(collection) -> Dict[str, List]:
@@ -94,19 +139,48 @@ def get_items_by_parent(collection) -> Dict[str, List]:
     return items_by_parent
 
 
+# items_by_id dict -> {item ID: full path}, reused while the same dict is passed
+_item_path_cache: Dict[str, Any] = {"items_by_id": None, "paths": {}}
+
+
 def get_item_path(item, items_by_id: Dict[str, Any]) -> str:
-    """Get the full path of an item."""
-    path_parts = [item.VissibleName]
+    """Get the full path of an item.
+
+    Paths are memoized per ``items_by_id`` dict, and a walk stops early at
+    the first ancestor whose path is already known. Walks cut short by a
+    parent cycle are not memoized.
+    """
+    if _item_path_cache["items_by_id"] is not items_by_id:
+        _item_path_cache["items_by_id"] = items_by_id
+        _item_path_cache["paths"] = {}
+    paths: Dict[str, str] = _item_path_cache["paths"]
+    item_id = item.ID if hasattr(item, "ID") else None
+    if item_id is not None and item_id in paths:
+        return paths[item_id]
+
+    chain = [item]
+    prefix = ""
     parent_id = item.Parent if hasattr(item, "Parent") else ""
     visited = set()
-    if hasattr(item, "ID"):
-        visited.add(item.ID)
+    if item_id is not None:
+        visited.add(item_id)
     while parent_id and parent_id in items_by_id and parent_id not in visited:
+        if parent_id in paths:
+            prefix = paths[parent_id]
+            parent_id = ""
+            break
         visited.add(parent_id)
         parent = items_by_id[parent_id]
-        path_parts.insert(0, parent.VissibleName)
+        chain.append(parent)
         parent_id = parent.Parent if hasattr(parent, "Parent") else ""
-    return "/" + "/".join(path_parts)
+    cyclic = bool(parent_id) and parent_id in visited
+
+    path = prefix
+    for node in reversed(chain):
+        path = path + "/" + node.VissibleName
+        if not cyclic and hasattr(node, "ID"):
+            paths[node.ID] = path
+    return path
 
 
 # --- Document lookup helper ---
@@ -129,6 +203,7 @@ def _find_document(document: str, collection, items_by_id: Dict[str, Any], root:
     documents = [item for item in collection if not item.is_folder]
     target_doc = None
     document_lower = document.lower().strip("/")
+    within_root = make_within_root_predicate(root)
 
     for doc in documents:
         # Skip trashed documents
@@ -136,7 +211,7 @@ def _find_document(document: str, collection, items_by_id: Dict[str, Any], root:
             continue
         doc_path = get_item_path(doc, items_by_id)
         # Filter by root path
-        if not _is_within_root(doc_path, root):
+        if not within_root(doc_path):
             continue
         # Match by name (case-insensitive)
         if doc.VissibleName.lower() == document_lower:
@@ -153,7 +228,7 @@ def _find_document(document: str, collection, items_by_id: Dict[str, Any], root:
             doc
             for doc in documents
             if getattr(doc, "Parent", "") != "trash"
-            and _is_within_root(get_item_path(doc, items_by_id), root)
+            and within_root(get_item_path(doc, items_by_id))
         ]
         # Use the original user-provided document name for suggestions
         similar = find_similar_documents(document, filtered_docs)
@@ -6,6 +6,11 @@ import json
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 
+try:
+    import orjson
+except ImportError:  # Optional speedup (pip install rm-mcp[fast])
+    orjson = None
+
 
 class DateTimeEncoder(json.JSONEncoder):
     """JSON encoder that handles datetime objects."""
@@ -16,25 +21,66 @@ class DateTimeEncoder(json.JSONEncoder):
         return super().default(obj)
 
 
+def to_json(payload: Dict[str, Any], compact: bool = False) -> str:
+    """Serialize a response payload to the JSON text returned by tools.
+
+    Compact payloads are written without indentation. Uses orjson when
+    installed; payloads it can't encode fall back to the stdlib encoder.
+    """
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if not compact:
+            option |= orjson.OPT_INDENT_2
+        try:
+            return orjson.dumps(payload, option=option).decode()
+        except TypeError:
+            pass
+    if compact:
+        return json.dumps(payload, separators=(",", ":"), cls=DateTimeEncoder)
+    return json.dumps(payload, indent=2, cls=DateTimeEncoder)
+
+
+def build_response(data: Dict[str, Any], hint: str, compact: bool = False) -> Dict[str, Any]:
+    """Build a response payload with a hint for the model.
+
+    Compact payloads omit the hint and any top-level fields that are None.
+    """
+    if compact:
+        return {k: v for k, v in data.items() if v is not None}
+    data["_hint"] = hint
+    return data
+
+
 def make_response(data: Dict[str, Any], hint: str, compact: bool = False) -> str:
     """Create a JSON response with a hint for the model."""
-    if not compact:
-        data["_hint"] = hint
-    return json.dumps(data, indent=2, cls=DateTimeEncoder)
+    return to_json(build_response(data, hint, compact=compact), compact=compact)
 
 
-def make_error(
+def build_error(
     error_type: str,
     message: str,
     suggestion: str,
     did_you_mean: Optional[List[str]] = None,
     compact: bool = False,
-) -> str:
-    """Create an educational error response."""
+) -> Dict[str, Any]:
+    """Build an educational error payload."""
     error_body: Dict[str, Any] = {"type": error_type, "message": message}
     if not compact:
         error_body["suggestion"] = suggestion
         if did_you_mean:
             error_body["did_you_mean"] = did_you_mean
-    error: Dict[str, Any] = {"_error": error_body}
-    return json.dumps(error, indent=2, cls=DateTimeEncoder)
+    return {"_error": error_body}
+
+
+def make_error(
+    error_type: str,
+    message: str,
+    suggestion: str,
+    did_you_mean: Optional[List[str]] = None,
+    compact: bool = False,
+) -> str:
+    """Create an educational error response."""
+    return to_json(
+        build_error(error_type, message, suggestion, did_you_mean, compact=compact),
+        compact=compact,
+    )
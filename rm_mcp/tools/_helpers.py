@@ -6,11 +6,18 @@ Tool modules access commonly-patched names through this module
 ``unittest.mock.patch`` target works for all tools.
 """
 
+import asyncio
 import os
+import re
 import tempfile
+import threading
+from array import array
+from bisect import bisect_right
+from collections import OrderedDict, namedtuple
 from contextlib import contextmanager
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
 
 from mcp.types import ToolAnnotations
 
@@ -21,7 +28,12 @@ from rm_mcp.api import (  # noqa: F401
     REMARKABLE_TOKEN,
     get_file_type,
 )
-from rm_mcp.cache import get_cached_collection  # noqa: F401
+from rm_mcp.cache import (  # noqa: F401
+    cache_extraction_result,
+    cache_page_count,
+    get_cached_collection,
+    get_cached_page_count,
+)
 from rm_mcp.extract import (  # noqa: F401
     cache_page_ocr,
     extract_text_from_document_zip,
@@ -35,7 +47,9 @@ from rm_mcp.extract import (  # noqa: F401
     render_page_from_document_zip_svg,
 )
 from rm_mcp.ocr.sampling import (  # noqa: F401
+    _MAX_CONCURRENT_SAMPLING,
     get_ocr_backend,
+    ocr_pages_via_sampling,
     ocr_via_sampling,
     should_use_sampling_ocr,
 )
@@ -44,11 +58,34 @@ from rm_mcp.paths import (  # noqa: F401
     _find_document,
     _get_root_path,
     _is_within_root,
+    collection_stamp,
     get_item_path,
     get_items_by_id,
     get_items_by_parent,
+    make_within_root_predicate,
+)
+from rm_mcp.responses import (  # noqa: F401
+    build_error,
+    build_response,
+    make_error,
+    make_response,
+    to_json,
 )
-from rm_mcp.responses import make_error, make_response  # noqa: F401
+
+try:
+    from rm_mcp.index import get_instance  # noqa: F401
+except ImportError:  # e.g. Python built without sqlite3
+    get_instance = None
+
+try:
+    from re import _parser as sre_parse
+except ImportError:  # Python < 3.11
+    import sre_parse
+
+try:
+    import re2
+except ImportError:  # Optional linear-time engine (pip install rm-mcp[re2])
+    re2 = None
 
 # --- Helper functions ---
 
@@ -78,27 +115,40 @@ def suggest_for_error(e: Exception) -> str:
     return "Check remarkable_status() for diagnostics."
 
 
-def parse_pages(pages_str: str, total_pages: int) -> List[int]:
-    """Parse 'all', '1-3', '2,4,5', '1-3,5' into sorted page list.
+def _parse_page_range(part: str, total_pages: int) -> Optional[range]:
+    """Parse a single 'a-b' spec into a range clamped to [1, total_pages]."""
+    bounds = part.split("-", 1)
+    try:
+        start = max(1, int(bounds[0].strip()))
+        end = min(total_pages, int(bounds[1].strip()))
+    except (ValueError, IndexError):
+        return None
+    return range(start, end + 1)
+
 
+@lru_cache(maxsize=32)
+def parse_pages(pages_str: str, total_pages: int) -> Sequence[int]:
+    """Parse 'all', '1-3', '2,4,5', '1-3,5' into a sorted page sequence.
+
+    'all' and single 'a-b' specs return a ``range``; comma lists return a
+    tuple. Results are immutable so they can be shared via the LRU cache.
     Out-of-range pages are clamped to [1, total_pages].
     """
-    if pages_str.strip().lower() == "all":
-        return list(range(1, total_pages + 1))
+    spec = pages_str.strip()
+    if spec.lower() == "all":
+        return range(1, total_pages + 1)
+    if "," not in spec and "-" in spec:
+        return _parse_page_range(spec, total_pages) or ()
 
     pages: set = set()
-    for part in pages_str.split(","):
+    for part in spec.split(","):
         part = part.strip()
         if not part:
             continue
         if "-" in part:
-            bounds = part.split("-", 1)
-            try:
-                start = max(1, int(bounds[0].strip()))
-                end = min(total_pages, int(bounds[1].strip()))
-                pages.update(range(start, end + 1))
-            except (ValueError, IndexError):
-                continue
+            page_range = _parse_page_range(part, total_pages)
+            if page_range is not None:
+                pages.update(page_range)
         else:
             try:
                 p = int(part)
@@ -106,40 +156,325 @@ def parse_pages(pages_str: str, total_pages: int) -> List[int]:
                     pages.add(p)
             except ValueError:
                 continue
-    return sorted(pages)
+    return tuple(sorted(pages))
+
+
+# --- Grep ---
+
+# Flags shared by every grep pattern
+_GREP_FLAGS = re.IGNORECASE | re.MULTILINE
+
+# Any of these makes a grep pattern a regex rather than a plain literal
+_REGEX_METACHARS = frozenset(".\\^$*+?()[]{}|")
+
+# Separator between grep context windows
+_GREP_WINDOW_SEP = "\n\n---\n\n"
+
+
+def _is_literal_pattern(pattern: str) -> bool:
+    """Check whether a grep pattern is non-empty and has no regex metacharacters.
+
+    The empty pattern is left to the regex engine, which steps past its
+    zero-width matches; ``str.find`` would return the same offset forever.
+    """
+    return bool(pattern) and _REGEX_METACHARS.isdisjoint(pattern)
+
+
+@lru_cache(maxsize=64)
+def compile_grep(grep: str):
+    """Compile a user grep pattern, preferring re2 when it is installed.
+
+    re2 matches in linear time, so a pathological pattern can't stall the
+    server. Patterns re2 rejects (e.g. backreferences) and every pattern
+    when re2 is missing go through stdlib ``re``, which raises ``re.error``
+    for invalid input. Compiled patterns are cached across calls.
+    """
+    if re2 is not None:
+        try:
+            return re2.compile("(?im)" + grep)
+        except re2.error:
+            pass
+    return re.compile(grep, _GREP_FLAGS)
+
+
+@lru_cache(maxsize=64)
+def grep_min_length(grep: str) -> int:
+    """Return the fewest characters any match of the grep pattern can span.
+
+    Text shorter than this can't match, so it can be skipped without
+    running the pattern. Returns 0 if the pattern can't be analysed.
+    """
+    try:
+        return sre_parse.parse(grep).getwidth()[0]
+    except Exception:
+        return 0
+
+
+def _match_spans(text: str, grep: str) -> Iterator[Tuple[int, int]]:
+    """Yield the (start, end) span of each case-insensitive grep match.
+
+    Literal patterns are located with ``str.find`` on the lowercased text,
+    skipping the regex engine. Raises ``re.error`` for an invalid regex.
+    """
+    if _is_literal_pattern(grep):
+        text_lower = text.lower()
+        # Lowercasing can change the length of some characters; offsets are
+        # only valid when it doesn't
+        if len(text_lower) == len(text):
+            needle = grep.lower()
+            i = 0
+            while (j := text_lower.find(needle, i)) != -1:
+                i = j + len(needle)
+                yield j, i
+            return
+    for match in compile_grep(grep).finditer(text):
+        yield match.span()
+
+
+def count_grep_matches(text: str, grep: str) -> int:
+    """Count case-insensitive grep matches in text.
+
+    Literal patterns are counted with ``str.find``, like ``grep_windows``.
+    Raises ``re.error`` for an invalid regex.
+    """
+    return sum(1 for _ in _match_spans(text, grep))
+
+
+def grep_windows(
+    text: str,
+    grep: str,
+    window: int = 100,
+    max_chars: Optional[int] = None,
+    max_matches: Optional[int] = None,
+) -> Tuple[str, int, bool]:
+    """Collect a context window around each grep match.
+
+    Windows are joined with a ``---`` separator and get an ellipsis on
+    each side that was cut. Once ``max_chars`` would be exceeded, further
+    windows are dropped but still counted (a first window that is too big
+    on its own is shrunk around its match instead); with ``max_matches`` set,
+    scanning stops as soon as the output is full and that many matches
+    have been counted.
+
+    Returns (combined windows, match count, truncated). Raises ``re.error``
+    for an invalid pattern.
+    """
+    if len(text) < grep_min_length(grep):
+        return "", 0, False
+    parts: List[str] = []
+    written = 0
+    count = 0
+    truncated = False
+    text_len = len(text)
+    for match_start, match_end in _match_spans(text, grep):
+        count += 1
+        if truncated:
+            if max_matches is not None and count >= max_matches:
+                break
+            continue
+        start = max(0, match_start - window)
+        end = min(text_len, match_end + window)
+        sep = _GREP_WINDOW_SEP if count > 1 else ""
+        lead = "..." if start > 0 else ""
+        trail = "..." if end < text_len else ""
+        need = len(sep) + len(lead) + (end - start) + len(trail)
+        if max_chars is not None and written + need > max_chars:
+            # Decided before slicing, so dropped windows are never copied
+            truncated = True
+            if not parts:
+                # Nothing fits whole; shrink the first window around its match
+                # (leaving room for both ellipses) rather than report a match
+                # with no content
+                keep = max(0, max_chars - 6)
+                start = max(0, min((match_start + match_end - keep) // 2, text_len - keep))
+                end = min(text_len, start + keep)
+                parts += (
+                    "..." if start > 0 else "",
+                    text[start:end],
+                    "..." if end < text_len else "",
+                )
+                written = max_chars
+            continue
+        parts += (sep, lead, text[start:end], trail)
+        written += need
+    return "".join(parts), count, truncated
+
+
+# RAM-backed directory for downloaded documents when the system has one
+_SHM_DIR = "/dev/shm" if os.path.isdir("/dev/shm") and os.access("/dev/shm", os.W_OK) else None
+
+
+def _write_temp_file(data: bytes, suffix: str, directory: Optional[str]) -> Path:
+    """Write data to a new temp file in directory, removing it if the write fails."""
+    tmp = tempfile.NamedTemporaryFile(suffix=suffix, dir=directory, delete=False)
+    tmp_path = Path(tmp.name)
+    try:
+        with tmp:
+            tmp.write(data)
+    except OSError:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    return tmp_path
 
 
 @contextmanager
 def _temp_document(data: bytes, suffix: str = ".zip"):
-    """Context manager for writing data to a temp file with guaranteed cleanup."""
+    """Context manager for writing data to a temp file with guaranteed cleanup.
+
+    Prefers tmpfs (/dev/shm) so the document never touches disk, falling
+    back to the regular temp directory if tmpfs is missing or full.
+    """
     tmp_path = None
     try:
-        with tempfile.NamedTemporaryFile(suffix=suffix, delete=False) as tmp:
-            tmp_path = Path(tmp.name)
-            tmp.write(data)
+        if _SHM_DIR is not None:
+            try:
+                tmp_path = _write_temp_file(data, suffix, _SHM_DIR)
+            except OSError:
+                pass
+        if tmp_path is None:
+            tmp_path = _write_temp_file(data, suffix, None)
         yield tmp_path
     finally:
         if tmp_path is not None:
             tmp_path.unlink(missing_ok=True)
 
 
+async def download_document(client, doc) -> bytes:
+    """Download a document's raw zip on a worker thread."""
+    return await asyncio.to_thread(client.download, doc)
+
+
+def _extract_document_bytes(raw_doc: bytes, include_ocr: bool) -> Dict[str, Any]:
+    """Extract text from raw document bytes (blocking, touches no caches)."""
+    with _temp_document(raw_doc) as tmp_path:
+        return extract_text_from_document_zip(tmp_path, include_ocr=include_ocr)
+
+
+async def extract_document(raw_doc: bytes, doc_id: str, include_ocr: bool) -> Dict[str, Any]:
+    """Extract text from a downloaded document without blocking the event loop.
+
+    Parsing runs on a worker thread; the extraction cache is read and written
+    here on the loop, since the in-memory caches are not locked.
+    """
+    cached = get_cached_ocr_result(doc_id, include_ocr=include_ocr)
+    if cached is not None:
+        return cached
+    result = await asyncio.to_thread(_extract_document_bytes, raw_doc, include_ocr)
+    cache_extraction_result(doc_id, result, include_ocr)
+    return result
+
+
 # --- Caches ---
 
-_file_type_cache: Dict[str, str] = {}
-_MAX_FILE_TYPE_CACHE = 200
+# doc ID -> file type, LRU-ordered
+_file_type_cache: "OrderedDict[str, str]" = OrderedDict()
+_MAX_FILE_TYPE_CACHE = 1024
+
+
+class _SizedLRU:
+    """LRU cache capped by the total length of its values.
+
+    The entries and their running size are only changed together, under
+    one lock, so the size can't drift from what is actually cached.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key) -> bool:
+        return key in self._entries
+
+    def get(self, key):
+        """Return the cached value (marking it recently used), or None."""
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+            return value
+
+    def put(self, key, value) -> None:
+        """Cache a value, evicting least recently used entries over the cap.
+
+        Values larger than the whole cap are not cached.
+        """
+        if len(value) > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.size -= len(previous)
+            self._entries[key] = value
+            self.size += len(value)
+            while self.size > self.max_bytes and self._entries:
+                _, evicted = self._entries.popitem(last=False)
+                self.size -= len(evicted)
+
+    def pop(self, key, default=None):
+        """Remove and return a cached value, or default if absent."""
+        with self._lock:
+            value = self._entries.pop(key, None)
+            if value is None:
+                return default
+            self.size -= len(value)
+            return value
 
-_rendered_image_cache: Dict[str, str] = {}  # key: f"{doc_id}:{page}" -> base64 PNG
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+
+# f"{doc_id}:{page}" -> PNG data URI (ASCII, so length is size in bytes)
+_MAX_RENDERED_IMAGE_CACHE_BYTES = 64 * 1024 * 1024
+_rendered_image_cache = _SizedLRU(_MAX_RENDERED_IMAGE_CACHE_BYTES)
+
+# Raw PNG renders for sampling OCR.
+# Keyed on the modified timestamp too, so an edited document misses.
+_MAX_RENDER_CACHE_BYTES = 32 * 1024 * 1024
+_render_cache = _SizedLRU(_MAX_RENDER_CACHE_BYTES)
+
+
+def get_cached_render(doc_id: str, modified: Optional[str], page: int) -> Optional[bytes]:
+    """Get a cached page render for this document version, if any."""
+    return _render_cache.get((doc_id, modified, page))
+
+
+def cache_render(doc_id: str, modified: Optional[str], page: int, png_data: bytes) -> None:
+    """Cache a page render, evicting least recently used renders over the byte cap."""
+    _render_cache.put((doc_id, modified, page), png_data)
+
+
+def get_cached_image(cache_key: str) -> Optional[str]:
+    """Get a cached PNG data URI for a rendered page, if any."""
+    return _rendered_image_cache.get(cache_key)
+
+
+def cache_image(cache_key: str, data_uri: str) -> None:
+    """Cache a PNG data URI, evicting least recently used images over the size cap."""
+    _rendered_image_cache.put(cache_key, data_uri)
 
 
 def _get_file_type_cached(client, doc) -> str:
-    """Get file type with caching to avoid repeated lookups."""
+    """Get file type with caching to avoid repeated lookups.
+
+    The least recently used entry is evicted once the cache is full, so a
+    library larger than the cache doesn't flush it wholesale.
+    """
     doc_id = doc.ID
-    if doc_id in _file_type_cache:
-        return _file_type_cache[doc_id]
+    file_type = _file_type_cache.get(doc_id)
+    if file_type is not None:
+        _file_type_cache.move_to_end(doc_id)
+        return file_type
     file_type = get_file_type(client, doc)
-    if len(_file_type_cache) >= _MAX_FILE_TYPE_CACHE:
-        _file_type_cache.clear()
     _file_type_cache[doc_id] = file_type
+    if len(_file_type_cache) > _MAX_FILE_TYPE_CACHE:
+        _file_type_cache.popitem(last=False)
     return file_type
 
 
@@ -168,6 +503,252 @@ def _is_cloud_archived(item) -> bool:
     return parent == "trash"
 
 
+# --- Lowercased names ---
+
+# (collection, stamp, {item ID: lowercased name}), swapped in as one tuple
+_name_lower_cache: Optional[Tuple[Any, Tuple[int, int], Dict[str, str]]] = None
+
+
+def get_name_lower_by_id(collection) -> Dict[str, str]:
+    """Get every item's lowercased name, computed once per cached collection."""
+    global _name_lower_cache
+    stamp = collection_stamp(collection)
+    cached = _name_lower_cache
+    if cached is not None and cached[0] is collection and cached[1] == stamp:
+        return cached[2]
+    names = {item.ID: item.VissibleName.lower() for item in collection}
+    _name_lower_cache = (collection, stamp, names)
+    return names
+
+
+# --- Filtered document entries ---
+
+# A document within the root path, with the per-item values the list tools
+# filter and sort on
+DocEntry = namedtuple("DocEntry", ["item", "path", "name_lower", "modified", "archived"])
+
+# root -> (collection, stamp, entries, non-archived count); reused while the
+# cached collection is unchanged
+_filtered_docs_cache: Dict[str, Tuple[Any, Tuple[int, int], List[DocEntry], int]] = {}
+_MAX_FILTERED_DOCS_CACHE = 4
+
+
+def get_filtered_docs(
+    collection, root: str, items_by_id: Optional[Dict[str, Any]] = None
+) -> List[DocEntry]:
+    """Get the non-folder documents within root, computed once per collection.
+
+    The cached collection object is reused until it is re-fetched, so the
+    entries are keyed on its identity. Archived documents are included
+    (flagged via ``archived``) because ``remarkable_status`` counts them.
+    """
+    return _get_filtered_docs_cached(collection, root, items_by_id)[2]
+
+
+def get_filtered_doc_count(
+    collection,
+    root: str,
+    items_by_id: Optional[Dict[str, Any]] = None,
+    include_archived: bool = True,
+) -> int:
+    """Count the documents within root, computed once per collection.
+
+    Reuses the filtered entries when they are already built; otherwise the
+    counts are taken without building a path per document.
+    """
+    stamp = collection_stamp(collection)
+    cached = _filtered_docs_cache.get(root)
+    if cached is not None and cached[0] is collection and cached[1] == stamp:
+        total, active_count = len(cached[2]), cached[3]
+    else:
+        counts = _doc_count_cache.get(root)
+        if counts is None or counts[0] is not collection or counts[1] != stamp:
+            if len(_doc_count_cache) >= _MAX_FILTERED_DOCS_CACHE:
+                _doc_count_cache.clear()
+            counts = (collection, stamp, *_count_docs_within_root(collection, root, items_by_id))
+            _doc_count_cache[root] = counts
+        total, active_count = counts[2], counts[3]
+    return total if include_archived else active_count
+
+
+# root -> (collection, stamp, total, non-archived count), for counts taken
+# before the entries were built
+_doc_count_cache: Dict[str, Tuple[Any, Tuple[int, int], int, int]] = {}
+
+
+def _count_docs_within_root(
+    collection, root: str, items_by_id: Optional[Dict[str, Any]]
+) -> Tuple[int, int]:
+    """Count (all, non-archived) documents within root.
+
+    Only folder paths are resolved: a document is within root when its
+    parent folder is, or when its own path is the root itself.
+    """
+    docs = [item for item in collection if not item.is_folder]
+    if root == "/":
+        return len(docs), sum(1 for item in docs if not _is_cloud_archived(item))
+
+    if items_by_id is None:
+        items_by_id = get_items_by_id(collection)
+    within_root = make_within_root_predicate(root)
+    allowed_parents = {
+        item.ID
+        for item in collection
+        if item.is_folder and within_root(get_item_path(item, items_by_id))
+    }
+    root_name_lower = root.rsplit("/", 1)[-1].lower()
+
+    total = active = 0
+    for item in docs:
+        parent = item.Parent if hasattr(item, "Parent") else ""
+        if parent not in allowed_parents and not (
+            item.VissibleName.lower() == root_name_lower
+            and within_root(get_item_path(item, items_by_id))
+        ):
+            continue
+        total += 1
+        if not _is_cloud_archived(item):
+            active += 1
+    return total, active
+
+
+def _get_filtered_docs_cached(
+    collection, root: str, items_by_id: Optional[Dict[str, Any]]
+) -> Tuple[Any, Tuple[int, int], List[DocEntry], int]:
+    """Build (or reuse) the filtered entries and counts for a collection."""
+    stamp = collection_stamp(collection)
+    cached = _filtered_docs_cache.get(root)
+    if cached is not None and cached[0] is collection and cached[1] == stamp:
+        return cached
+
+    if items_by_id is None:
+        items_by_id = get_items_by_id(collection)
+    name_lower_by_id = get_name_lower_by_id(collection)
+    within_root = make_within_root_predicate(root)
+    entries = []
+    for item in collection:
+        if item.is_folder:
+            continue
+        item_path = get_item_path(item, items_by_id)
+        if not within_root(item_path):
+            continue
+        entries.append(
+            DocEntry(
+                item=item,
+                path=item_path,
+                name_lower=name_lower_by_id[item.ID],
+                modified=getattr(item, "ModifiedClient", None),
+                archived=_is_cloud_archived(item),
+            )
+        )
+
+    if len(_filtered_docs_cache) >= _MAX_FILTERED_DOCS_CACHE:
+        _filtered_docs_cache.clear()
+    cached = (collection, stamp, entries, sum(1 for entry in entries if not entry.archived))
+    _filtered_docs_cache[root] = cached
+    return cached
+
+
+# --- Name trigram index ---
+
+# entries list -> trigram postings, reused while the entries are
+_name_trigram_cache: Dict[str, Any] = {"entries": None, "index": None}
+
+
+def _build_name_trigram_index(entries: List[DocEntry]) -> Dict[str, array]:
+    """Map each trigram of the lowercased names to the sorted entry indices containing it."""
+    index: Dict[str, array] = {}
+    for i, entry in enumerate(entries):
+        name = entry.name_lower
+        for trigram in {name[j : j + 3] for j in range(len(name) - 2)}:
+            postings = index.get(trigram)
+            if postings is None:
+                postings = index[trigram] = array("I")
+            postings.append(i)
+    return index
+
+
+def _intersect_sorted(a: Sequence[int], b: Sequence[int]) -> List[int]:
+    """Intersect two ascending integer sequences with a linear merge."""
+    result = []
+    i = j = 0
+    while i < len(a) and j < len(b):
+        if a[i] == b[j]:
+            result.append(a[i])
+            i += 1
+            j += 1
+        elif a[i] < b[j]:
+            i += 1
+        else:
+            j += 1
+    return result
+
+
+# entries list -> all lowercased names joined by NUL, plus each name's start
+# offset, so short queries are found by str.find in C rather than a loop
+_name_blob_cache: Dict[str, Any] = {"entries": None, "blob": "", "starts": None}
+
+
+def _scan_doc_names(entries: List[DocEntry], query_lower: str) -> List[DocEntry]:
+    """Substring-scan every lowercased name through one joined string."""
+    if not query_lower:
+        return list(entries)
+    if _name_blob_cache["entries"] is not entries:
+        starts = array("I")
+        offset = 0
+        for entry in entries:
+            starts.append(offset)
+            offset += len(entry.name_lower) + 1
+        _name_blob_cache["blob"] = "\0".join(entry.name_lower for entry in entries)
+        _name_blob_cache["starts"] = starts
+        _name_blob_cache["entries"] = entries
+    blob = _name_blob_cache["blob"]
+    starts = _name_blob_cache["starts"]
+
+    result = []
+    pos = blob.find(query_lower)
+    while pos != -1:
+        i = bisect_right(starts, pos) - 1
+        result.append(entries[i])
+        if i + 1 >= len(starts):
+            break
+        # Resume at the next name; one hit per entry is enough
+        pos = blob.find(query_lower, starts[i + 1])
+    return result
+
+
+def match_doc_names(entries: List[DocEntry], query_lower: str) -> List[DocEntry]:
+    """Return the entries whose lowercased name contains ``query_lower``.
+
+    Queries of three or more characters go through a trigram index built
+    once per entries list: postings are intersected rarest-first and only
+    the surviving candidates get a substring check. Shorter queries scan
+    one joined string of all names. Results keep the entries' order.
+    """
+    if len(query_lower) < 3:
+        return _scan_doc_names(entries, query_lower)
+
+    if _name_trigram_cache["entries"] is not entries:
+        _name_trigram_cache["index"] = _build_name_trigram_index(entries)
+        _name_trigram_cache["entries"] = entries
+    index = _name_trigram_cache["index"]
+
+    postings = []
+    for trigram in {query_lower[j : j + 3] for j in range(len(query_lower) - 2)}:
+        posting = index.get(trigram)
+        if posting is None:
+            return []
+        postings.append(posting)
+    postings.sort(key=len)
+
+    candidates: Sequence[int] = postings[0]
+    for posting in postings[1:]:
+        if not candidates:
+            return []
+        candidates = _intersect_sorted(candidates, posting)
+    return [entries[i] for i in candidates if query_lower in entries[i].name_lower]
+
+
 # --- Tool annotations ---
 
 # Base annotations for read-only operations
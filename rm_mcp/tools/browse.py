@@ -34,6 +34,7 @@ async def remarkable_browse(path: str = "/", compact_output: bool = False) -> st
         client, collection = _helpers.get_cached_collection()
         items_by_id = _helpers.get_items_by_id(collection)
         items_by_parent = _helpers.get_items_by_parent(collection)
+        name_lower_by_id = _helpers.get_name_lower_by_id(collection)
 
         root = _helpers._get_root_path()
         # Resolve user path to actual device path
@@ -53,7 +54,7 @@ async def remarkable_browse(path: str = "/", compact_output: bool = False) -> st
                 found_document = None
 
                 for item in items_by_parent.get(current_parent, []):
-                    if item.VissibleName.lower() == part_lower:
+                    if name_lower_by_id[item.ID] == part_lower:
                         if item.is_folder:
                             current_parent = item.ID
                             found = True
@@ -93,7 +94,7 @@ async def remarkable_browse(path: str = "/", compact_output: bool = False) -> st
                                 f"Auto-redirected from browse to read. "
                                 f"{result_data.get('_hint', '')}"
                             )
-                        return json.dumps(result_data, indent=2)
+                        return _helpers.to_json(result_data, compact=compact)
 
                     # Folder not found - suggest alternatives
                     available_folders = [
@@ -131,7 +132,7 @@ async def remarkable_browse(path: str = "/", compact_output: bool = False) -> st
         folders = []
         documents = []
 
-        for item in sorted(items, key=lambda x: x.VissibleName.lower()):
+        for item in sorted(items, key=lambda x: name_lower_by_id[x.ID]):
             # Skip cloud-archived items
             if _helpers._is_cloud_archived(item):
                 continue
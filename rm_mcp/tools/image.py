@@ -1,6 +1,5 @@
 """remarkable_image tool — render document pages as images."""
 
-import base64
 from typing import Optional
 
 from mcp.server.fastmcp import Context
@@ -14,6 +13,15 @@ from mcp.types import (
 from rm_mcp.server import mcp
 from rm_mcp.tools import _helpers
 
+try:
+    import pybase64 as base64
+except ImportError:  # Optional speedup (pip install rm-mcp[fast])
+    import base64
+
+# Rendered pages are cached as complete data URIs; the embedded-image
+# response slices the base64 payload back out
+_PNG_DATA_URI_PREFIX = "data:image/png;base64,"
+
 
 @mcp.tool(annotations=_helpers.IMAGE_ANNOTATIONS)
 async def remarkable_image(
@@ -186,11 +194,10 @@ async def remarkable_image(
             else:
                 # PNG format — check cache first
                 cache_key = f"{target_doc.ID}:{page}"
-                if cache_key in _helpers._rendered_image_cache and not include_ocr:
-                    png_base64 = _helpers._rendered_image_cache[cache_key]
+                data_uri = None if include_ocr else _helpers.get_cached_image(cache_key)
+                if data_uri is not None:
                     resource_uri = f"remarkableimg:///{uri_path}.page-{page}.png"
                     if compatibility:
-                        data_uri = f"data:image/png;base64,{png_base64}"
                         hint = (
                             f"Page {page}/{total_pages} as base64-encoded PNG (cached). "
                             f"Use 'data_uri' directly in HTML img src. "
@@ -208,6 +215,7 @@ async def remarkable_image(
                             compact=compact,
                         )
                     else:
+                        png_base64 = data_uri[len(_PNG_DATA_URI_PREFIX) :]
                         image = ImageContent(type="image", data=png_base64, mimeType="image/png")
                         info = TextContent(
                             type="text",
@@ -254,11 +262,9 @@ async def remarkable_image(
 
                 resource_uri = f"remarkableimg:///{uri_path}.page-{page}.png"
                 png_base64 = base64.b64encode(png_data).decode("utf-8")
+                data_uri = f"{_PNG_DATA_URI_PREFIX}{png_base64}"
 
-                # Cache the rendered image (evict if cache is too large)
-                if len(_helpers._rendered_image_cache) >= 20:
-                    _helpers._rendered_image_cache.clear()
-                _helpers._rendered_image_cache[cache_key] = png_base64
+                _helpers.cache_image(cache_key, data_uri)
 
                 # Build OCR info for response if OCR was requested
                 ocr_info = {}
@@ -271,7 +277,6 @@ async def remarkable_image(
                 if compatibility:
                     # Return base64 PNG in JSON for clients without embedded resource support
                     # Include data URI format for direct use in HTML <img> tags
-                    data_uri = f"data:image/png;base64,{png_base64}"
                     hint = (
                         f"Page {page}/{total_pages} as base64-encoded PNG. "
                         f"Use 'data_uri' directly in HTML img src. "
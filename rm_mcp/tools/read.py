@@ -1,13 +1,59 @@
 """remarkable_read tool — read and extract text from documents."""
 
+import asyncio
+import io
 import re
-from typing import Literal, Optional
+from bisect import bisect_right
+from typing import Any, Dict, List, Literal, Optional, Tuple
 
 from mcp.server.fastmcp import Context
 
 from rm_mcp.server import mcp
 from rm_mcp.tools import _helpers
 
+# Separator used when combining extracted text parts
+_PART_SEP = "\n\n"
+
+# Most uncached pages one multi-page read sends to sampling OCR; the rest
+# are left for a follow-up call
+_MAX_SAMPLING_PAGES_PER_READ = 16
+
+
+def _invalid_grep_error(e: Exception, compact: bool) -> Dict[str, Any]:
+    """Build the error payload for a grep pattern that doesn't compile."""
+    return _helpers.build_error(
+        error_type="invalid_grep",
+        message=f"Invalid regex pattern: {e}",
+        suggestion="Use a valid regex pattern or simple text string.",
+        compact=compact,
+    )
+
+
+def _part_offsets(parts: List[str]) -> Tuple[List[int], int]:
+    """Return each part's start offset in ``_PART_SEP.join(parts)`` and the total length."""
+    starts = []
+    pos = 0
+    for part in parts:
+        starts.append(pos)
+        pos += len(part) + len(_PART_SEP)
+    total = pos - len(_PART_SEP) if parts else 0
+    return starts, total
+
+
+def _slice_parts(parts: List[str], starts: List[int], start: int, end: int) -> str:
+    """Return ``_PART_SEP.join(parts)[start:end]`` without joining every part."""
+    pieces = []
+    i = max(0, bisect_right(starts, start) - 1)
+    while i < len(parts) and starts[i] < end:
+        part = parts[i]
+        base = starts[i]
+        pieces.append(part[max(0, start - base) : max(0, end - base)])
+        sep_start = base + len(part)
+        if i + 1 < len(parts) and sep_start < end:
+            pieces.append(_PART_SEP[max(0, start - sep_start) : end - sep_start])
+        i += 1
+    return "".join(pieces)
+
 
 @mcp.tool(annotations=_helpers.READ_ANNOTATIONS)
 async def remarkable_read(
@@ -62,8 +108,6 @@ async def remarkable_read(
 
         # Validate parameters
         page = max(1, page)
-        # Internal page size for PDF/EPUB character-based pagination
-        page_size = _helpers.DEFAULT_PAGE_SIZE
 
         root = _helpers._get_root_path()
         # Resolve user-provided path to actual device path
@@ -80,491 +124,569 @@ async def remarkable_read(
 
         file_type = _helpers._get_file_type_cached(client, target_doc)
 
-        # Collect content based on content_type
-        text_parts = []
-
-        # Get annotations/typed text
-        notebook_pages = []  # List of page content for notebook pagination
-        ocr_backend_used = None  # Track which OCR backend was used
-        content = None  # Will hold extraction result
-        total_notebook_pages = 0  # Track total pages for sampling mode
+        payload = await _read_document(
+            client,
+            target_doc,
+            doc_path,
+            file_type,
+            document=document,
+            content_type=content_type,
+            page=page,
+            pages=pages,
+            grep=grep,
+            include_ocr=include_ocr,
+            auto_ocr=auto_ocr,
+            ctx=ctx,
+            compact=compact,
+        )
+        return _helpers.to_json(payload, compact=compact)
 
-        if content_type in ("text", "annotations"):
-            # For notebooks (no PDF/EPUB), use page-based pagination
-            is_notebook = file_type not in ("pdf", "epub")
+    except Exception as e:
+        return _helpers.make_error(
+            error_type="read_failed",
+            message=str(e),
+            suggestion=_helpers.suggest_for_error(e),
+            compact=compact,
+        )
 
-            # Determine if we should use sampling OCR
-            use_sampling = (
-                is_notebook and include_ocr and ctx and _helpers.should_use_sampling_ocr(ctx)
-            )
 
-            # For sampling OCR: use per-page caching and only OCR requested page
-            if use_sampling:
-                # Check per-page cache first
-                cached_text = _helpers.get_cached_page_ocr(target_doc.ID, page, "sampling")
-                if cached_text is not None:
-                    # We have cached OCR for this page
-                    # Still need to get total page count
-                    raw_doc = client.download(target_doc)
-                    with _helpers._temp_document(raw_doc) as tmp_path:
-                        total_notebook_pages = _helpers.get_document_page_count(tmp_path)
-
-                    # Build notebook_pages list with just the cached page
-                    notebook_pages = [""] * total_notebook_pages
-                    notebook_pages[page - 1] = cached_text
-                    ocr_backend_used = "sampling"
-                else:
-                    # No cache - render and OCR just the requested page
-                    raw_doc = client.download(target_doc)
-                    with _helpers._temp_document(raw_doc) as tmp_path:
-                        total_notebook_pages = _helpers.get_document_page_count(tmp_path)
-
-                        if page > total_notebook_pages:
-                            return _helpers.make_error(
-                                error_type="page_out_of_range",
-                                message=f"Page {page} does not exist. "
-                                f"Document has {total_notebook_pages} notebook page(s).",
-                                suggestion=f"Use page=1 to {total_notebook_pages} "
-                                "to read different pages.",
-                                compact=compact,
-                            )
+async def _read_document(
+    client,
+    target_doc,
+    doc_path: str,
+    file_type: str,
+    document: str,
+    content_type: str,
+    page: int,
+    pages: Optional[str],
+    grep: Optional[str],
+    include_ocr: bool,
+    auto_ocr: bool,
+    ctx: Optional[Context],
+    compact: bool,
+    raw_doc: Optional[bytes] = None,
+) -> Dict[str, Any]:
+    """Read an already-resolved document and return the response payload.
+
+    ``raw_doc`` lets the auto-OCR retry reuse the bytes downloaded by the
+    first pass instead of fetching the document again.
+    """
+    # Document fields shared by every result dict below
+    doc_name = target_doc.VissibleName
+    filtered_path = _helpers._apply_root_filter(doc_path)
+    modified = getattr(target_doc, "ModifiedClient", None)
+
+    # Internal page size for PDF/EPUB character-based pagination, and the
+    # output cap; read once per call since both are patchable module settings
+    page_size = _helpers.DEFAULT_PAGE_SIZE
+    max_chars = _helpers.MAX_OUTPUT_CHARS
+
+    # Collect content based on content_type
+    text_parts = []
+
+    # Get annotations/typed text
+    # Page number -> content for notebook pagination (sparse: sampling OCR
+    # only fills the pages it has seen)
+    notebook_pages: Dict[int, str] = {}
+    ocr_backend_used = None  # Track which OCR backend was used
+    content = None  # Will hold extraction result
+    total_notebook_pages = 0  # Track total pages for sampling mode
+    # First wanted page left un-OCR'd by a budget-limited sampling read
+    ocr_deferred_from: Optional[int] = None
+
+    if content_type in ("text", "annotations"):
+        # For notebooks (no PDF/EPUB), use page-based pagination
+        is_notebook = file_type not in ("pdf", "epub")
+
+        # Determine if we should use sampling OCR
+        use_sampling = is_notebook and include_ocr and ctx and _helpers.should_use_sampling_ocr(ctx)
+
+        # For sampling OCR: use per-page caching and only OCR requested page(s)
+        if use_sampling:
+            cached_count = _helpers.get_cached_page_count(target_doc.ID, modified)
+
+            def cached_pages(wanted):
+                """Collect per-page cached OCR text for the wanted pages."""
+                found = {}
+                for p in wanted:
+                    text = _helpers.get_cached_page_ocr(target_doc.ID, p, "sampling")
+                    if text is not None:
+                        found[p] = text
+                return found
+
+            missing = True
+            if cached_count is not None:
+                # Cached page count for this version — serve from cache if complete
+                total_notebook_pages = cached_count
+                wanted = (
+                    _helpers.parse_pages(pages, total_notebook_pages)
+                    if pages is not None
+                    else [page]
+                )
+                notebook_pages = cached_pages(wanted)
+                missing = len(notebook_pages) < len(wanted)
 
-                        # Render just the requested page
-                        png_data = _helpers.render_page_from_document_zip(tmp_path, page)
-                        if png_data:
-                            # OCR the single page
-                            ocr_text = await _helpers.ocr_via_sampling(ctx, png_data)
-                            if ocr_text:
-                                # Cache the result
-                                _helpers.cache_page_ocr(target_doc.ID, page, "sampling", ocr_text)
-                                # Build notebook_pages list
-                                notebook_pages = [""] * total_notebook_pages
-                                notebook_pages[page - 1] = ocr_text
-                                ocr_backend_used = "sampling"
-
-            # If not using sampling OCR, perform standard extraction
-            if not notebook_pages and is_notebook:
-                raw_doc = client.download(target_doc)
+            if missing:
+                if raw_doc is None:
+                    raw_doc = await _helpers.download_document(client, target_doc)
                 with _helpers._temp_document(raw_doc) as tmp_path:
-                    content = _helpers.extract_text_from_document_zip(
-                        tmp_path, include_ocr=include_ocr, doc_id=target_doc.ID
+                    total_notebook_pages = await asyncio.to_thread(
+                        _helpers.get_document_page_count, tmp_path
                     )
-                    if content.get("pages"):
-                        total_notebook_pages = content["pages"]
-                    if content.get("handwritten_text"):
-                        notebook_pages = content["handwritten_text"]
-                        ocr_backend_used = content.get("ocr_backend")
-
-            # For non-notebooks or when no OCR pages, build annotation sections
-            if not (is_notebook and notebook_pages):
-                if content is None:
-                    # Need to extract if we haven't already
-                    raw_doc = client.download(target_doc)
-                    with _helpers._temp_document(raw_doc) as tmp_path:
-                        content = _helpers.extract_text_from_document_zip(
-                            tmp_path, include_ocr=include_ocr, doc_id=target_doc.ID
+                    _helpers.cache_page_count(target_doc.ID, modified, total_notebook_pages)
+
+                    if pages is None and page > total_notebook_pages:
+                        return _helpers.build_error(
+                            error_type="page_out_of_range",
+                            message=f"Page {page} does not exist. "
+                            f"Document has {total_notebook_pages} notebook page(s).",
+                            suggestion=f"Use page=1 to {total_notebook_pages} "
+                            "to read different pages.",
+                            compact=compact,
                         )
 
-                # Add annotations section
-                annotation_parts = []
-                if content.get("typed_text"):
-                    annotation_parts.extend(content["typed_text"])
-                if content.get("highlights"):
-                    annotation_parts.append("\n--- Highlights ---")
-                    annotation_parts.extend(content["highlights"])
-                if content.get("handwritten_text"):
-                    annotation_parts.append("\n--- Handwritten (OCR) ---")
-                    annotation_parts.extend(content["handwritten_text"])
-
-                if annotation_parts:
-                    if text_parts and content_type == "text":
-                        text_parts.append("\n\n=== Annotations ===\n")
-                    text_parts.extend(annotation_parts)
-
-        # For notebooks with OCR: use page-based pagination
-        if notebook_pages:
-            total_pages = len(notebook_pages)
-
-            # ---- Multi-page read ----
-            if pages is not None:
-                requested = _helpers.parse_pages(pages, total_pages)
-                if not requested:
-                    return _helpers.make_error(
-                        error_type="invalid_pages",
-                        message=f"No valid pages in '{pages}'. Document has {total_pages} page(s).",
-                        suggestion=f"Use pages='all' or pages='1-{total_pages}'.",
-                        compact=compact,
+                    wanted = (
+                        _helpers.parse_pages(pages, total_notebook_pages)
+                        if pages is not None
+                        else [page]
                     )
+                    notebook_pages = cached_pages(wanted)
+                    pending = [p for p in wanted if p not in notebook_pages]
+
+                    async def render(p):
+                        # Reuse an earlier render of this page version if we have one
+                        png = _helpers.get_cached_render(target_doc.ID, modified, p)
+                        if png is None:
+                            png = await asyncio.to_thread(
+                                _helpers.render_page_from_document_zip, tmp_path, p
+                            )
+                            if png:
+                                _helpers.cache_render(target_doc.ID, modified, p, png)
+                        return png
+
+                    semaphore = asyncio.Semaphore(_helpers._MAX_CONCURRENT_SAMPLING)
+
+                    async def ocr_page(p):
+                        # Render inside the same bounded task as the OCR, so
+                        # renders overlap sampling requests
+                        async with semaphore:
+                            png_data = await render(p)
+                            return (
+                                await _helpers.ocr_via_sampling(ctx, png_data) if png_data else None
+                            )
 
-                parts = []
-                returned_pages = []
-                total_len = 0
-                truncated = False
-                for p in requested:
-                    pg_content = notebook_pages[p - 1]
-                    separator = f"--- Page {p} ---\n"
-                    chunk = separator + pg_content
-                    if total_len + len(chunk) > _helpers.MAX_OUTPUT_CHARS:
-                        truncated = True
-                        remaining = _helpers.MAX_OUTPUT_CHARS - total_len
-                        if remaining > len(separator):
-                            parts.append(separator + pg_content[: remaining - len(separator)])
-                            returned_pages.append(p)
-                        break
-                    parts.append(chunk)
-                    returned_pages.append(p)
-                    total_len += len(chunk)
-
-                combined = "\n\n".join(parts)
-
-                # Apply grep across combined content
-                grep_matches = 0
-                if grep:
-                    try:
-                        pattern = re.compile(grep, re.IGNORECASE | re.MULTILINE)
-                        matches = []
-                        for match in pattern.finditer(combined):
-                            start = max(0, match.start() - 100)
-                            end = min(len(combined), match.end() + 100)
-                            context = combined[start:end]
-                            if start > 0:
-                                context = "..." + context
-                            if end < len(combined):
-                                context = context + "..."
-                            matches.append(context)
-                            grep_matches += 1
-                        if matches:
-                            combined = "\n\n---\n\n".join(matches)
-                    except re.error as e:
-                        return _helpers.make_error(
-                            error_type="invalid_grep",
-                            message=f"Invalid regex pattern: {e}",
-                            suggestion="Use a valid regex pattern or simple text string.",
-                            compact=compact,
-                        )
-
-                result = {
-                    "name": target_doc.VissibleName,
-                    "path": _helpers._apply_root_filter(doc_path),
-                    "file_type": "notebook",
-                    "content_type": content_type,
-                    "content": combined,
-                    "pages": returned_pages,
-                    "total_pages": total_pages,
-                    "page_type": "notebook",
-                    "total_chars": len(combined),
-                    "truncated": truncated,
-                    "modified": (
-                        target_doc.ModifiedClient if hasattr(target_doc, "ModifiedClient") else None
-                    ),
-                }
-                if include_ocr and ocr_backend_used:
-                    result["ocr_backend"] = ocr_backend_used
-                if grep:
-                    result["grep"] = grep
-                    result["grep_matches"] = grep_matches
-
-                hint = f"Returned {len(returned_pages)}/{total_pages} pages."
-                if truncated:
-                    hint += " Output truncated at character limit."
-                return _helpers.make_response(result, hint, compact=compact)
-
-            # ---- Single page read ----
-            if page > total_pages:
-                return _helpers.make_error(
-                    error_type="page_out_of_range",
-                    message=f"Page {page} does not exist. "
-                    f"Document has {total_pages} notebook page(s).",
-                    suggestion=f"Use page=1 to {total_pages} to read different pages.",
+                    done = set(notebook_pages)
+
+                    def prefix_chars():
+                        """Length of the leading wanted pages whose text is settled."""
+                        total = 0
+                        for p in wanted:
+                            if p not in done:
+                                break
+                            total += len(notebook_pages.get(p, ""))
+                        return total
+
+                    # OCR a batch at a time, stopping once the output cap is
+                    # covered or the per-call page budget is spent
+                    batch_size = _helpers._MAX_CONCURRENT_SAMPLING
+                    for i in range(0, len(pending), batch_size):
+                        if i >= _MAX_SAMPLING_PAGES_PER_READ or prefix_chars() >= max_chars:
+                            break
+                        batch = pending[i : i + batch_size]
+                        ocr_texts = await asyncio.gather(*(ocr_page(p) for p in batch))
+                        for p, ocr_text in zip(batch, ocr_texts):
+                            done.add(p)
+                            if ocr_text:
+                                _helpers.cache_page_ocr(target_doc.ID, p, "sampling", ocr_text)
+                                notebook_pages[p] = ocr_text
+                    ocr_deferred_from = next((p for p in wanted if p not in done), None)
+                    # Keep page order stable for grep redirects
+                    notebook_pages = dict(sorted(notebook_pages.items()))
+
+            if notebook_pages:
+                ocr_backend_used = "sampling"
+
+        # If not using sampling OCR, perform standard extraction
+        if not notebook_pages and is_notebook:
+            if raw_doc is None:
+                raw_doc = await _helpers.download_document(client, target_doc)
+            content = await _helpers.extract_document(raw_doc, target_doc.ID, include_ocr)
+            if content.get("pages"):
+                total_notebook_pages = content["pages"]
+            if content.get("handwritten_text"):
+                notebook_pages = dict(enumerate(content["handwritten_text"], 1))
+                total_notebook_pages = len(notebook_pages)
+                ocr_backend_used = content.get("ocr_backend")
+
+        # For non-notebooks or when no OCR pages, build annotation sections
+        if not (is_notebook and notebook_pages):
+            if content is None:
+                # Need to extract if we haven't already
+                if raw_doc is None:
+                    raw_doc = await _helpers.download_document(client, target_doc)
+                content = await _helpers.extract_document(raw_doc, target_doc.ID, include_ocr)
+
+            # Add annotations section
+            annotation_parts = []
+            if content.get("typed_text"):
+                annotation_parts.extend(content["typed_text"])
+            if content.get("highlights"):
+                annotation_parts.append("\n--- Highlights ---")
+                annotation_parts.extend(content["highlights"])
+            if content.get("handwritten_text"):
+                annotation_parts.append("\n--- Handwritten (OCR) ---")
+                annotation_parts.extend(content["handwritten_text"])
+
+            if annotation_parts:
+                if text_parts and content_type == "text":
+                    text_parts.append("\n\n=== Annotations ===\n")
+                text_parts.extend(annotation_parts)
+
+    # For notebooks with OCR: use page-based pagination
+    if notebook_pages:
+        total_pages = total_notebook_pages
+
+        # ---- Multi-page read ----
+        if pages is not None:
+            requested = _helpers.parse_pages(pages, total_pages)
+            if not requested:
+                return _helpers.build_error(
+                    error_type="invalid_pages",
+                    message=f"No valid pages in '{pages}'. Document has {total_pages} page(s).",
+                    suggestion=f"Use pages='all' or pages='1-{total_pages}'.",
                     compact=compact,
                 )
 
-            page_content = notebook_pages[page - 1]
-            has_more = page < total_pages
-            grep_redirected_from = None
+            # Write separators and page text straight into one buffer rather
+            # than building a combined chunk per page
+            buf = io.StringIO()
+            returned_pages = []
+            total_len = 0
+            truncated = False
+            ocr_cut = ocr_deferred_from in requested
+            if ocr_cut:
+                # Pages from here on were not OCR'd in this call
+                requested = requested[: requested.index(ocr_deferred_from)]
+                truncated = True
+            for p in requested:
+                pg_content = notebook_pages.get(p, "")
+                separator = f"--- Page {p} ---\n"
+                need = len(separator) + len(pg_content)
+                if total_len + need > max_chars:
+                    truncated = True
+                    remaining = max_chars - total_len
+                    if remaining > len(separator):
+                        if returned_pages:
+                            buf.write(_PART_SEP)
+                        buf.write(separator)
+                        buf.write(pg_content[: remaining - len(separator)])
+                        returned_pages.append(p)
+                    break
+                if returned_pages:
+                    buf.write(_PART_SEP)
+                buf.write(separator)
+                buf.write(pg_content)
+                returned_pages.append(p)
+                total_len += need
+
+            combined = buf.getvalue()
 
-            # Apply grep filter if specified
+            # Apply grep across combined content
             grep_matches = 0
             if grep:
                 try:
-                    pattern = re.compile(grep, re.IGNORECASE | re.MULTILINE)
-                    if not pattern.search(page_content):
-                        # No match on this page — auto-redirect to first matching page
-                        matching_pages = []
-                        for i, pg in enumerate(notebook_pages, 1):
-                            if pattern.search(pg):
-                                matching_pages.append(i)
-                        if matching_pages:
-                            # Auto-redirect: switch to first matching page
-                            grep_redirected_from = page
-                            page = matching_pages[0]
-                            page_content = notebook_pages[page - 1]
-                            has_more = page < total_pages
-                        else:
-                            return _helpers.make_error(
-                                error_type="no_grep_matches",
-                                message=f"No matches for '{grep}' in document.",
-                                suggestion="Try a different search term.",
-                                compact=compact,
-                            )
-                    grep_matches = len(pattern.findall(page_content))
-                except re.error as e:
-                    return _helpers.make_error(
-                        error_type="invalid_grep",
-                        message=f"Invalid regex pattern: {e}",
-                        suggestion="Use a valid regex pattern or simple text string.",
-                        compact=compact,
+                    windows, grep_matches, grep_truncated = _helpers.grep_windows(
+                        combined, grep, max_chars=max_chars
                     )
+                except re.error as e:
+                    return _invalid_grep_error(e, compact)
+                if grep_matches:
+                    combined = windows
+                    truncated = truncated or grep_truncated
 
             result = {
-                "name": target_doc.VissibleName,
-                "path": _helpers._apply_root_filter(doc_path),
+                "name": doc_name,
+                "path": filtered_path,
                 "file_type": "notebook",
                 "content_type": content_type,
-                "content": page_content,
-                "page": page,
+                "content": combined,
+                "pages": returned_pages,
                 "total_pages": total_pages,
                 "page_type": "notebook",
-                "total_chars": len(page_content),
-                "more": has_more,
-                "modified": (
-                    target_doc.ModifiedClient if hasattr(target_doc, "ModifiedClient") else None
-                ),
+                "total_chars": len(combined),
+                "truncated": truncated,
+                "modified": modified,
             }
-
-            # Add OCR backend info if OCR was used
             if include_ocr and ocr_backend_used:
                 result["ocr_backend"] = ocr_backend_used
-
             if grep:
                 result["grep"] = grep
                 result["grep_matches"] = grep_matches
-            if grep_redirected_from is not None:
-                result["grep_redirected_from"] = grep_redirected_from
 
-            hint_parts = [f"Notebook page {page}/{total_pages}."]
-            if grep_redirected_from is not None:
-                hint_parts.insert(0, f"Auto-redirected from page {grep_redirected_from}.")
-            if has_more:
-                doc_name = target_doc.VissibleName
-                hint_parts.append(f"Next: remarkable_read('{doc_name}', page={page + 1}).")
-            else:
-                hint_parts.append("(last page)")
-            if grep_matches:
-                hint_parts.insert(0, f"Found {grep_matches} match(es) for '{grep}'.")
-
-            return _helpers.make_response(result, " ".join(hint_parts), compact=compact)
-
-        # Combine all content
-        full_text = "\n\n".join(text_parts) if text_parts else ""
-        total_chars = len(full_text)
-
-        # ---- Multi-page for PDFs/EPUBs ----
-        if pages is not None and total_chars > 0:
-            # pages="all" returns full text; page ranges don't apply to PDFs
-            content = full_text
-            if len(content) > _helpers.MAX_OUTPUT_CHARS:
-                content = content[: _helpers.MAX_OUTPUT_CHARS]
-                truncated = True
-            else:
-                truncated = False
-
-            # Apply grep across combined content
-            grep_matches = 0
-            if grep:
-                try:
-                    pattern = re.compile(grep, re.IGNORECASE | re.MULTILINE)
-                    matches = []
-                    for match in pattern.finditer(content):
-                        start = max(0, match.start() - 100)
-                        end = min(len(content), match.end() + 100)
-                        ctx_text = content[start:end]
-                        if start > 0:
-                            ctx_text = "..." + ctx_text
-                        if end < len(content):
-                            ctx_text = ctx_text + "..."
-                        matches.append(ctx_text)
-                        grep_matches += 1
-                    if matches:
-                        content = "\n\n---\n\n".join(matches)
-                except re.error as e:
-                    return _helpers.make_error(
-                        error_type="invalid_grep",
-                        message=f"Invalid regex pattern: {e}",
-                        suggestion="Use a valid regex pattern or simple text string.",
-                        compact=compact,
-                    )
+            hint = f"Returned {len(returned_pages)}/{total_pages} pages."
+            if ocr_cut and len(returned_pages) == len(requested):
+                hint += (
+                    f" OCR stopped before page {ocr_deferred_from}; use "
+                    f"pages='{ocr_deferred_from}-{total_pages}' to continue."
+                )
+            elif truncated:
+                hint += " Output truncated at character limit."
+            return _helpers.build_response(result, hint, compact=compact)
 
-            result = {
-                "name": target_doc.VissibleName,
-                "path": _helpers._apply_root_filter(doc_path),
-                "file_type": file_type or "notebook",
-                "content_type": content_type,
-                "content": content,
-                "total_chars": len(content),
-                "truncated": truncated,
-                "more": False,
-                "modified": (
-                    target_doc.ModifiedClient if hasattr(target_doc, "ModifiedClient") else None
-                ),
-            }
-            if grep:
-                result["grep"] = grep
-                result["grep_matches"] = grep_matches
+        # ---- Single page read ----
+        if page > total_pages:
+            return _helpers.build_error(
+                error_type="page_out_of_range",
+                message=f"Page {page} does not exist. Document has {total_pages} notebook page(s).",
+                suggestion=f"Use page=1 to {total_pages} to read different pages.",
+                compact=compact,
+            )
 
-            hint = f"Full document content ({len(content)} chars)."
-            if truncated:
-                hint += " Output truncated at character limit."
-            return _helpers.make_response(result, hint, compact=compact)
+        page_content = notebook_pages.get(page, "")
+        has_more = page < total_pages
+        grep_redirected_from = None
 
         # Apply grep filter if specified
         grep_matches = 0
-        if grep and full_text:
+        if grep:
             try:
-                pattern = re.compile(grep, re.IGNORECASE | re.MULTILINE)
-                # Find all matches and include context
-                matches = []
-                for match in pattern.finditer(full_text):
-                    start = max(0, match.start() - 100)
-                    end = min(len(full_text), match.end() + 100)
-                    context = full_text[start:end]
-                    # Add ellipsis if truncated
-                    if start > 0:
-                        context = "..." + context
-                    if end < len(full_text):
-                        context = context + "..."
-                    matches.append(context)
-                    grep_matches += 1
-
-                if matches:
-                    full_text = "\n\n---\n\n".join(matches)
-                    total_chars = len(full_text)
-                else:
-                    full_text = ""
-                    total_chars = 0
+                pattern = _helpers.compile_grep(grep)
+                # Pages shorter than the shortest possible match are skipped
+                # without running the pattern
+                min_len = _helpers.grep_min_length(grep)
+                if len(page_content) < min_len or not pattern.search(page_content):
+                    # No match on this page — auto-redirect to first matching page
+                    # (stops scanning at the first hit; pages are kept in order)
+                    first_match = next(
+                        (
+                            i
+                            for i, pg in notebook_pages.items()
+                            if len(pg) >= min_len and pattern.search(pg)
+                        ),
+                        None,
+                    )
+                    if first_match is None:
+                        return _helpers.build_error(
+                            error_type="no_grep_matches",
+                            message=f"No matches for '{grep}' in document.",
+                            suggestion="Try a different search term.",
+                            compact=compact,
+                        )
+                    grep_redirected_from = page
+                    page = first_match
+                    page_content = notebook_pages[page]
+                    has_more = page < total_pages
+                grep_matches = _helpers.count_grep_matches(page_content, grep)
             except re.error as e:
-                return _helpers.make_error(
-                    error_type="invalid_grep",
-                    message=f"Invalid regex pattern: {e}",
-                    suggestion="Use a valid regex pattern or simple text string.",
-                    compact=compact,
-                )
-
-        # Apply pagination
-        start_idx = (page - 1) * page_size
-        end_idx = start_idx + page_size
-
-        # Handle empty content case - auto-retry with OCR if not already enabled
-        if total_chars == 0 and not include_ocr and file_type not in ("pdf", "epub") and auto_ocr:
-            # Auto-retry with OCR for notebooks
-            import json
-
-            ocr_result = await remarkable_read(
-                document=document,
-                content_type=content_type,
-                page=page,
-                grep=grep,
-                include_ocr=True,  # Enable OCR automatically
-                ctx=ctx,
-            )
-            result_data = json.loads(ocr_result)
-            if "_error" not in result_data:
-                result_data["_ocr_auto_enabled"] = True
-                result_data["_hint"] = (
-                    "OCR auto-enabled (notebook had no typed text). " + result_data.get("_hint", "")
-                )
-            return json.dumps(result_data, indent=2)
-
-        if total_chars == 0:
-            real_pages = total_notebook_pages or 1
-            if page > real_pages:
-                return _helpers.make_error(
-                    error_type="page_out_of_range",
-                    message=f"Page {page} does not exist. Document has {real_pages} page(s).",
-                    suggestion=f"Use page=1 to {real_pages} to read different pages.",
-                    compact=compact,
-                )
-            # Return empty result for page 1
-            result = {
-                "name": target_doc.VissibleName,
-                "path": _helpers._apply_root_filter(doc_path),
-                "file_type": file_type or "notebook",
-                "content_type": content_type,
-                "content": "",
-                "page": page,
-                "total_pages": real_pages,
-                "total_chars": 0,
-                "more": False,
-                "modified": (
-                    target_doc.ModifiedClient if hasattr(target_doc, "ModifiedClient") else None
-                ),
-            }
-            hint = (
-                f"Document '{target_doc.VissibleName}' has no extractable text content. "
-                "This may be a handwritten notebook - try include_ocr=True for OCR extraction."
-            )
-            return _helpers.make_response(result, hint, compact=compact)
-
-        if start_idx >= total_chars:
-            # Page out of range
-            total_pages = max(1, (total_chars + page_size - 1) // page_size)
-            return _helpers.make_error(
-                error_type="page_out_of_range",
-                message=f"Page {page} does not exist. Document has {total_pages} page(s).",
-                suggestion="Use page=1 to start from the beginning.",
-                compact=compact,
-            )
-
-        page_content = full_text[start_idx:end_idx]
-        has_more = end_idx < total_chars
-        total_pages = max(1, (total_chars + page_size - 1) // page_size)
+                return _invalid_grep_error(e, compact)
 
         result = {
-            "name": target_doc.VissibleName,
-            "path": _helpers._apply_root_filter(doc_path),
-            "file_type": file_type or "notebook",
+            "name": doc_name,
+            "path": filtered_path,
+            "file_type": "notebook",
             "content_type": content_type,
             "content": page_content,
             "page": page,
             "total_pages": total_pages,
-            "total_chars": total_chars,
+            "page_type": "notebook",
+            "total_chars": len(page_content),
             "more": has_more,
-            "modified": (
-                target_doc.ModifiedClient if hasattr(target_doc, "ModifiedClient") else None
-            ),
+            "modified": modified,
         }
 
-        if has_more:
-            result["next_page"] = page + 1
+        # Add OCR backend info if OCR was used
+        if include_ocr and ocr_backend_used:
+            result["ocr_backend"] = ocr_backend_used
 
         if grep:
             result["grep"] = grep
             result["grep_matches"] = grep_matches
+        if grep_redirected_from is not None:
+            result["grep_redirected_from"] = grep_redirected_from
 
-        # Build contextual hint
-        hint_parts = []
+        hint_parts = [f"Notebook page {page}/{total_pages}."]
+        if grep_redirected_from is not None:
+            hint_parts.insert(0, f"Auto-redirected from page {grep_redirected_from}.")
+        if has_more:
+            hint_parts.append(f"Next: remarkable_read('{doc_name}', page={page + 1}).")
+        else:
+            hint_parts.append("(last page)")
+        if grep_matches:
+            hint_parts.insert(0, f"Found {grep_matches} match(es) for '{grep}'.")
+
+        return _helpers.build_response(result, " ".join(hint_parts), compact=compact)
+
+    # Part offsets give the combined length (and let pagination slice one
+    # page out) without joining everything up front
+    part_starts, total_chars = _part_offsets(text_parts)
+    full_text: Optional[str] = None
+
+    # ---- Multi-page for PDFs/EPUBs ----
+    if pages is not None and total_chars > 0:
+        # pages="all" returns full text; page ranges don't apply to PDFs
+        truncated = total_chars > max_chars
+        if truncated:
+            # Join only the parts that fit under the output cap
+            content = _slice_parts(text_parts, part_starts, 0, max_chars)
+        else:
+            content = _PART_SEP.join(text_parts)
 
+        # Apply grep across combined content
+        grep_matches = 0
         if grep:
-            if grep_matches > 0:
-                hint_parts.append(f"Found {grep_matches} match(es) for '{grep}'.")
-            else:
-                hint_parts.append(f"No matches for '{grep}' on this page.")
-                if has_more:
-                    hint_parts.append("Try searching other pages.")
+            try:
+                windows, grep_matches, grep_truncated = _helpers.grep_windows(
+                    content, grep, max_chars=max_chars
+                )
+            except re.error as e:
+                return _invalid_grep_error(e, compact)
+            if grep_matches:
+                content = windows
+                truncated = truncated or grep_truncated
 
-        if has_more:
-            hint_parts.append(
-                f"Page {page}/{total_pages}. Next: remarkable_read('{document}', page={page + 1})"
-            )
-        else:
-            hint_parts.append(f"Page {page}/{total_pages} (complete).")
+        result = {
+            "name": doc_name,
+            "path": filtered_path,
+            "file_type": file_type or "notebook",
+            "content_type": content_type,
+            "content": content,
+            "total_chars": len(content),
+            "truncated": truncated,
+            "more": False,
+            "modified": modified,
+        }
+        if grep:
+            result["grep"] = grep
+            result["grep_matches"] = grep_matches
 
-        return _helpers.make_response(result, " ".join(hint_parts), compact=compact)
+        hint = f"Full document content ({len(content)} chars)."
+        if truncated:
+            hint += " Output truncated at character limit."
+        return _helpers.build_response(result, hint, compact=compact)
+
+    # Apply grep filter if specified
+    grep_matches = 0
+    if grep and total_chars:
+        full_text = _PART_SEP.join(text_parts)
+        try:
+            # Output is paginated below, so the windows are not capped here
+            full_text, grep_matches, _ = _helpers.grep_windows(full_text, grep)
+        except re.error as e:
+            return _invalid_grep_error(e, compact)
+        total_chars = len(full_text)
 
-    except Exception as e:
-        return _helpers.make_error(
-            error_type="read_failed",
-            message=str(e),
-            suggestion=_helpers.suggest_for_error(e),
+    # Apply pagination
+    start_idx = (page - 1) * page_size
+    end_idx = start_idx + page_size
+
+    # Handle empty content case - auto-retry with OCR if not already enabled
+    if total_chars == 0 and not include_ocr and file_type not in ("pdf", "epub") and auto_ocr:
+        # Auto-retry with OCR for notebooks, reusing the downloaded document
+        result_data = await _read_document(
+            client,
+            target_doc,
+            doc_path,
+            file_type,
+            document=document,
+            content_type=content_type,
+            page=page,
+            pages=pages,
+            grep=grep,
+            include_ocr=True,  # Enable OCR automatically
+            auto_ocr=False,
+            ctx=ctx,
             compact=compact,
+            raw_doc=raw_doc,
         )
+        if "_error" not in result_data:
+            result_data["_ocr_auto_enabled"] = True
+            if not compact:
+                result_data["_hint"] = (
+                    "OCR auto-enabled (notebook had no typed text). " + result_data.get("_hint", "")
+                )
+        return result_data
+
+    if total_chars == 0:
+        real_pages = total_notebook_pages or 1
+        if page > real_pages:
+            return _helpers.build_error(
+                error_type="page_out_of_range",
+                message=f"Page {page} does not exist. Document has {real_pages} page(s).",
+                suggestion=f"Use page=1 to {real_pages} to read different pages.",
+                compact=compact,
+            )
+        # Return empty result for page 1
+        result = {
+            "name": doc_name,
+            "path": filtered_path,
+            "file_type": file_type or "notebook",
+            "content_type": content_type,
+            "content": "",
+            "page": page,
+            "total_pages": real_pages,
+            "total_chars": 0,
+            "more": False,
+            "modified": modified,
+        }
+        hint = (
+            f"Document '{doc_name}' has no extractable text content. "
+            "This may be a handwritten notebook - try include_ocr=True for OCR extraction."
+        )
+        return _helpers.build_response(result, hint, compact=compact)
+
+    if start_idx >= total_chars:
+        # Page out of range
+        total_pages = max(1, (total_chars + page_size - 1) // page_size)
+        return _helpers.build_error(
+            error_type="page_out_of_range",
+            message=f"Page {page} does not exist. Document has {total_pages} page(s).",
+            suggestion="Use page=1 to start from the beginning.",
+            compact=compact,
+        )
+
+    if full_text is not None:
+        page_content = full_text[start_idx:end_idx]
+    else:
+        page_content = _slice_parts(text_parts, part_starts, start_idx, end_idx)
+    has_more = end_idx < total_chars
+    total_pages = max(1, (total_chars + page_size - 1) // page_size)
+
+    result = {
+        "name": doc_name,
+        "path": filtered_path,
+        "file_type": file_type or "notebook",
+        "content_type": content_type,
+        "content": page_content,
+        "page": page,
+        "total_pages": total_pages,
+        "total_chars": total_chars,
+        "more": has_more,
+        "modified": modified,
+    }
+
+    if has_more:
+        result["next_page"] = page + 1
+
+    if grep:
+        result["grep"] = grep
+        result["grep_matches"] = grep_matches
+
+    # Build contextual hint
+    hint_parts = []
+
+    if grep:
+        if grep_matches > 0:
+            hint_parts.append(f"Found {grep_matches} match(es) for '{grep}'.")
+        else:
+            hint_parts.append(f"No matches for '{grep}' on this page.")
+            if has_more:
+                hint_parts.append("Try searching other pages.")
+
+    if has_more:
+        hint_parts.append(
+            f"Page {page}/{total_pages}. Next: remarkable_read('{document}', page={page + 1})"
+        )
+    else:
+        hint_parts.append(f"Page {page}/{total_pages} (complete).")
+
+    return _helpers.build_response(result, " ".join(hint_parts), compact=compact)
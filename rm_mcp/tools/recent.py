@@ -1,11 +1,24 @@
 """remarkable_recent tool — get recently modified documents."""
 
+import asyncio
+import heapq
+
 from rm_mcp.server import mcp
 from rm_mcp.tools import _helpers
 
+# How many cloud preview downloads run at once
+_MAX_CONCURRENT_PREVIEWS = 4
+
+
+async def _download_preview(client, doc) -> str:
+    """Download a PDF/EPUB and return the first 200 chars of its typed text."""
+    raw_doc = await _helpers.download_document(client, doc)
+    content = await _helpers.extract_document(raw_doc, doc.ID, include_ocr=False)
+    return "\n".join(content["typed_text"])[:200]
+
 
 @mcp.tool(annotations=_helpers.RECENT_ANNOTATIONS)
-def remarkable_recent(
+async def remarkable_recent(
     limit: int = 10, include_preview: bool = False, compact_output: bool = False
 ) -> str:
     """
@@ -40,45 +53,42 @@ def remarkable_recent(
 
         root = _helpers._get_root_path()
 
-        # Get documents sorted by modified date (excluding archived, filtered by root)
-        documents = []
-        for item in collection:
-            if item.is_folder or _helpers._is_cloud_archived(item):
-                continue
-            item_path = _helpers.get_item_path(item, items_by_id)
-            if not _helpers._is_within_root(item_path, root):
-                continue
-            documents.append(item)
-
-        documents.sort(
-            key=lambda x: (
-                x.ModifiedClient if hasattr(x, "ModifiedClient") and x.ModifiedClient else ""
+        # Newest documents first (excluding archived, filtered by root); only
+        # the top `limit` are needed, so avoid sorting the whole library
+        documents = heapq.nlargest(
+            limit,
+            (
+                entry
+                for entry in _helpers.get_filtered_docs(collection, root, items_by_id)
+                if not entry.archived
             ),
-            reverse=True,
+            key=lambda entry: entry.modified or "",
         )
 
+        index = None
+        if include_preview and _helpers.get_instance is not None:
+            index = _helpers.get_instance()
+
         results = []
-        for doc in documents[:limit]:
-            doc_path = _helpers.get_item_path(doc, items_by_id)
+        cloud_previews = []  # (doc_info, doc) whose preview needs a cloud download
+        for entry in documents:
+            doc = entry.item
             file_type = _helpers._get_file_type_cached(client, doc)
             doc_info = {
                 "name": doc.VissibleName,
-                "path": _helpers._apply_root_filter(doc_path),
+                "path": _helpers._apply_root_filter(entry.path),
                 "file_type": file_type,
-                "modified": (doc.ModifiedClient if hasattr(doc, "ModifiedClient") else None),
+                "modified": entry.modified,
             }
 
             if include_preview:
                 # Try L2 index first (no cloud download needed)
                 l2_preview = None
-                try:
-                    from rm_mcp.index import get_instance
-
-                    index = get_instance()
-                    if index is not None:
+                if index is not None:
+                    try:
                         l2_preview = index.get_preview(doc.ID, max_chars=200)
-                except Exception:
-                    pass
+                    except Exception:
+                        pass
 
                 if l2_preview:
                     if len(l2_preview) == 200:
@@ -90,23 +100,28 @@ def remarkable_recent(
                     doc_info["preview_skipped"] = "notebook (use remarkable_read with include_ocr)"
                 else:
                     # PDFs and EPUBs have extractable text - fall back to cloud download
-                    try:
-                        raw_doc = client.download(doc)
-                        with _helpers._temp_document(raw_doc) as tmp_path:
-                            content = _helpers.extract_text_from_document_zip(
-                                tmp_path, include_ocr=False, doc_id=doc.ID
-                            )
-                            preview_text = "\n".join(content["typed_text"])[:200]
-                            if preview_text:
-                                if len(preview_text) == 200:
-                                    doc_info["preview"] = preview_text + "..."
-                                else:
-                                    doc_info["preview"] = preview_text
-                    except Exception:
-                        pass
+                    cloud_previews.append((doc_info, doc))
 
             results.append(doc_info)
 
+        if cloud_previews:
+            # Downloads run on worker threads, a few at a time
+            semaphore = asyncio.Semaphore(_MAX_CONCURRENT_PREVIEWS)
+
+            async def fetch_preview(doc):
+                async with semaphore:
+                    return await _download_preview(client, doc)
+
+            previews = await asyncio.gather(
+                *(fetch_preview(doc) for _, doc in cloud_previews), return_exceptions=True
+            )
+            for (doc_info, _), preview_text in zip(cloud_previews, previews):
+                if isinstance(preview_text, str) and preview_text:
+                    if len(preview_text) == 200:
+                        doc_info["preview"] = preview_text + "..."
+                    else:
+                        doc_info["preview"] = preview_text
+
         result = {"count": len(results), "documents": results}
 
         if results:
@@ -1,14 +1,62 @@
 """remarkable_search tool — search across multiple documents."""
 
-import json
+import asyncio
 import logging
-from typing import Optional
+import re
+from itertools import islice
+from typing import Any, Dict, Optional
 
 from rm_mcp.server import mcp
 from rm_mcp.tools import _helpers
 
 logger = logging.getLogger(__name__)
 
+# Context returned per document, and how many grep matches are counted
+# once that context is full (larger counts are reported as capped)
+_SEARCH_CONTENT_CHARS = 2000
+_MAX_COUNTED_MATCHES = 500
+
+# How many L2-miss fallback reads (each a cloud download) run at once
+_MAX_CONCURRENT_FALLBACK_READS = 3
+
+
+async def _read_fallback(
+    semaphore: asyncio.Semaphore,
+    client,
+    doc,
+    doc_path: str,
+    file_type: str,
+    display_path: str,
+    grep: str,
+    include_ocr: bool,
+) -> Dict[str, Any]:
+    """Read a document for a search L2 miss and return the read payload.
+
+    The document is already resolved, so this goes straight to
+    remarkable_read's payload builder: no second lookup and no JSON
+    round-trip. The read offloads its download and extraction to worker
+    threads itself; the semaphore bounds how many download at once.
+    """
+    from rm_mcp.tools import read as _read_mod
+
+    async with semaphore:
+        return await _read_mod._read_document(
+            client,
+            doc,
+            doc_path,
+            file_type,
+            document=display_path,
+            content_type="text",
+            page=1,
+            pages=None,
+            grep=grep,
+            include_ocr=include_ocr,
+            auto_ocr=True,
+            ctx=None,
+            # Only the content fields are merged into the search result
+            compact=True,
+        )
+
 
 @mcp.tool(annotations=_helpers.SEARCH_ANNOTATIONS)
 async def remarkable_search(
@@ -58,15 +106,15 @@ async def remarkable_search(
 
         # ---- Phase 1: FTS5 content search (previously-indexed content) ----
         fts_results = []
-        fts_doc_ids = set()
+        fts_doc_ids = frozenset()
+        index = None
         try:
-            from rm_mcp.index import get_instance
-
-            index = get_instance()
+            if _helpers.get_instance is not None:
+                index = _helpers.get_instance()
             if index is not None:
                 fts_hits = index.search(query, limit=limit)
+                fts_doc_ids = frozenset(hit["doc_id"] for hit in fts_hits)
                 for hit in fts_hits:
-                    fts_doc_ids.add(hit["doc_id"])
                     fts_results.append(
                         {
                             "name": hit["name"],
@@ -82,20 +130,19 @@ async def remarkable_search(
             warnings.append(f"Full-text search unavailable: {e}")
 
         # ---- Phase 2: Name search (existing behavior) ----
-        query_lower = query.lower()
+        # Only fills the slots FTS left; skipped when FTS already filled them
+        entries = _helpers.get_filtered_docs(collection, root, items_by_id)
+        remaining = limit - len(fts_results)
         matching_docs = []
-        for item in collection:
-            if item.is_folder:
-                continue
-            if _helpers._is_cloud_archived(item):
-                continue
-            item_path = _helpers.get_item_path(item, items_by_id)
-            if not _helpers._is_within_root(item_path, root):
-                continue
-            if query_lower in item.VissibleName.lower():
+        if remaining > 0:
+            name_hits = (
+                (entry.item, entry.path)
+                for entry in _helpers.match_doc_names(entries, query.lower())
+                if not entry.archived
                 # Skip if already found via FTS
-                if item.ID not in fts_doc_ids:
-                    matching_docs.append((item, item_path))
+                and entry.item.ID not in fts_doc_ids
+            )
+            matching_docs = list(islice(name_hits, remaining))
 
         # ---- Phase 3: No results at all ----
         if not fts_results and not matching_docs:
@@ -106,23 +153,34 @@ async def remarkable_search(
                 compact=compact,
             )
 
-        # Limit name-search results to fill remaining slots
-        remaining = limit - len(fts_results)
-        matching_docs = matching_docs[: max(0, remaining)]
-
-        # Get index reference for L2 lookups
-        index = None
-        try:
-            from rm_mcp.index import get_instance
-
-            index = get_instance()
-        except Exception:
-            pass
-
         search_results = list(fts_results)  # Start with FTS results
+        # Tallied as results are filled in, for the hint; FTS hits always
+        # carry a snippet
+        docs_with_content = len(fts_results)
+        total_grep_matches = 0
+        grep_matches_capped = False
+
+        # Compile the grep pattern once for every L2 hit below
+        grep_error = None
+        if grep:
+            try:
+                _helpers.compile_grep(grep)
+            except re.error as e:
+                grep_error = f"Invalid regex '{grep}': {e}"
 
-        import re as _re
+        # Fetch indexed content for every candidate in one query
+        l2_snippets = {}
+        if grep and index is not None and matching_docs:
+            try:
+                l2_snippets = index.get_content_snippets(
+                    [doc.ID for doc, _ in matching_docs], max_chars=_helpers.MAX_OUTPUT_CHARS
+                )
+            except Exception:
+                logger.debug("L2 snippet lookup failed", exc_info=True)
 
+        # (doc_result, doc, doc_full_path, file_type, display_path) still
+        # needing a cloud read
+        l2_misses = []
         for doc, doc_full_path in matching_docs:
             display_path = _helpers._apply_root_filter(doc_full_path)
             file_type = _helpers._get_file_type_cached(client, doc)
@@ -136,72 +194,72 @@ async def remarkable_search(
 
             if grep:
                 # With grep: try L2 index first, fall back to cloud download
-                l2_content = None
-                if index is not None:
-                    l2_content = index.get_content_snippet(
-                        doc.ID, max_chars=_helpers.MAX_OUTPUT_CHARS
+                l2_content = l2_snippets.get(doc.ID)
+
+                if l2_content and grep_error:
+                    doc_result["grep_matches"] = 0
+                    doc_result["grep_error"] = grep_error
+                elif l2_content:
+                    # Grep against cached content locally, stopping once the
+                    # output is full and one match past the cap is counted
+                    windows, grep_matches, truncated = _helpers.grep_windows(
+                        l2_content,
+                        grep,
+                        max_chars=_SEARCH_CONTENT_CHARS,
+                        max_matches=_MAX_COUNTED_MATCHES + 1,
                     )
-
-                if l2_content:
-                    # Grep against cached content locally
-                    try:
-                        pattern = _re.compile(grep, _re.IGNORECASE | _re.MULTILINE)
-                        matches = []
-                        for match in pattern.finditer(l2_content):
-                            start = max(0, match.start() - 100)
-                            end = min(len(l2_content), match.end() + 100)
-                            context = l2_content[start:end]
-                            if start > 0:
-                                context = "..." + context
-                            if end < len(l2_content):
-                                context = context + "..."
-                            matches.append(context)
-                        doc_result["grep_matches"] = len(matches)
-                        if matches:
-                            doc_result["content"] = "\n\n---\n\n".join(matches)[:2000]
-                            if len(doc_result["content"]) == 2000:
-                                doc_result["truncated"] = True
-                    except _re.error as e:
-                        doc_result["grep_matches"] = 0
-                        doc_result["grep_error"] = f"Invalid regex '{grep}': {e}"
+                    if grep_matches > _MAX_COUNTED_MATCHES:
+                        grep_matches = _MAX_COUNTED_MATCHES
+                        doc_result["grep_matches_capped"] = True
+                        grep_matches_capped = True
+                    doc_result["grep_matches"] = grep_matches
+                    if grep_matches:
+                        doc_result["content"] = windows
+                        docs_with_content += 1
+                        total_grep_matches += grep_matches
+                        if truncated:
+                            doc_result["truncated"] = True
                 else:
                     # L2 miss — fall back to cloud download via remarkable_read
-                    try:
-                        from rm_mcp.tools import read as _read_mod
-
-                        read_result = await _read_mod.remarkable_read(
-                            document=display_path,
-                            page=1,
-                            grep=grep,
-                            include_ocr=include_ocr,
-                        )
-                        read_data = json.loads(read_result)
-
-                        if "_error" not in read_data:
-                            doc_result["content"] = read_data.get("content", "")[:2000]
-                            doc_result["total_pages"] = read_data.get("total_pages", 1)
-                            doc_result["grep_matches"] = read_data.get("grep_matches", 0)
-                            if len(read_data.get("content", "")) > 2000:
-                                doc_result["truncated"] = True
-                        else:
-                            doc_result["error"] = read_data["_error"]["message"]
-                    except Exception as e:
-                        doc_result["error"] = str(e)
+                    l2_misses.append((doc_result, doc, doc_full_path, file_type, display_path))
             # Without grep: metadata only — no cloud download
 
             search_results.append(doc_result)
 
+        if l2_misses:
+            semaphore = asyncio.Semaphore(_MAX_CONCURRENT_FALLBACK_READS)
+            read_results = await asyncio.gather(
+                *(
+                    _read_fallback(
+                        semaphore, client, doc, doc_path, file_type, display_path, grep, include_ocr
+                    )
+                    for _, doc, doc_path, file_type, display_path in l2_misses
+                ),
+                return_exceptions=True,
+            )
+            for (doc_result, *_), read_data in zip(l2_misses, read_results):
+                if isinstance(read_data, Exception):
+                    doc_result["error"] = str(read_data)
+                    continue
+
+                if "_error" not in read_data:
+                    doc_result["content"] = read_data.get("content", "")[:_SEARCH_CONTENT_CHARS]
+                    doc_result["total_pages"] = read_data.get("total_pages", 1)
+                    doc_result["grep_matches"] = read_data.get("grep_matches", 0)
+                    docs_with_content += 1
+                    total_grep_matches += doc_result["grep_matches"]
+                    if len(read_data.get("content", "")) > _SEARCH_CONTENT_CHARS:
+                        doc_result["truncated"] = True
+                else:
+                    doc_result["error"] = read_data["_error"]["message"]
+
         # ---- Index coverage ----
         index_coverage = None
         if index is not None:
             try:
                 indexed_count = index.get_indexed_document_count()
-                total_docs = sum(
-                    1
-                    for item in collection
-                    if not item.is_folder
-                    and not _helpers._is_cloud_archived(item)
-                    and _helpers._is_within_root(_helpers.get_item_path(item, items_by_id), root)
+                total_docs = _helpers.get_filtered_doc_count(
+                    collection, root, items_by_id, include_archived=False
                 )
                 index_coverage = {"indexed": indexed_count, "total": total_docs}
             except Exception:
@@ -219,22 +277,24 @@ async def remarkable_search(
             result["index_coverage"] = index_coverage
 
         # Build hint
-        docs_with_content = [d for d in search_results if "content" in d or "snippet" in d]
-        content_matches = [d for d in search_results if d.get("match_type") == "content"]
-        name_matches = [d for d in search_results if d.get("match_type") == "name"]
+        content_matches = len(fts_results)
+        name_matches = len(matching_docs)
 
         if grep:
-            matches = sum(d.get("grep_matches", 0) for d in docs_with_content)
-            hint = f"Found {len(docs_with_content)} document(s) with {matches} grep match(es)."
+            at_least = "at least " if grep_matches_capped else ""
+            hint = (
+                f"Found {docs_with_content} document(s) with "
+                f"{at_least}{total_grep_matches} grep match(es)."
+            )
         elif content_matches and name_matches:
             hint = (
-                f"Found {len(content_matches)} content match(es) and "
-                f"{len(name_matches)} name match(es) for '{query}'."
+                f"Found {content_matches} content match(es) and "
+                f"{name_matches} name match(es) for '{query}'."
             )
         elif content_matches:
-            hint = f"Found {len(content_matches)} document(s) with matching content for '{query}'."
+            hint = f"Found {content_matches} document(s) with matching content for '{query}'."
         else:
-            hint = f"Found {len(name_matches)} document(s) matching '{query}' by name."
+            hint = f"Found {name_matches} document(s) matching '{query}' by name."
 
         first_doc = search_results[0] if search_results else None
         if first_doc and "path" in first_doc:
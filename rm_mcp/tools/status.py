@@ -1,8 +1,18 @@
 """remarkable_status tool — check connection and authentication."""
 
+import time
+from typing import Any, Optional, Tuple
+
 from rm_mcp.server import mcp
 from rm_mcp.tools import _helpers
 
+_AUTH_HINT = "To authenticate: run 'uvx rm-mcp --setup' and follow the instructions."
+
+# Last successful response as (collection, key, timestamp, response), reused
+# for back-to-back calls while nothing it was built from has changed
+_STATUS_CACHE_TTL_SECONDS = 2.0
+_status_cache: Optional[Tuple[Any, tuple, float, str]] = None
+
 
 @mcp.tool(annotations=_helpers.STATUS_ANNOTATIONS)
 def remarkable_status(compact_output: bool = False) -> str:
@@ -18,6 +28,7 @@ def remarkable_status(compact_output: bool = False) -> str:
     - remarkable_status(compact_output=True)  # Omit hints
     </examples>
     """
+    global _status_cache
     compact = _helpers.is_compact(compact_output)
     transport = "cloud"
     connection_info = "environment variable" if _helpers.REMARKABLE_TOKEN else "file (~/.rmapi)"
@@ -28,14 +39,41 @@ def remarkable_status(compact_output: bool = False) -> str:
 
         root = _helpers._get_root_path()
 
+        from rm_mcp.cache import _CACHE_TTL_SECONDS
+
+        config = {
+            "ocr_backend": _helpers.get_ocr_backend(),
+            "root_path": root,
+            "background_color": _helpers.get_background_color(),
+            "cache_ttl_seconds": _CACHE_TTL_SECONDS,
+            "compact_mode": _helpers.is_compact(),
+        }
+
+        index = None
+        try:
+            index = _helpers.get_instance() if _helpers.get_instance is not None else None
+        except Exception:
+            pass
+
+        cache_key = (
+            _helpers.collection_stamp(collection),
+            compact,
+            connection_info,
+            tuple(config.values()),
+            index.version if index is not None else None,
+        )
+        now = time.monotonic()
+        cached = _status_cache
+        if (
+            cached is not None
+            and cached[0] is collection
+            and cached[1] == cache_key
+            and now - cached[2] < _STATUS_CACHE_TTL_SECONDS
+        ):
+            return cached[3]
+
         # Count documents (not folders, filtered by root)
-        doc_count = 0
-        for item in collection:
-            if item.is_folder:
-                continue
-            item_path = _helpers.get_item_path(item, items_by_id)
-            if _helpers._is_within_root(item_path, root):
-                doc_count += 1
+        doc_count = _helpers.get_filtered_doc_count(collection, root, items_by_id)
 
         result = {
             "authenticated": True,
@@ -50,21 +88,10 @@ def remarkable_status(compact_output: bool = False) -> str:
             result["root_path"] = root
 
         # Add configuration details
-        from rm_mcp.cache import _CACHE_TTL_SECONDS
-
-        result["config"] = {
-            "ocr_backend": _helpers.get_ocr_backend(),
-            "root_path": root,
-            "background_color": _helpers.get_background_color(),
-            "cache_ttl_seconds": _CACHE_TTL_SECONDS,
-            "compact_mode": _helpers.is_compact(),
-        }
+        result["config"] = config
 
         # Add index stats if available
         try:
-            from rm_mcp.index import get_instance
-
-            index = get_instance()
             if index is not None:
                 stats = index.get_stats()
                 result.update(stats)
@@ -76,17 +103,21 @@ def remarkable_status(compact_output: bool = False) -> str:
         except Exception:
             pass
 
-        hint_parts = [f"Connected successfully via {transport}. Found {doc_count} documents."]
-        if root != "/":
-            hint_parts.append(f"Filtered to root: {root}")
-        if "index_coverage" in result:
-            hint_parts.append(f"Index coverage: {result['index_coverage']}.")
-        hint_parts.append(
-            "Use remarkable_browse() to see your files, "
-            "or remarkable_recent() for recent documents."
-        )
-
-        return _helpers.make_response(result, " ".join(hint_parts), compact=compact)
+        # Compact responses drop the hint, so don't build it
+        hint = ""
+        if not compact:
+            root_note = f" Filtered to root: {root}" if root != "/" else ""
+            coverage = result.get("index_coverage")
+            coverage_note = f" Index coverage: {coverage}." if coverage else ""
+            hint = (
+                f"Connected successfully via {transport}. Found {doc_count} documents."
+                f"{root_note}{coverage_note} Use remarkable_browse() to see your files, "
+                "or remarkable_recent() for recent documents."
+            )
+
+        response = _helpers.make_response(result, hint, compact=compact)
+        _status_cache = (collection, cache_key, now, response)
+        return response
 
     except Exception as e:
         error_msg = str(e)
@@ -98,6 +129,4 @@ def remarkable_status(compact_output: bool = False) -> str:
             "error": error_msg,
         }
 
-        hint = "To authenticate: run 'uvx rm-mcp --setup' and follow the instructions."
-
-        return _helpers.make_response(result, hint, compact=compact)
+        return _helpers.make_response(result, _AUTH_HINT, compact=compact)
@@ -5,18 +5,39 @@ Tests for reMarkable MCP Server
 Tests the 4 intent-based tools using FastMCP's testing capabilities.
 """
 
+import asyncio
+import io
 import json
 import os
 import tempfile
 import time
 import zipfile
+from dataclasses import dataclass
 from pathlib import Path
+from types import SimpleNamespace
+from typing import Optional
 from unittest.mock import AsyncMock, Mock, patch
 
 import pytest
+from mcp.types import (
+    ClientCapabilities,
+    ElicitationCapability,
+    RootsCapability,
+    SamplingCapability,
+)
 
 from rm_mcp.api import register_and_get_token
+from rm_mcp.capabilities import (
+    client_supports_elicitation,
+    client_supports_experimental,
+    client_supports_roots,
+    client_supports_sampling,
+    get_client_capabilities,
+    get_client_info,
+    get_protocol_version,
+)
 from rm_mcp.extract import (
+    clear_extraction_cache,
     extract_text_from_document_zip,
     extract_text_from_rm_file,
     find_similar_documents,
@@ -28,6 +49,11 @@ from rm_mcp.responses import (
 )
 from rm_mcp.server import mcp
 
+try:
+    from orjson import loads as _loads
+except ImportError:  # orjson ships with the optional "fast" extra
+    from json import loads as _loads
+
 # Helper for patching get_cached_collection to return (mock_client, collection)
 # Patch in the tools module where it's imported and used
 _PATCH_CACHED = "rm_mcp.tools._helpers.get_cached_collection"
@@ -37,25 +63,64 @@ _PATCH_CACHED = "rm_mcp.tools._helpers.get_cached_collection"
 # =============================================================================
 
 
+@dataclass(slots=True)
+class FakeItem:
+    """Lightweight stand-in for a collection item, for tests that only read attributes."""
+
+    VissibleName: str
+    ID: str
+    Parent: str = ""
+    ModifiedClient: Optional[str] = None
+    is_folder: bool = False
+    is_cloud_archived: bool = False
+
+
+def build_zip(members):
+    """Build an uncompressed in-memory zip from a {name: content} mapping."""
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w", zipfile.ZIP_STORED) as zf:
+        for name, content in members.items():
+            zf.writestr(name, content)
+    return buf.getvalue()
+
+
+# Document downloads shared by tests that only need a structurally valid zip
+_CACHED_DOC_ZIP = build_zip(
+    {
+        "doc-cached.content": '{"pages": ["page-id-1"]}',
+        "doc-cached/page-id-1.rm": b"dummy rm data",
+    }
+)
+_HANDWRITTEN_DOC_ZIP = build_zip({"doc-hw.content": '{"pages": ["page1"]}'})
+
+
+def make_ctx(capabilities=None, client_info=None, protocol_version=None):
+    """Build a minimal MCP request context exposing session.client_params."""
+    return SimpleNamespace(
+        session=SimpleNamespace(
+            client_params=SimpleNamespace(
+                capabilities=capabilities,
+                clientInfo=client_info,
+                protocolVersion=protocol_version,
+            )
+        )
+    )
+
+
 @pytest.fixture
 def mock_document():
-    """Create a mock Document object."""
-    doc = Mock()
-    doc.VissibleName = "Test Document"
-    doc.ID = "doc-123"
-    doc.Parent = ""
-    doc.ModifiedClient = "2024-01-15T10:30:00Z"
-    return doc
+    """Create a fake Document object."""
+    return FakeItem(
+        VissibleName="Test Document",
+        ID="doc-123",
+        ModifiedClient="2024-01-15T10:30:00Z",
+    )
 
 
 @pytest.fixture
 def mock_folder():
-    """Create a mock Folder object."""
-    folder = Mock()
-    folder.VissibleName = "Test Folder"
-    folder.ID = "folder-456"
-    folder.Parent = ""
-    return folder
+    """Create a fake Folder object."""
+    return FakeItem(VissibleName="Test Folder", ID="folder-456", is_folder=True)
 
 
 @pytest.fixture
@@ -64,9 +129,21 @@ def mock_collection(mock_document, mock_folder):
     return [mock_document, mock_folder]
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
+def registered_tools():
+    """List the registered MCP tools once for the tests that inspect them."""
+    return asyncio.run(mcp.list_tools())
+
+
+@pytest.fixture(scope="session")
+def tools_by_name(registered_tools):
+    """Registered MCP tools keyed by name."""
+    return {tool.name: tool for tool in registered_tools}
+
+
+@pytest.fixture(scope="module")
 def sample_zip_file():
-    """Create a sample reMarkable document zip for testing."""
+    """Create a sample reMarkable document zip for testing (read-only, shared per module)."""
     with tempfile.NamedTemporaryFile(suffix=".zip", delete=False) as tmp:
         with zipfile.ZipFile(tmp.name, "w") as zf:
             # Add a sample text file
@@ -77,6 +154,27 @@ def sample_zip_file():
     Path(tmp.name).unlink(missing_ok=True)
 
 
+@pytest.fixture(autouse=True)
+def _fresh_extraction_cache():
+    """Keep extraction results cached by one test from serving another's doc IDs."""
+    yield
+    clear_extraction_cache()
+
+
+@pytest.fixture
+def mock_cached_empty():
+    """Patch the cached collection to an empty library behind a bare Mock client."""
+    with patch(_PATCH_CACHED) as mock_get_cached:
+        mock_get_cached.return_value = (Mock(), [])
+        yield mock_get_cached
+
+
+@pytest.fixture(scope="session")
+def preview_zip_bytes():
+    """Minimal uncompressed document zip used as a preview download (shared per session)."""
+    return build_zip({"sample.txt": "Preview text content here"})
+
+
 # =============================================================================
 # Test MCP Server Initialization
 # =============================================================================
@@ -89,10 +187,9 @@ class TestMCPServerInitialization:
         """Test that server has correct name."""
         assert mcp.name == "rm-mcp"
 
-    @pytest.mark.asyncio
-    async def test_tools_registered(self):
+    def test_tools_registered(self, registered_tools):
         """Test that all expected tools are registered."""
-        tools = await mcp.list_tools()
+        tools = registered_tools
         tool_names = [tool.name for tool in tools]
 
         expected_tools = [
@@ -107,26 +204,23 @@ class TestMCPServerInitialization:
         for tool_name in expected_tools:
             assert tool_name in tool_names, f"Tool {tool_name} not found"
 
-    @pytest.mark.asyncio
-    async def test_tools_count(self):
+    def test_tools_count(self, registered_tools):
         """Test that we have exactly 6 intent-based tools."""
-        tools = await mcp.list_tools()
+        tools = registered_tools
         assert len(tools) == 6, f"Expected 6 tools, got {len(tools)}"
 
-    @pytest.mark.asyncio
-    async def test_tool_schemas(self):
+    def test_tool_schemas(self, registered_tools):
         """Test that tools have proper schemas."""
-        tools = await mcp.list_tools()
+        tools = registered_tools
 
         for tool in tools:
             assert tool.name, "Tool should have a name"
             assert tool.description, "Tool should have a description"
             assert hasattr(tool, "inputSchema"), "Tool should have inputSchema"
 
-    @pytest.mark.asyncio
-    async def test_all_tools_have_xml_docstrings(self):
+    def test_all_tools_have_xml_docstrings(self, registered_tools):
         """Test that all tools have XML-structured documentation."""
-        tools = await mcp.list_tools()
+        tools = registered_tools
 
         for tool in tools:
             # Check for XML tags in description
@@ -175,12 +269,25 @@ class TestHelperFunctions:
 
         assert "did_you_mean" not in parsed["_error"]
 
+    def test_to_json_handles_datetime_and_int_keys(self):
+        """Test serialization matches stdlib output with and without orjson."""
+        from datetime import datetime
+
+        import rm_mcp.responses as responses
+
+        payload = {"modified": datetime(2024, 1, 2, 3, 4, 5), "pages": {1: "one"}}
+        expected = {"modified": "2024-01-02T03:04:05", "pages": {"1": "one"}}
+
+        assert json.loads(responses.to_json(payload)) == expected
+        with patch.object(responses, "orjson", None):
+            assert json.loads(responses.to_json(payload)) == expected
+
     def test_find_similar_documents(self):
         """Test fuzzy document matching."""
         docs = [
-            Mock(VissibleName="Meeting Notes"),
-            Mock(VissibleName="Project Plan"),
-            Mock(VissibleName="Notes Daily"),
+            FakeItem(VissibleName="Meeting Notes", ID="d1"),
+            FakeItem(VissibleName="Project Plan", ID="d2"),
+            FakeItem(VissibleName="Notes Daily", ID="d3"),
         ]
 
         # Exact partial match
@@ -198,6 +305,13 @@ class TestHelperFunctions:
         assert "doc-123" in items_by_id
         assert "folder-456" in items_by_id
 
+    def test_get_items_by_id_reused_for_same_collection(self, mock_collection):
+        """Test that the lookup dict is only rebuilt for a new collection."""
+        items_by_id = get_items_by_id(mock_collection)
+
+        assert get_items_by_id(mock_collection) is items_by_id
+        assert get_items_by_id(list(mock_collection)) is not items_by_id
+
     def test_get_item_path(self, mock_document, mock_collection):
         """Test getting full item path."""
         items_by_id = get_items_by_id(mock_collection)
@@ -218,6 +332,35 @@ class TestHelperFunctions:
         path = get_item_path(child_doc, items_by_id)
         assert path == "/Test Folder/Child Doc"
 
+    def test_get_item_path_reuses_known_ancestors(self):
+        """Test that memoized ancestor paths are reused for siblings."""
+
+        def item(item_id, name, parent=""):
+            node = Mock()
+            node.ID, node.VissibleName, node.Parent = item_id, name, parent
+            return node
+
+        root = item("f1", "Work")
+        sub = item("f2", "Projects", "f1")
+        a = item("d1", "Alpha", "f2")
+        b = item("d2", "Beta", "f2")
+        items_by_id = {n.ID: n for n in (root, sub, a, b)}
+
+        assert get_item_path(a, items_by_id) == "/Work/Projects/Alpha"
+        root.VissibleName = "Renamed"  # only visible if the walk went past f2
+        assert get_item_path(b, items_by_id) == "/Work/Projects/Beta"
+        assert get_item_path(sub, items_by_id) == "/Work/Projects"
+
+    def test_get_item_path_parent_cycle(self):
+        """Test that a parent cycle terminates the walk."""
+        a, b = Mock(), Mock()
+        a.ID, a.VissibleName, a.Parent = "a", "A", "b"
+        b.ID, b.VissibleName, b.Parent = "b", "B", "a"
+        items_by_id = {"a": a, "b": b}
+
+        assert get_item_path(a, items_by_id) == "/B/A"
+        assert get_item_path(b, items_by_id) == "/A/B"
+
 
 # =============================================================================
 # Test Text Extraction
@@ -239,6 +382,22 @@ class TestTextExtraction:
         # Should have extracted text from txt file
         assert any("sample text" in text.lower() for text in result["typed_text"])
 
+    def test_extract_document_zip_orders_pages(self, tmp_path):
+        """Test pages follow the .content order, with None for blank pages."""
+        from rm_mcp.extract import get_document_page_count
+
+        zip_path = tmp_path / "doc.zip"
+        with zipfile.ZipFile(zip_path, "w") as zf:
+            zf.writestr("doc.content", '{"cPages": {"pages": [{"id": "p2"}, {"id": "blank"}]}}')
+            zf.writestr("doc/p1.rm", b"dummy rm data")
+            zf.writestr("doc/p2.rm", b"dummy rm data")
+
+        result = extract_text_from_document_zip(zip_path)
+
+        assert result["page_ids"] == ["p2", None, "p1"]
+        assert result["pages"] == 3
+        assert get_document_page_count(zip_path) == 2
+
     def test_extract_text_from_rm_file_no_rmscene(self):
         """Test graceful fallback when rmscene not available."""
         # Create a dummy file
@@ -262,15 +421,10 @@ class TestTextExtraction:
 class TestRemarkableStatus:
     """Test remarkable_status tool."""
 
-    @pytest.mark.asyncio
-    @patch(_PATCH_CACHED)
-    async def test_status_authenticated(self, mock_get_cached):
+    async def test_status_authenticated(self, mock_cached_empty):
         """Test status when authenticated."""
-        mock_client = Mock()
-        mock_get_cached.return_value = (mock_client, [])
-
         result = await mcp.call_tool("remarkable_status", {})
-        data = json.loads(result[0][0].text)
+        data = _loads(result[0][0].text)
 
         assert data["authenticated"] is True
         assert "transport" in data
@@ -278,14 +432,43 @@ class TestRemarkableStatus:
         assert data["status"] == "connected"
         assert "_hint" in data
 
-    @pytest.mark.asyncio
+    @patch.dict(os.environ, {"REMARKABLE_ROOT_PATH": "/Work"})
+    @patch("rm_mcp.tools._helpers.get_instance", return_value=None)
+    @patch("rm_mcp.tools._helpers.get_filtered_doc_count", return_value=3)
+    async def test_status_hint_with_root(self, mock_count, mock_index, mock_cached_empty):
+        """Test the status hint mentions the document count and root filter."""
+        result = await mcp.call_tool("remarkable_status", {})
+        data = _loads(result[0][0].text)
+
+        assert data["_hint"] == (
+            "Connected successfully via cloud. Found 3 documents. Filtered to root: /Work "
+            "Use remarkable_browse() to see your files, "
+            "or remarkable_recent() for recent documents."
+        )
+
+    @patch("rm_mcp.tools._helpers.get_filtered_doc_count", return_value=3)
+    @patch(_PATCH_CACHED)
+    async def test_status_reused_for_same_collection(self, mock_get_cached, mock_count):
+        """Test that back-to-back status calls reuse the response until the collection changes."""
+        collection = [Mock()]
+        mock_get_cached.return_value = (Mock(), collection)
+
+        first = await mcp.call_tool("remarkable_status", {})
+        second = await mcp.call_tool("remarkable_status", {})
+        assert first[0][0].text == second[0][0].text
+        assert mock_count.call_count == 1
+
+        mock_get_cached.return_value = (Mock(), list(collection))
+        await mcp.call_tool("remarkable_status", {})
+        assert mock_count.call_count == 2
+
     @patch(_PATCH_CACHED)
     async def test_status_not_authenticated(self, mock_get_cached):
         """Test status when not authenticated."""
         mock_get_cached.side_effect = RuntimeError("Not authenticated. Run: uvx rm-mcp --setup")
 
         result = await mcp.call_tool("remarkable_status", {})
-        data = json.loads(result[0][0].text)
+        data = _loads(result[0][0].text)
 
         assert data["authenticated"] is False
         assert "error" in data
@@ -302,28 +485,22 @@ class TestRemarkableStatus:
 class TestRemarkableBrowse:
     """Test remarkable_browse tool."""
 
-    @pytest.mark.asyncio
-    @patch(_PATCH_CACHED)
-    async def test_browse_root(self, mock_get_cached):
+    async def test_browse_root(self, mock_cached_empty):
         """Test browsing root folder."""
-        mock_client = Mock()
-        mock_get_cached.return_value = (mock_client, [])
-
         result = await mcp.call_tool("remarkable_browse", {"path": "/"})
-        data = json.loads(result[0][0].text)
+        data = _loads(result[0][0].text)
 
         assert data["mode"] == "browse"
         assert data["path"] == "/"
         assert "_hint" in data
 
-    @pytest.mark.asyncio
     @patch(_PATCH_CACHED)
     async def test_browse_error_handling(self, mock_get_cached):
         """Test error handling in browse."""
         mock_get_cached.side_effect = RuntimeError("Connection failed")
 
         result = await mcp.call_tool("remarkable_browse", {"path": "/"})
-        data = json.loads(result[0][0].text)
+        data = _loads(result[0][0].text)
 
         assert "_error" in data
         assert data["_error"]["type"] == "browse_failed"
@@ -337,54 +514,38 @@ class TestRemarkableBrowse:
 class TestRemarkableRecent:
     """Test remarkable_recent tool."""
 
-    @pytest.mark.asyncio
-    @patch(_PATCH_CACHED)
-    async def test_recent_default_limit(self, mock_get_cached):
+    async def test_recent_default_limit(self, mock_cached_empty):
         """Test getting recent documents with default limit."""
-        mock_client = Mock()
-        mock_get_cached.return_value = (mock_client, [])
-
         result = await mcp.call_tool("remarkable_recent", {})
-        data = json.loads(result[0][0].text)
+        data = _loads(result[0][0].text)
 
         assert "count" in data
         assert "documents" in data
         assert "_hint" in data
 
-    @pytest.mark.asyncio
-    @patch(_PATCH_CACHED)
-    async def test_recent_custom_limit(self, mock_get_cached):
+    async def test_recent_custom_limit(self, mock_cached_empty):
         """Test getting recent documents with custom limit."""
-        mock_client = Mock()
-        mock_get_cached.return_value = (mock_client, [])
-
         result = await mcp.call_tool("remarkable_recent", {"limit": 5})
-        data = json.loads(result[0][0].text)
+        data = _loads(result[0][0].text)
 
         assert "count" in data
         assert "documents" in data
 
-    @pytest.mark.asyncio
-    @patch(_PATCH_CACHED)
-    async def test_recent_limit_clamped(self, mock_get_cached):
+    async def test_recent_limit_clamped(self, mock_cached_empty):
         """Test that limit is clamped to valid range."""
-        mock_client = Mock()
-        mock_get_cached.return_value = (mock_client, [])
-
         # Test with limit > 50
         result = await mcp.call_tool("remarkable_recent", {"limit": 100})
         # Should not raise an error
-        data = json.loads(result[0][0].text)
+        data = _loads(result[0][0].text)
         assert "count" in data
 
-    @pytest.mark.asyncio
     @patch(_PATCH_CACHED)
     async def test_recent_error_handling(self, mock_get_cached):
         """Test error handling in recent."""
         mock_get_cached.side_effect = RuntimeError("Connection failed")
 
         result = await mcp.call_tool("remarkable_recent", {})
-        data = json.loads(result[0][0].text)
+        data = _loads(result[0][0].text)
 
         assert "_error" in data
         assert data["_error"]["type"] == "recent_failed"
@@ -398,33 +559,26 @@ class TestRemarkableRecent:
 class TestRemarkableRead:
     """Test remarkable_read tool."""
 
-    @pytest.mark.asyncio
-    @patch(_PATCH_CACHED)
-    async def test_read_document_not_found(self, mock_get_cached):
+    async def test_read_document_not_found(self, mock_cached_empty):
         """Test reading a non-existent document."""
-        mock_client = Mock()
-        mock_get_cached.return_value = (mock_client, [])
-
         result = await mcp.call_tool("remarkable_read", {"document": "NonExistent"})
-        data = json.loads(result[0][0].text)
+        data = _loads(result[0][0].text)
 
         assert "_error" in data
         assert data["_error"]["type"] == "document_not_found"
         assert "suggestion" in data["_error"]
 
-    @pytest.mark.asyncio
     @patch(_PATCH_CACHED)
     async def test_read_error_handling(self, mock_get_cached):
         """Test error handling in read."""
         mock_get_cached.side_effect = RuntimeError("Connection failed")
 
         result = await mcp.call_tool("remarkable_read", {"document": "Test"})
-        data = json.loads(result[0][0].text)
+        data = _loads(result[0][0].text)
 
         assert "_error" in data
         assert data["_error"]["type"] == "read_failed"
 
-    @pytest.mark.asyncio
     @patch(_PATCH_CACHED)
     async def test_read_provides_suggestions(self, mock_get_cached, mock_document):
         """Test that read provides 'did you mean' suggestions."""
@@ -433,7 +587,7 @@ class TestRemarkableRead:
 
         # Search for something similar but not exact
         result = await mcp.call_tool("remarkable_read", {"document": "Test Doc"})
-        data = json.loads(result[0][0].text)
+        data = _loads(result[0][0].text)
 
         # Should get a not found error with suggestions
         assert "_error" in data
@@ -448,13 +602,8 @@ class TestRemarkableRead:
 class TestRemarkableImage:
     """Test remarkable_image tool."""
 
-    @pytest.mark.asyncio
-    @patch(_PATCH_CACHED)
-    async def test_image_document_not_found(self, mock_get_cached):
+    async def test_image_document_not_found(self, mock_cached_empty):
         """Test getting image from non-existent document."""
-        mock_client = Mock()
-        mock_get_cached.return_value = (mock_client, [])
-
         result = await mcp.call_tool("remarkable_image", {"document": "NonExistent"})
         data = json.loads(result[0].text)
 
@@ -462,7 +611,6 @@ class TestRemarkableImage:
         assert data["_error"]["type"] == "document_not_found"
         assert "suggestion" in data["_error"]
 
-    @pytest.mark.asyncio
     @patch(_PATCH_CACHED)
     async def test_image_error_handling(self, mock_get_cached):
         """Test error handling in image tool."""
@@ -474,7 +622,6 @@ class TestRemarkableImage:
         assert "_error" in data
         assert data["_error"]["type"] == "image_failed"
 
-    @pytest.mark.asyncio
     @patch(_PATCH_CACHED)
     async def test_image_provides_suggestions(self, mock_get_cached, mock_document):
         """Test that image tool provides 'did you mean' suggestions."""
@@ -489,11 +636,9 @@ class TestRemarkableImage:
         assert "_error" in data
         assert data["_error"]["type"] == "document_not_found"
 
-    @pytest.mark.asyncio
-    async def test_image_compatibility_parameter_in_schema(self):
+    def test_image_compatibility_parameter_in_schema(self, tools_by_name):
         """Test that remarkable_image tool has the compatibility parameter in its schema."""
-        tools = await mcp.list_tools()
-        image_tool = next(t for t in tools if t.name == "remarkable_image")
+        image_tool = tools_by_name["remarkable_image"]
 
         # Check that compatibility parameter exists in the input schema
         assert "compatibility" in image_tool.inputSchema.get("properties", {})
@@ -682,11 +827,10 @@ class TestUnauthenticatedMode:
 
     @patch("rm_mcp.api.get_rmapi", return_value=None)
     @patch(_PATCH_CACHED, side_effect=RuntimeError("Not authenticated. Run: uvx rm-mcp --setup"))
-    @pytest.mark.asyncio
     async def test_tools_return_setup_instructions(self, mock_cached, mock_rmapi):
         """Test that tools return setup instructions when not authenticated."""
         result = await mcp.call_tool("remarkable_status", {})
-        data = json.loads(result[0][0].text)
+        data = _loads(result[0][0].text)
 
         assert data["authenticated"] is False
         assert "--setup" in data["_hint"]
@@ -731,10 +875,9 @@ class TestE2E:
         assert mcp is not None
         assert mcp.name == "rm-mcp"
 
-    @pytest.mark.asyncio
-    async def test_server_lists_all_tools(self):
+    def test_server_lists_all_tools(self, registered_tools):
         """Test that server can list all tools (e2e)."""
-        tools = await mcp.list_tools()
+        tools = registered_tools
 
         assert len(tools) == 6
 
@@ -744,61 +887,43 @@ class TestE2E:
             assert hasattr(tool, "description")
             assert tool.name.startswith("remarkable_")
 
-    @pytest.mark.asyncio
-    @patch(_PATCH_CACHED)
-    async def test_e2e_call_tool_flow(self, mock_get_cached):
+    async def test_e2e_call_tool_flow(self, mock_cached_empty):
         """Test end-to-end flow of calling a tool."""
-        mock_client = Mock()
-        mock_get_cached.return_value = (mock_client, [])
-
         # Call status tool
         result = await mcp.call_tool("remarkable_status", {})
 
         # Verify we get valid JSON back
-        data = json.loads(result[0][0].text)
+        data = _loads(result[0][0].text)
         assert "authenticated" in data
         assert "_hint" in data
 
-    @pytest.mark.asyncio
-    async def test_tool_parameters_schema(self):
+    def test_tool_parameters_schema(self, tools_by_name):
         """Test that tool parameters have proper schemas."""
-        tools = await mcp.list_tools()
-
         # Check specific tools exist
-        browse_tool = next(t for t in tools if t.name == "remarkable_browse")
-        assert browse_tool is not None
-
-        read_tool = next(t for t in tools if t.name == "remarkable_read")
-        assert read_tool is not None
-
-        recent_tool = next(t for t in tools if t.name == "remarkable_recent")
-        assert recent_tool is not None
-
-        status_tool = next(t for t in tools if t.name == "remarkable_status")
-        assert status_tool is not None
-
-    @pytest.mark.asyncio
-    async def test_all_tools_return_json_with_hint(self):
-        """Test that all tools return JSON with _hint field."""
-        with patch(_PATCH_CACHED) as mock_get_cached:
-            mock_client = Mock()
-            mock_get_cached.return_value = (mock_client, [])
+        for name in [
+            "remarkable_browse",
+            "remarkable_read",
+            "remarkable_recent",
+            "remarkable_status",
+        ]:
+            assert name in tools_by_name
 
-            # Test status
-            result = await mcp.call_tool("remarkable_status", {})
-            data = json.loads(result[0][0].text)
+    @pytest.mark.parametrize(
+        "tool,args",
+        [
+            ("remarkable_status", {}),
+            ("remarkable_browse", {"path": "/"}),
+            ("remarkable_recent", {}),
+        ],
+    )
+    async def test_tool_returns_hint_or_error(self, tool, args, mock_cached_empty):
+        """Test that each tool returns JSON with a _hint (or an _error) field."""
+        result = await mcp.call_tool(tool, args)
+        data = _loads(result[0][0].text)
+        assert "_hint" in data or "_error" in data
+        if tool == "remarkable_status":
             assert "_hint" in data
 
-            # Test browse
-            result = await mcp.call_tool("remarkable_browse", {"path": "/"})
-            data = json.loads(result[0][0].text)
-            assert "_hint" in data or "_error" in data
-
-            # Test recent
-            result = await mcp.call_tool("remarkable_recent", {})
-            data = json.loads(result[0][0].text)
-            assert "_hint" in data or "_error" in data
-
 
 # =============================================================================
 # Test Response Consistency
@@ -808,7 +933,6 @@ class TestE2E:
 class TestResponseConsistency:
     """Test that responses follow consistent patterns."""
 
-    @pytest.mark.asyncio
     @patch(_PATCH_CACHED)
     async def test_all_errors_have_required_fields(self, mock_get_cached):
         """Test that all error responses have required fields."""
@@ -823,7 +947,7 @@ class TestResponseConsistency:
 
         for tool_name, args in tools_to_test:
             result = await mcp.call_tool(tool_name, args)
-            data = json.loads(result[0][0].text)
+            data = _loads(result[0][0].text)
 
             # Either success with _hint or error with _error
             has_hint = "_hint" in data
@@ -847,153 +971,58 @@ class TestCapabilityChecking:
 
     def test_get_client_capabilities_without_context(self):
         """Test get_client_capabilities returns None without valid context."""
-        from rm_mcp.capabilities import get_client_capabilities
-
         # Create mock context without session
-        mock_ctx = Mock()
-        mock_ctx.session = None
+        mock_ctx = SimpleNamespace(session=None)
 
         result = get_client_capabilities(mock_ctx)
         assert result is None
 
     def test_get_client_capabilities_without_client_params(self):
         """Test get_client_capabilities returns None without client_params."""
-        from rm_mcp.capabilities import get_client_capabilities
-
-        mock_ctx = Mock()
-        mock_ctx.session = Mock()
-        mock_ctx.session.client_params = None
+        mock_ctx = SimpleNamespace(session=SimpleNamespace(client_params=None))
 
         result = get_client_capabilities(mock_ctx)
         assert result is None
 
     def test_get_client_capabilities_with_valid_context(self):
         """Test get_client_capabilities returns capabilities when available."""
-        from mcp.types import ClientCapabilities, SamplingCapability
-
-        from rm_mcp.capabilities import get_client_capabilities
-
         mock_caps = ClientCapabilities(sampling=SamplingCapability())
 
-        mock_ctx = Mock()
-        mock_ctx.session = Mock()
-        mock_ctx.session.client_params = Mock()
-        mock_ctx.session.client_params.capabilities = mock_caps
+        mock_ctx = make_ctx(capabilities=mock_caps)
 
         result = get_client_capabilities(mock_ctx)
         assert result is not None
         assert result.sampling is not None
 
-    def test_client_supports_sampling_true(self):
-        """Test client_supports_sampling returns True when sampling available."""
-        from mcp.types import ClientCapabilities, SamplingCapability
-
-        from rm_mcp.capabilities import client_supports_sampling
-
-        mock_caps = ClientCapabilities(sampling=SamplingCapability())
-
-        mock_ctx = Mock()
-        mock_ctx.session = Mock()
-        mock_ctx.session.client_params = Mock()
-        mock_ctx.session.client_params.capabilities = mock_caps
-
-        result = client_supports_sampling(mock_ctx)
-        assert result is True
-
-    def test_client_supports_sampling_false(self):
-        """Test client_supports_sampling returns False when sampling not available."""
-        from mcp.types import ClientCapabilities
-
-        from rm_mcp.capabilities import client_supports_sampling
-
-        mock_caps = ClientCapabilities(sampling=None)
-
-        mock_ctx = Mock()
-        mock_ctx.session = Mock()
-        mock_ctx.session.client_params = Mock()
-        mock_ctx.session.client_params.capabilities = mock_caps
-
-        result = client_supports_sampling(mock_ctx)
-        assert result is False
-
-    def test_client_supports_elicitation(self):
-        """Test client_supports_elicitation."""
-        from mcp.types import ClientCapabilities, ElicitationCapability
-
-        from rm_mcp.capabilities import client_supports_elicitation
-
-        # Test with elicitation enabled
-        mock_caps = ClientCapabilities(elicitation=ElicitationCapability())
-
-        mock_ctx = Mock()
-        mock_ctx.session = Mock()
-        mock_ctx.session.client_params = Mock()
-        mock_ctx.session.client_params.capabilities = mock_caps
-
-        assert client_supports_elicitation(mock_ctx) is True
-
-        # Test with elicitation disabled
-        mock_caps = ClientCapabilities(elicitation=None)
-        mock_ctx.session.client_params.capabilities = mock_caps
-
-        assert client_supports_elicitation(mock_ctx) is False
-
-    def test_client_supports_roots(self):
-        """Test client_supports_roots."""
-        from mcp.types import ClientCapabilities, RootsCapability
-
-        from rm_mcp.capabilities import client_supports_roots
-
-        # Test with roots enabled
-        mock_caps = ClientCapabilities(roots=RootsCapability())
-
-        mock_ctx = Mock()
-        mock_ctx.session = Mock()
-        mock_ctx.session.client_params = Mock()
-        mock_ctx.session.client_params.capabilities = mock_caps
-
-        assert client_supports_roots(mock_ctx) is True
-
-        # Test with roots disabled
-        mock_caps = ClientCapabilities(roots=None)
-        mock_ctx.session.client_params.capabilities = mock_caps
-
-        assert client_supports_roots(mock_ctx) is False
-
-    def test_client_supports_experimental(self):
-        """Test client_supports_experimental."""
-        from mcp.types import ClientCapabilities
-
-        from rm_mcp.capabilities import client_supports_experimental
-
-        # Test with experimental feature present
-        mock_caps = ClientCapabilities(experimental={"my_feature": {}})
-
-        mock_ctx = Mock()
-        mock_ctx.session = Mock()
-        mock_ctx.session.client_params = Mock()
-        mock_ctx.session.client_params.capabilities = mock_caps
-
-        assert client_supports_experimental(mock_ctx, "my_feature") is True
-        assert client_supports_experimental(mock_ctx, "other_feature") is False
-
-        # Test with no experimental features
-        mock_caps = ClientCapabilities(experimental=None)
-        mock_ctx.session.client_params.capabilities = mock_caps
-
-        assert client_supports_experimental(mock_ctx, "my_feature") is False
+    @pytest.mark.parametrize(
+        "field,value,check,expected",
+        [
+            ("sampling", SamplingCapability(), client_supports_sampling, True),
+            ("sampling", None, client_supports_sampling, False),
+            ("elicitation", ElicitationCapability(), client_supports_elicitation, True),
+            ("elicitation", None, client_supports_elicitation, False),
+            ("roots", RootsCapability(), client_supports_roots, True),
+            ("roots", None, client_supports_roots, False),
+            ("experimental", {"my_feature": {}}, client_supports_experimental, True),
+            ("experimental", {"other_feature": {}}, client_supports_experimental, False),
+            ("experimental", None, client_supports_experimental, False),
+        ],
+    )
+    def test_client_supports_capability(self, field, value, check, expected):
+        """Test each client_supports_* helper with the capability present and absent."""
+        mock_caps = ClientCapabilities(**{field: value})
+
+        mock_ctx = make_ctx(capabilities=mock_caps)
+
+        args = (mock_ctx, "my_feature") if field == "experimental" else (mock_ctx,)
+        assert check(*args) is expected
 
     def test_get_client_info(self):
         """Test get_client_info."""
-        from rm_mcp.capabilities import get_client_info
-
-        mock_ctx = Mock()
-        mock_ctx.session = Mock()
-        mock_ctx.session.client_params = Mock()
-        mock_ctx.session.client_params.clientInfo = Mock()
-        mock_ctx.session.client_params.clientInfo.name = "Test Client"
-        mock_ctx.session.client_params.clientInfo.version = "1.0.0"
-        mock_ctx.session.client_params.protocolVersion = "2024-11-05"
+        mock_ctx = make_ctx(
+            client_info=SimpleNamespace(name="Test Client", version="1.0.0"),
+            protocol_version="2024-11-05",
+        )
 
         result = get_client_info(mock_ctx)
         assert result is not None
@@ -1003,13 +1032,7 @@ class TestCapabilityChecking:
 
     def test_get_client_info_without_client_info(self):
         """Test get_client_info when clientInfo is None."""
-        from rm_mcp.capabilities import get_client_info
-
-        mock_ctx = Mock()
-        mock_ctx.session = Mock()
-        mock_ctx.session.client_params = Mock()
-        mock_ctx.session.client_params.clientInfo = None
-        mock_ctx.session.client_params.protocolVersion = "2024-11-05"
+        mock_ctx = make_ctx(protocol_version="2024-11-05")
 
         result = get_client_info(mock_ctx)
         assert result is not None
@@ -1019,22 +1042,14 @@ class TestCapabilityChecking:
 
     def test_get_protocol_version(self):
         """Test get_protocol_version."""
-        from rm_mcp.capabilities import get_protocol_version
-
-        mock_ctx = Mock()
-        mock_ctx.session = Mock()
-        mock_ctx.session.client_params = Mock()
-        mock_ctx.session.client_params.protocolVersion = "2024-11-05"
+        mock_ctx = make_ctx(protocol_version="2024-11-05")
 
         result = get_protocol_version(mock_ctx)
         assert result == "2024-11-05"
 
     def test_get_protocol_version_without_context(self):
         """Test get_protocol_version returns None without valid context."""
-        from rm_mcp.capabilities import get_protocol_version
-
-        mock_ctx = Mock()
-        mock_ctx.session = None
+        mock_ctx = SimpleNamespace(session=None)
 
         result = get_protocol_version(mock_ctx)
         assert result is None
@@ -1069,122 +1084,58 @@ class TestCapabilityChecking:
 class TestSamplingOCR:
     """Test sampling-based OCR functionality."""
 
-    def test_get_ocr_backend_default(self):
+    def test_get_ocr_backend_default(self, monkeypatch):
         """Test default OCR backend is sampling."""
-        import os
-
         from rm_mcp.ocr.sampling import get_ocr_backend
 
-        # Clear any env var
-        env_backup = os.environ.get("REMARKABLE_OCR_BACKEND")
-        if "REMARKABLE_OCR_BACKEND" in os.environ:
-            del os.environ["REMARKABLE_OCR_BACKEND"]
+        monkeypatch.delenv("REMARKABLE_OCR_BACKEND", raising=False)
 
-        try:
-            result = get_ocr_backend()
-            assert result == "sampling"
-        finally:
-            if env_backup is not None:
-                os.environ["REMARKABLE_OCR_BACKEND"] = env_backup
+        assert get_ocr_backend() == "sampling"
 
-    def test_get_ocr_backend_sampling(self):
+    def test_get_ocr_backend_sampling(self, monkeypatch):
         """Test OCR backend can be set to sampling."""
-        import os
-
         from rm_mcp.ocr.sampling import get_ocr_backend
 
-        env_backup = os.environ.get("REMARKABLE_OCR_BACKEND")
-        os.environ["REMARKABLE_OCR_BACKEND"] = "sampling"
+        monkeypatch.setenv("REMARKABLE_OCR_BACKEND", "sampling")
 
-        try:
-            result = get_ocr_backend()
-            assert result == "sampling"
-        finally:
-            if env_backup is not None:
-                os.environ["REMARKABLE_OCR_BACKEND"] = env_backup
-            elif "REMARKABLE_OCR_BACKEND" in os.environ:
-                del os.environ["REMARKABLE_OCR_BACKEND"]
+        assert get_ocr_backend() == "sampling"
 
-    def test_should_use_sampling_ocr_true_when_default(self):
+    def test_should_use_sampling_ocr_true_when_default(self, monkeypatch):
         """Test should_use_sampling_ocr returns True with default config and capable client."""
-        import os
-
-        from mcp.types import ClientCapabilities, SamplingCapability
-
         from rm_mcp.ocr.sampling import should_use_sampling_ocr
 
-        env_backup = os.environ.get("REMARKABLE_OCR_BACKEND")
-        if "REMARKABLE_OCR_BACKEND" in os.environ:
-            del os.environ["REMARKABLE_OCR_BACKEND"]
-
-        try:
-            # Create mock context with sampling capability
-            mock_caps = ClientCapabilities(sampling=SamplingCapability())
-            mock_ctx = Mock()
-            mock_ctx.session = Mock()
-            mock_ctx.session.client_params = Mock()
-            mock_ctx.session.client_params.capabilities = mock_caps
-
-            # Should return True because default backend is "sampling"
-            result = should_use_sampling_ocr(mock_ctx)
-            assert result is True
-        finally:
-            if env_backup is not None:
-                os.environ["REMARKABLE_OCR_BACKEND"] = env_backup
+        monkeypatch.delenv("REMARKABLE_OCR_BACKEND", raising=False)
 
-    def test_should_use_sampling_ocr_true_when_configured(self):
-        """Test should_use_sampling_ocr returns True when configured and client supports it."""
-        import os
+        # Create mock context with sampling capability
+        mock_caps = ClientCapabilities(sampling=SamplingCapability())
+        mock_ctx = make_ctx(capabilities=mock_caps)
 
-        from mcp.types import ClientCapabilities, SamplingCapability
+        # Should return True because default backend is "sampling"
+        assert should_use_sampling_ocr(mock_ctx) is True
 
+    def test_should_use_sampling_ocr_true_when_configured(self, monkeypatch):
+        """Test should_use_sampling_ocr returns True when configured and client supports it."""
         from rm_mcp.ocr.sampling import should_use_sampling_ocr
 
-        env_backup = os.environ.get("REMARKABLE_OCR_BACKEND")
-        os.environ["REMARKABLE_OCR_BACKEND"] = "sampling"
+        monkeypatch.setenv("REMARKABLE_OCR_BACKEND", "sampling")
 
-        try:
-            # Create mock context with sampling capability
-            mock_caps = ClientCapabilities(sampling=SamplingCapability())
-            mock_ctx = Mock()
-            mock_ctx.session = Mock()
-            mock_ctx.session.client_params = Mock()
-            mock_ctx.session.client_params.capabilities = mock_caps
-
-            result = should_use_sampling_ocr(mock_ctx)
-            assert result is True
-        finally:
-            if env_backup is not None:
-                os.environ["REMARKABLE_OCR_BACKEND"] = env_backup
-            elif "REMARKABLE_OCR_BACKEND" in os.environ:
-                del os.environ["REMARKABLE_OCR_BACKEND"]
-
-    def test_should_use_sampling_ocr_false_when_client_doesnt_support(self):
-        """Test should_use_sampling_ocr returns False when client doesn't support sampling."""
-        import os
+        # Create mock context with sampling capability
+        mock_caps = ClientCapabilities(sampling=SamplingCapability())
+        mock_ctx = make_ctx(capabilities=mock_caps)
 
-        from mcp.types import ClientCapabilities
+        assert should_use_sampling_ocr(mock_ctx) is True
 
+    def test_should_use_sampling_ocr_false_when_client_doesnt_support(self, monkeypatch):
+        """Test should_use_sampling_ocr returns False when client doesn't support sampling."""
         from rm_mcp.ocr.sampling import should_use_sampling_ocr
 
-        env_backup = os.environ.get("REMARKABLE_OCR_BACKEND")
-        os.environ["REMARKABLE_OCR_BACKEND"] = "sampling"
+        monkeypatch.setenv("REMARKABLE_OCR_BACKEND", "sampling")
 
-        try:
-            # Create mock context WITHOUT sampling capability
-            mock_caps = ClientCapabilities(sampling=None)
-            mock_ctx = Mock()
-            mock_ctx.session = Mock()
-            mock_ctx.session.client_params = Mock()
-            mock_ctx.session.client_params.capabilities = mock_caps
-
-            result = should_use_sampling_ocr(mock_ctx)
-            assert result is False
-        finally:
-            if env_backup is not None:
-                os.environ["REMARKABLE_OCR_BACKEND"] = env_backup
-            elif "REMARKABLE_OCR_BACKEND" in os.environ:
-                del os.environ["REMARKABLE_OCR_BACKEND"]
+        # Create mock context WITHOUT sampling capability
+        mock_caps = ClientCapabilities(sampling=None)
+        mock_ctx = make_ctx(capabilities=mock_caps)
+
+        assert should_use_sampling_ocr(mock_ctx) is False
 
     def test_ocr_system_prompt_structure(self):
         """Test the OCR system prompt is properly structured."""
@@ -1200,17 +1151,39 @@ class TestSamplingOCR:
         assert "text" in OCR_USER_PROMPT.lower()
         assert len(OCR_USER_PROMPT) < 200  # Should be short and focused
 
-    @pytest.mark.asyncio
     async def test_ocr_via_sampling_returns_none_without_session(self):
         """Test ocr_via_sampling returns None when session is not available."""
         from rm_mcp.ocr.sampling import ocr_via_sampling
 
-        mock_ctx = Mock()
-        mock_ctx.session = None
+        mock_ctx = SimpleNamespace(session=None)
 
         result = await ocr_via_sampling(mock_ctx, b"fake_png_data")
         assert result is None
 
+    async def test_ocr_pages_via_sampling_runs_concurrently_in_order(self):
+        """Test multi-page OCR is concurrent, bounded, and keeps page order."""
+        import asyncio
+
+        from rm_mcp.ocr import sampling
+
+        in_flight = 0
+        peak = 0
+
+        async def fake_ocr(ctx, png_data, max_tokens=2000):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return png_data.decode()
+
+        pngs = [f"page {i}".encode() for i in range(6)] + [b""]
+        with patch.object(sampling, "ocr_via_sampling", side_effect=fake_ocr):
+            result = await sampling.ocr_pages_via_sampling(Mock(), pngs, max_concurrency=3)
+
+        assert result == [f"page {i}" for i in range(6)] + [""]
+        assert 1 < peak <= 3
+
     def test_sampling_imports_from_module(self):
         """Test that sampling utilities can be imported."""
         from rm_mcp.ocr.sampling import (
@@ -1274,62 +1247,75 @@ class TestRootPathFiltering:
 
         assert _get_root_path() == "/Work"
 
-    def test_is_within_root_full_access(self):
-        """Test _is_within_root always returns True when root is '/'."""
-        from rm_mcp.paths import _is_within_root
-
-        assert _is_within_root("/anything", "/") is True
-        assert _is_within_root("/Work/Deep/Path", "/") is True
-        assert _is_within_root("/", "/") is True
-
-    def test_is_within_root_inside(self):
-        """Test _is_within_root returns True for paths inside the root."""
-        from rm_mcp.paths import _is_within_root
-
-        assert _is_within_root("/Work/Project", "/Work") is True
-        assert _is_within_root("/Work", "/Work") is True
-        assert _is_within_root("/Work/Deep/Nested", "/Work") is True
-
-    def test_is_within_root_outside(self):
-        """Test _is_within_root returns False for paths outside the root."""
-        from rm_mcp.paths import _is_within_root
-
-        assert _is_within_root("/Personal/Notes", "/Work") is False
-        assert _is_within_root("/Workspace", "/Work") is False
-        assert _is_within_root("/", "/Work") is False
-
-    def test_is_within_root_case_insensitive(self):
-        """Test _is_within_root is case-insensitive."""
+    @pytest.mark.parametrize(
+        "path,root,expected",
+        [
+            ("/anything", "/", True),
+            ("/Work/Deep/Path", "/", True),
+            ("/", "/", True),
+            ("/Work/Project", "/Work", True),
+            ("/Work", "/Work", True),
+            ("/Work/Deep/Nested", "/Work", True),
+            ("/Personal/Notes", "/Work", False),
+            ("/Workspace", "/Work", False),
+            ("/", "/Work", False),
+            ("/work/Project", "/Work", True),
+            ("/WORK/Project", "/Work", True),
+        ],
+        ids=[
+            "full_access",
+            "full_access_deep",
+            "full_access_root",
+            "inside",
+            "inside_equal",
+            "inside_nested",
+            "outside",
+            "outside_shared_prefix",
+            "outside_root",
+            "case_insensitive_lower",
+            "case_insensitive_upper",
+        ],
+    )
+    def test_is_within_root(self, path, root, expected):
+        """Test _is_within_root for paths inside, outside and case-variant of the root."""
         from rm_mcp.paths import _is_within_root
 
-        assert _is_within_root("/work/Project", "/Work") is True
-        assert _is_within_root("/WORK/Project", "/Work") is True
-
-    def test_apply_root_filter_no_root(self):
-        """Test _apply_root_filter is a no-op when root is '/'."""
-        from rm_mcp.paths import _apply_root_filter
-
-        assert _apply_root_filter("/Work/Project", "/") == "/Work/Project"
-        assert _apply_root_filter("/Notes", "/") == "/Notes"
-
-    def test_apply_root_filter_strips_prefix(self):
-        """Test _apply_root_filter strips the root prefix from paths."""
-        from rm_mcp.paths import _apply_root_filter
-
-        assert _apply_root_filter("/Work/Project", "/Work") == "/Project"
-        assert _apply_root_filter("/Work/Deep/Path", "/Work") == "/Deep/Path"
-
-    def test_apply_root_filter_root_equals_path(self):
-        """Test _apply_root_filter returns '/' when path equals root."""
-        from rm_mcp.paths import _apply_root_filter
-
-        assert _apply_root_filter("/Work", "/Work") == "/"
-
-    def test_apply_root_filter_outside_root(self):
-        """Test _apply_root_filter returns path unchanged when outside root."""
+        assert _is_within_root(path, root) is expected
+
+    def test_within_root_predicate_matches_is_within_root(self):
+        """Test make_within_root_predicate agrees with _is_within_root."""
+        from rm_mcp.paths import _is_within_root, make_within_root_predicate
+
+        paths = ["/Work", "/work/Project", "/Workspace", "/Personal/Notes", "/"]
+        for root in ["/", "/Work"]:
+            within = make_within_root_predicate(root)
+            for path in paths:
+                assert within(path) is _is_within_root(path, root)
+
+    @pytest.mark.parametrize(
+        "path,root,expected",
+        [
+            ("/Work/Project", "/", "/Work/Project"),
+            ("/Notes", "/", "/Notes"),
+            ("/Work/Project", "/Work", "/Project"),
+            ("/Work/Deep/Path", "/Work", "/Deep/Path"),
+            ("/Work", "/Work", "/"),
+            ("/Personal/Notes", "/Work", "/Personal/Notes"),
+        ],
+        ids=[
+            "no_root",
+            "no_root_top_level",
+            "strips_prefix",
+            "strips_prefix_nested",
+            "root_equals_path",
+            "outside_root",
+        ],
+    )
+    def test_apply_root_filter(self, path, root, expected):
+        """Test _apply_root_filter strips the root prefix only from paths inside it."""
         from rm_mcp.paths import _apply_root_filter
 
-        assert _apply_root_filter("/Personal/Notes", "/Work") == "/Personal/Notes"
+        assert _apply_root_filter(path, root) == expected
 
     @patch.dict(os.environ, {"REMARKABLE_ROOT_PATH": "/Work"})
     def test_apply_root_filter_uses_env_when_root_none(self):
@@ -1347,120 +1333,98 @@ class TestRootPathFiltering:
 class TestRemarkableRecentExtended:
     """Test remarkable_recent tool with document sorting and preview support."""
 
-    @pytest.mark.asyncio
     @patch(_PATCH_CACHED)
     async def test_recent_sorted_by_modification_date(self, mock_get_cached):
         """Test that recent documents are returned sorted by modification date (newest first)."""
         mock_client = Mock()
 
-        doc_old = Mock()
-        doc_old.VissibleName = "Old Document"
-        doc_old.ID = "doc-old"
-        doc_old.Parent = ""
-        doc_old.is_folder = False
-        doc_old.is_cloud_archived = False
-        doc_old.ModifiedClient = "2024-01-01T00:00:00Z"
-
-        doc_new = Mock()
-        doc_new.VissibleName = "New Document"
-        doc_new.ID = "doc-new"
-        doc_new.Parent = ""
-        doc_new.is_folder = False
-        doc_new.is_cloud_archived = False
-        doc_new.ModifiedClient = "2024-06-15T12:00:00Z"
-
-        doc_mid = Mock()
-        doc_mid.VissibleName = "Mid Document"
-        doc_mid.ID = "doc-mid"
-        doc_mid.Parent = ""
-        doc_mid.is_folder = False
-        doc_mid.is_cloud_archived = False
-        doc_mid.ModifiedClient = "2024-03-10T08:00:00Z"
+        doc_old = FakeItem("Old Document", "doc-old", ModifiedClient="2024-01-01T00:00:00Z")
+
+        doc_new = FakeItem("New Document", "doc-new", ModifiedClient="2024-06-15T12:00:00Z")
+
+        doc_mid = FakeItem("Mid Document", "doc-mid", ModifiedClient="2024-03-10T08:00:00Z")
 
         mock_get_cached.return_value = (mock_client, [doc_old, doc_new, doc_mid])
 
         result = await mcp.call_tool("remarkable_recent", {"limit": 10})
-        data = json.loads(result[0][0].text)
+        data = _loads(result[0][0].text)
 
         assert data["count"] == 3
         names = [d["name"] for d in data["documents"]]
         assert names == ["New Document", "Mid Document", "Old Document"]
 
-    @pytest.mark.asyncio
     @patch(_PATCH_CACHED)
-    async def test_recent_with_include_preview(self, mock_get_cached):
+    async def test_recent_with_include_preview(self, mock_get_cached, preview_zip_bytes):
         """Test remarkable_recent with include_preview=True for a non-notebook document."""
         mock_client = Mock()
 
-        doc = Mock()
-        doc.VissibleName = "Report.pdf"
-        doc.ID = "doc-pdf"
-        doc.Parent = ""
-        doc.is_folder = False
-        doc.is_cloud_archived = False
-        doc.ModifiedClient = "2024-06-01T00:00:00Z"
+        doc = FakeItem("Report.pdf", "doc-pdf", ModifiedClient="2024-06-01T00:00:00Z")
 
         mock_get_cached.return_value = (mock_client, [doc])
 
-        # Create a minimal zip with a text file for extraction
-        import io
-
-        zip_buffer = io.BytesIO()
-        with zipfile.ZipFile(zip_buffer, "w") as zf:
-            zf.writestr("sample.txt", "Preview text content here")
-        zip_bytes = zip_buffer.getvalue()
-
-        mock_client.download.return_value = zip_bytes
+        mock_client.download.return_value = preview_zip_bytes
 
         # Also need to mock _get_file_type_cached to return "pdf" so preview is attempted
         with patch("rm_mcp.tools._helpers._get_file_type_cached", return_value="pdf"):
             result = await mcp.call_tool("remarkable_recent", {"limit": 5, "include_preview": True})
-            data = json.loads(result[0][0].text)
+            data = _loads(result[0][0].text)
 
         assert data["count"] == 1
         # The preview might or might not have content depending on extraction
         assert "documents" in data
 
-    @pytest.mark.asyncio
+    @patch("rm_mcp.tools._helpers.extract_text_from_document_zip")
     @patch(_PATCH_CACHED)
-    async def test_recent_empty_library(self, mock_get_cached):
-        """Test remarkable_recent with no documents in the library."""
+    async def test_recent_cloud_previews_for_each_document(self, mock_get_cached, mock_extract):
+        """Test cloud preview downloads are fetched and matched to their documents."""
         mock_client = Mock()
-        mock_get_cached.return_value = (mock_client, [])
+        docs = []
+        for i in range(3):
+            doc = FakeItem(
+                f"Paper {i}.pdf", f"doc-paper-{i}", ModifiedClient=f"2024-06-0{i + 1}T00:00:00Z"
+            )
+            docs.append(doc)
+        mock_get_cached.return_value = (mock_client, docs)
+        mock_client.download.side_effect = lambda doc: doc.ID.encode()
 
+        def fake_extract(tmp_path, include_ocr):
+            # Each download is the doc ID, so the preview names its document
+            return {"typed_text": [f"Text of {Path(tmp_path).read_bytes().decode()}"]}
+
+        mock_extract.side_effect = fake_extract
+
+        with patch("rm_mcp.tools._helpers._get_file_type_cached", return_value="pdf"):
+            result = await mcp.call_tool("remarkable_recent", {"limit": 5, "include_preview": True})
+            data = _loads(result[0][0].text)
+
+        previews = {d["name"]: d["preview"] for d in data["documents"]}
+        assert previews == {f"Paper {i}.pdf": f"Text of doc-paper-{i}" for i in range(3)}
+        assert mock_client.download.call_count == 3
+
+    async def test_recent_empty_library(self, mock_cached_empty):
+        """Test remarkable_recent with no documents in the library."""
         result = await mcp.call_tool("remarkable_recent", {})
-        data = json.loads(result[0][0].text)
+        data = _loads(result[0][0].text)
 
         assert data["count"] == 0
         assert data["documents"] == []
         assert "_hint" in data
 
-    @pytest.mark.asyncio
     @patch(_PATCH_CACHED)
     async def test_recent_excludes_folders(self, mock_get_cached):
         """Test that remarkable_recent excludes folder items."""
         mock_client = Mock()
 
-        folder = Mock()
-        folder.VissibleName = "My Folder"
-        folder.ID = "folder-1"
-        folder.Parent = ""
-        folder.is_folder = True
-        folder.is_cloud_archived = False
-        folder.ModifiedClient = "2024-12-01T00:00:00Z"
+        folder = FakeItem(
+            "My Folder", "folder-1", ModifiedClient="2024-12-01T00:00:00Z", is_folder=True
+        )
 
-        doc = Mock()
-        doc.VissibleName = "My Document"
-        doc.ID = "doc-1"
-        doc.Parent = ""
-        doc.is_folder = False
-        doc.is_cloud_archived = False
-        doc.ModifiedClient = "2024-06-01T00:00:00Z"
+        doc = FakeItem("My Document", "doc-1", ModifiedClient="2024-06-01T00:00:00Z")
 
         mock_get_cached.return_value = (mock_client, [folder, doc])
 
         result = await mcp.call_tool("remarkable_recent", {})
-        data = json.loads(result[0][0].text)
+        data = _loads(result[0][0].text)
 
         assert data["count"] == 1
         assert data["documents"][0]["name"] == "My Document"
@@ -1474,7 +1438,6 @@ class TestRemarkableRecentExtended:
 class TestRemarkableImageExtended:
     """Test remarkable_image tool cache hits and edge cases."""
 
-    @pytest.mark.asyncio
     @patch(_PATCH_CACHED)
     async def test_image_cache_hit(self, mock_get_cached):
         """Test that remarkable_image returns cached image when available."""
@@ -1492,19 +1455,13 @@ class TestRemarkableImageExtended:
 
         mock_get_cached.return_value = (mock_client, [doc])
 
-        # Create a minimal valid zip for the download mock (needs .rm file for page count)
-        import io
-
-        zip_buffer = io.BytesIO()
-        with zipfile.ZipFile(zip_buffer, "w") as zf:
-            zf.writestr("doc-cached.content", '{"pages": ["page-id-1"]}')
-            zf.writestr("doc-cached/page-id-1.rm", b"dummy rm data")
-        mock_client.download.return_value = zip_buffer.getvalue()
+        # A minimal valid zip for the download mock (needs .rm file for page count)
+        mock_client.download.return_value = _CACHED_DOC_ZIP
 
         # Pre-populate the image cache
         cache_key = f"{doc.ID}:1"
         fake_base64 = "aVZCT1J3MEtHZ29BQQ=="  # fake base64 PNG data
-        _rendered_image_cache[cache_key] = fake_base64
+        _rendered_image_cache.put(cache_key, f"data:image/png;base64,{fake_base64}")
 
         try:
             result = await mcp.call_tool(
@@ -1517,11 +1474,15 @@ class TestRemarkableImageExtended:
             assert fake_base64 in data["data_uri"]
             assert data["mime_type"] == "image/png"
             assert data["page"] == 1
+
+            # The embedded image carries just the base64 payload
+            result = await mcp.call_tool("remarkable_image", {"document": "Cached Doc", "page": 1})
+            images = [c for c in result if getattr(c, "type", None) == "image"]
+            assert images[0].data == fake_base64
         finally:
             # Clean up cache
             _rendered_image_cache.pop(cache_key, None)
 
-    @pytest.mark.asyncio
     @patch(_PATCH_CACHED)
     async def test_image_document_not_found_with_suggestions(self, mock_get_cached):
         """Test that image tool returns not_found error with suggestions for similar names."""
@@ -1692,7 +1653,6 @@ class TestOCRAutoRetry:
     not PDF/EPUB), it should auto-retry with include_ocr=True.
     """
 
-    @pytest.mark.asyncio
     @patch(_PATCH_CACHED)
     async def test_auto_retry_with_ocr_on_empty_notebook(self, mock_get_cached):
         """Test that empty notebook content triggers OCR auto-retry."""
@@ -1708,16 +1668,8 @@ class TestOCRAutoRetry:
 
         mock_get_cached.return_value = (mock_client, [doc])
 
-        # Create a zip that produces no typed text but has OCR content
-        import io
-
-        zip_buffer = io.BytesIO()
-        with zipfile.ZipFile(zip_buffer, "w") as zf:
-            # Add a minimal content file
-            zf.writestr("doc-hw.content", '{"pages": ["page1"]}')
-        zip_bytes = zip_buffer.getvalue()
-
-        mock_client.download.return_value = zip_bytes
+        # A zip that produces no typed text but has OCR content
+        mock_client.download.return_value = _HANDWRITTEN_DOC_ZIP
 
         # First call: extract returns empty content (no typed text)
         # Second call (with include_ocr=True): returns OCR content
@@ -1743,11 +1695,13 @@ class TestOCRAutoRetry:
             ),
         ):
             result = await mcp.call_tool("remarkable_read", {"document": "Handwritten Notes"})
-            data = json.loads(result[0][0].text)
+            data = _loads(result[0][0].text)
 
         # Should have auto-enabled OCR
         assert data.get("_ocr_auto_enabled") is True
         assert "OCR auto-enabled" in data.get("_hint", "")
+        # The retry reuses the first download instead of fetching again
+        mock_client.download.assert_called_once()
 
 
 # =============================================================================
@@ -1794,6 +1748,16 @@ class TestTempDocumentContextManager:
         with _temp_document(b"data") as path:
             assert isinstance(path, Path)
 
+    def test_falls_back_when_shm_unusable(self, tmp_path):
+        """Test that _temp_document uses the regular temp dir if tmpfs can't be written."""
+        from rm_mcp.tools._helpers import _temp_document
+
+        with patch("rm_mcp.tools._helpers._SHM_DIR", str(tmp_path / "missing")):
+            with _temp_document(b"fallback data") as path:
+                assert path.read_bytes() == b"fallback data"
+                assert path.parent == Path(tempfile.gettempdir())
+        assert not path.exists()
+
 
 # =============================================================================
 # Test File Type Caching
@@ -1878,6 +1842,233 @@ class TestFileTypeCaching:
         assert _file_type_cache["doc-1"] == "pdf"
         assert _file_type_cache["doc-2"] == "notebook"
 
+    def test_full_cache_evicts_least_recently_used(self):
+        """Test that a full cache evicts its least recently used entry only."""
+        from rm_mcp.tools._helpers import _file_type_cache, _get_file_type_cached
+
+        docs = []
+        for i in range(3):
+            doc = Mock()
+            doc.ID = f"doc-{i}"
+            doc.VissibleName = f"file{i}.pdf"
+            docs.append(doc)
+
+        with patch("rm_mcp.tools._helpers._MAX_FILE_TYPE_CACHE", 2):
+            _get_file_type_cached(Mock(), docs[0])
+            _get_file_type_cached(Mock(), docs[1])
+            _get_file_type_cached(Mock(), docs[0])  # refresh doc-0
+            _get_file_type_cached(Mock(), docs[2])
+
+        assert list(_file_type_cache) == ["doc-0", "doc-2"]
+
+
+# =============================================================================
+# Test Render Cache
+# =============================================================================
+
+
+class TestRenderCache:
+    """Test the byte-capped page render cache used by sampling OCR."""
+
+    def setup_method(self):
+        import rm_mcp.tools._helpers as helpers_mod
+
+        self._saved = helpers_mod._render_cache
+        helpers_mod._render_cache = helpers_mod._SizedLRU(helpers_mod._MAX_RENDER_CACHE_BYTES)
+
+    def teardown_method(self):
+        import rm_mcp.tools._helpers as helpers_mod
+
+        helpers_mod._render_cache = self._saved
+
+    def test_keyed_by_modified(self):
+        from rm_mcp.tools._helpers import cache_render, get_cached_render
+
+        cache_render("doc-1", "v1", 1, b"png-v1")
+        assert get_cached_render("doc-1", "v1", 1) == b"png-v1"
+        assert get_cached_render("doc-1", "v2", 1) is None
+        assert get_cached_render("doc-1", "v1", 2) is None
+
+    def test_evicts_least_recently_used_over_byte_cap(self):
+        import rm_mcp.tools._helpers as helpers_mod
+
+        with patch.object(helpers_mod._render_cache, "max_bytes", 10):
+            helpers_mod.cache_render("doc", "v", 1, b"aaaa")
+            helpers_mod.cache_render("doc", "v", 2, b"bbbb")
+            # Touch page 1 so page 2 is the eviction candidate
+            assert helpers_mod.get_cached_render("doc", "v", 1) == b"aaaa"
+            helpers_mod.cache_render("doc", "v", 3, b"cccc")
+
+            assert helpers_mod.get_cached_render("doc", "v", 2) is None
+            assert helpers_mod.get_cached_render("doc", "v", 1) == b"aaaa"
+            assert helpers_mod.get_cached_render("doc", "v", 3) == b"cccc"
+            assert helpers_mod._render_cache.size == 8
+
+
+class TestRenderedImageCache:
+    """Test the size-capped PNG data URI cache used by remarkable_image."""
+
+    def setup_method(self):
+        import rm_mcp.tools._helpers as helpers_mod
+
+        self._saved = helpers_mod._rendered_image_cache
+        helpers_mod._rendered_image_cache = helpers_mod._SizedLRU(
+            helpers_mod._MAX_RENDERED_IMAGE_CACHE_BYTES
+        )
+
+    def teardown_method(self):
+        import rm_mcp.tools._helpers as helpers_mod
+
+        helpers_mod._rendered_image_cache = self._saved
+
+    def test_evicts_least_recently_used_over_size_cap(self):
+        import rm_mcp.tools._helpers as helpers_mod
+
+        with patch.object(helpers_mod._rendered_image_cache, "max_bytes", 10):
+            helpers_mod.cache_image("doc:1", "aaaa")
+            helpers_mod.cache_image("doc:2", "bbbb")
+            # Touch page 1 so page 2 is the eviction candidate
+            assert helpers_mod.get_cached_image("doc:1") == "aaaa"
+            helpers_mod.cache_image("doc:3", "cccc")
+            # Too large to cache at all
+            helpers_mod.cache_image("doc:4", "x" * 11)
+
+            assert helpers_mod.get_cached_image("doc:2") is None
+            assert helpers_mod.get_cached_image("doc:4") is None
+            assert helpers_mod.get_cached_image("doc:1") == "aaaa"
+            assert helpers_mod.get_cached_image("doc:3") == "cccc"
+            assert helpers_mod._rendered_image_cache.size == 8
+
+    def test_size_tracks_pops_and_clear(self):
+        import rm_mcp.tools._helpers as helpers_mod
+
+        cache = helpers_mod._SizedLRU(10)
+        cache.put("a", "aaaa")
+        cache.put("a", "aa")  # replacing an entry swaps its size
+        cache.put("b", "bbbb")
+        assert cache.size == 6
+        assert cache.pop("a") == "aa"
+        assert cache.pop("a") is None
+        assert cache.size == 4
+        cache.clear()
+        assert cache.size == 0 and len(cache) == 0
+        # Shrinking the cap evicts until it fits, and stops once empty
+        cache.put("c", "cccc")
+        cache.max_bytes = 2
+        cache.put("d", "dd")
+        assert "c" not in cache and cache.get("d") == "dd"
+        assert cache.size == 2
+
+
+# =============================================================================
+# Test Filtered Document Entries
+# =============================================================================
+
+
+class TestFilteredDocs:
+    """Test get_filtered_docs precomputation and reuse."""
+
+    def _make_items(self):
+        folder = FakeItem(VissibleName="Work", ID="f1", Parent="", is_folder=True)
+        doc = FakeItem(VissibleName="Plan", ID="d1", Parent="f1", is_folder=False)
+        doc.is_cloud_archived = False
+        doc.ModifiedClient = "2024-01-01"
+        trashed = FakeItem(VissibleName="Old", ID="d2", Parent="f1", is_folder=False)
+        trashed.is_cloud_archived = True
+        other = FakeItem(VissibleName="Elsewhere", ID="d3", Parent="", is_folder=False)
+        other.is_cloud_archived = False
+        return [folder, doc, trashed, other]
+
+    def test_entries_filtered_by_root(self):
+        from rm_mcp.tools._helpers import get_filtered_docs
+
+        entries = get_filtered_docs(self._make_items(), "/Work")
+        assert [(e.path, e.name_lower, e.archived) for e in entries] == [
+            ("/Work/Plan", "plan", False),
+            ("/Work/Old", "old", True),
+        ]
+        assert entries[0].modified == "2024-01-01"
+
+    def test_doc_counts(self):
+        from rm_mcp.tools._helpers import get_filtered_doc_count
+
+        collection = self._make_items()
+        assert get_filtered_doc_count(collection, "/Work") == 2
+        assert get_filtered_doc_count(collection, "/Work", include_archived=False) == 1
+        assert get_filtered_doc_count(collection, "/", include_archived=False) == 2
+
+    def test_doc_counts_without_entries_match_entries(self):
+        from rm_mcp.tools import _helpers
+
+        collection = self._make_items()
+        nested = FakeItem(VissibleName="Sub", ID="f2", Parent="f1", is_folder=True)
+        deep = FakeItem(VissibleName="Deep", ID="d4", Parent="f2", is_folder=False)
+        deep.is_cloud_archived = False
+        # A top-level document whose own path is the root
+        same_as_root = FakeItem(VissibleName="work", ID="d5", Parent="", is_folder=False)
+        same_as_root.is_cloud_archived = False
+        collection += [nested, deep, same_as_root]
+
+        for root in ["/", "/Work", "/Work/Sub", "/Missing"]:
+            _helpers._filtered_docs_cache.clear()
+            counts = (
+                _helpers.get_filtered_doc_count(collection, root),
+                _helpers.get_filtered_doc_count(collection, root, include_archived=False),
+            )
+            assert root not in _helpers._filtered_docs_cache
+            entries = _helpers.get_filtered_docs(collection, root)
+            assert counts == (len(entries), sum(1 for e in entries if not e.archived))
+
+    def test_reused_for_same_collection(self):
+        from rm_mcp.tools._helpers import get_filtered_docs
+
+        collection = self._make_items()
+        first = get_filtered_docs(collection, "/")
+        assert get_filtered_docs(collection, "/") is first
+        # A re-fetched collection is a new object and gets fresh entries
+        assert get_filtered_docs(list(collection), "/") is not first
+
+    def test_rebuilt_after_in_place_change_or_refresh(self):
+        from rm_mcp.cache import invalidate_collection_cache
+        from rm_mcp.tools._helpers import get_filtered_docs, get_items_by_id
+
+        collection = self._make_items()
+        first = get_filtered_docs(collection, "/")
+        items_by_id = get_items_by_id(collection)
+
+        # Items appended to the same list object are picked up
+        late = FakeItem(VissibleName="Late", ID="d9", Parent="", is_folder=False)
+        late.is_cloud_archived = False
+        collection.append(late)
+        second = get_filtered_docs(collection, "/")
+        assert second is not first
+        assert "d9" in get_items_by_id(collection)
+
+        # A refresh that hands back the same object invalidates too
+        invalidate_collection_cache()
+        assert get_filtered_docs(collection, "/") is not second
+        assert get_items_by_id(collection) is not items_by_id
+
+    def test_name_lower_by_id_reused_for_same_collection(self):
+        from rm_mcp.tools._helpers import get_name_lower_by_id
+
+        collection = self._make_items()
+        names = get_name_lower_by_id(collection)
+        assert names == {"f1": "work", "d1": "plan", "d2": "old", "d3": "elsewhere"}
+        assert get_name_lower_by_id(collection) is names
+
+    def test_name_matching_agrees_with_substring_scan(self):
+        from rm_mcp.tools._helpers import DocEntry, match_doc_names
+
+        names = ["Meeting Notes", "notes daily", "Project Plan", "Notebook", "No", "Plannotes"]
+        entries = [
+            DocEntry(item=None, path="/" + n, name_lower=n.lower(), modified=None, archived=False)
+            for n in names
+        ]
+        for query in ["notes", "no", "plan", "ote", "xyz", "", "meeting notes", "n", "s", "o n"]:
+            expected = [e for e in entries if query in e.name_lower]
+            assert match_doc_names(entries, query) == expected
+
 
 # =============================================================================
 # Test remarkable_search Tool
@@ -1887,7 +2078,6 @@ class TestFileTypeCaching:
 class TestRemarkableSearch:
     """Test remarkable_search tool."""
 
-    @pytest.mark.asyncio
     @patch(_PATCH_CACHED)
     async def test_search_finds_matching_documents(self, mock_get_cached):
         """Test that search finds documents matching the query (no download without grep)."""
@@ -1920,7 +2110,7 @@ class TestRemarkableSearch:
         mock_get_cached.return_value = (mock_client, [doc1, doc2, doc3])
 
         result = await mcp.call_tool("remarkable_search", {"query": "Meeting"})
-        data = json.loads(result[0][0].text)
+        data = _loads(result[0][0].text)
 
         assert data["count"] == 2
         names = [d["name"] for d in data["documents"]]
@@ -1931,7 +2121,6 @@ class TestRemarkableSearch:
         assert "content" not in data["documents"][0]
         mock_client.download.assert_not_called()
 
-    @pytest.mark.asyncio
     @patch(_PATCH_CACHED)
     async def test_search_no_results(self, mock_get_cached):
         """Test search returns error when no documents match."""
@@ -1948,13 +2137,12 @@ class TestRemarkableSearch:
         mock_get_cached.return_value = (mock_client, [doc])
 
         result = await mcp.call_tool("remarkable_search", {"query": "NonExistentDocument"})
-        data = json.loads(result[0][0].text)
+        data = _loads(result[0][0].text)
 
         assert "_error" in data
         assert data["_error"]["type"] == "no_documents_found"
 
-    @pytest.mark.asyncio
-    @patch("rm_mcp.tools.read.remarkable_read")
+    @patch("rm_mcp.tools.read._read_document")
     @patch(_PATCH_CACHED)
     async def test_search_with_grep(self, mock_get_cached, mock_read):
         """Test search with grep parameter returns grep_matches."""
@@ -1970,49 +2158,143 @@ class TestRemarkableSearch:
 
         mock_get_cached.return_value = (mock_client, [doc])
 
-        # Mock remarkable_read to return content with grep matches
-        mock_read.return_value = json.dumps(
-            {
-                "content": "The hypothesis was confirmed by the experiment.",
-                "total_pages": 1,
-                "document": "Research Paper",
-                "path": "/Research Paper",
-                "grep": "hypothesis",
-                "grep_matches": 1,
-            }
+        # Mock the read payload to return content with grep matches
+        mock_read.return_value = {
+            "content": "The hypothesis was confirmed by the experiment.",
+            "total_pages": 1,
+            "document": "Research Paper",
+            "path": "/Research Paper",
+            "grep": "hypothesis",
+            "grep_matches": 1,
+        }
+
+        result = await mcp.call_tool(
+            "remarkable_search", {"query": "Research", "grep": "hypothesis"}
         )
+        data = _loads(result[0][0].text)
+
+        assert data["count"] == 1
+        assert data["grep"] == "hypothesis"
+        assert data["documents"][0]["grep_matches"] == 1
+        # The already-resolved document is read directly
+        assert mock_read.call_args.args[1] is doc
+        assert mock_read.call_args.kwargs["grep"] == "hypothesis"
+
+    @patch("rm_mcp.tools._helpers.cache_extraction_result")
+    @patch("rm_mcp.tools._helpers.extract_text_from_document_zip")
+    @patch(_PATCH_CACHED)
+    async def test_search_fallback_caches_on_loop_thread(
+        self, mock_get_cached, mock_extract, mock_cache
+    ):
+        """Test fallback reads extract on a worker but write caches on the loop thread."""
+        import threading
+
+        mock_client = Mock()
+        mock_client.download.return_value = b"fake-zip"
+        doc = FakeItem("Lab Notes.pdf", "doc-lab", ModifiedClient="2024-06-01T00:00:00Z")
+        mock_get_cached.return_value = (mock_client, [doc])
+
+        threads = {}
+
+        def fake_extract(tmp_path, include_ocr):
+            threads["extract"] = threading.current_thread()
+            return {"typed_text": ["The hypothesis held."], "highlights": [], "pages": 1}
+
+        mock_extract.side_effect = fake_extract
+        mock_cache.side_effect = lambda *args: threads.setdefault(
+            "cache", threading.current_thread()
+        )
+
+        with patch("rm_mcp.tools._helpers._get_file_type_cached", return_value="pdf"):
+            result = await mcp.call_tool(
+                "remarkable_search", {"query": "Lab", "grep": "hypothesis"}
+            )
+            data = _loads(result[0][0].text)
+
+        assert data["documents"][0]["grep_matches"] == 1
+        assert threads["extract"] is not threading.current_thread()
+        assert threads["cache"] is threading.current_thread()
+
+    @patch("rm_mcp.tools._helpers.match_doc_names")
+    @patch(_PATCH_CACHED)
+    async def test_search_skips_name_phase_when_fts_fills_limit(
+        self, mock_get_cached, mock_match_names
+    ):
+        """Test that name matching is skipped once FTS hits fill the limit."""
+        doc = Mock()
+        doc.VissibleName = "Budget"
+        doc.ID = "doc-budget"
+        doc.Parent = ""
+        doc.is_folder = False
+        doc.is_cloud_archived = False
+        mock_get_cached.return_value = (Mock(), [doc])
+
+        mock_index = Mock()
+        mock_index.search.return_value = [
+            {"doc_id": "doc-fts", "name": "Ledger", "path": "/Ledger", "snippet": "budget"}
+        ]
+        mock_index.get_indexed_document_count.return_value = 1
 
-        result = await mcp.call_tool(
-            "remarkable_search", {"query": "Research", "grep": "hypothesis"}
-        )
-        data = json.loads(result[0][0].text)
+        with patch("rm_mcp.tools._helpers.get_instance", return_value=mock_index):
+            result = await mcp.call_tool("remarkable_search", {"query": "budget", "limit": 1})
+        data = _loads(result[0][0].text)
 
-        assert data["count"] == 1
-        assert data["grep"] == "hypothesis"
-        assert data["documents"][0]["grep_matches"] == 1
+        assert [d["name"] for d in data["documents"]] == ["Ledger"]
+        mock_match_names.assert_not_called()
 
-    @pytest.mark.asyncio
+    @patch("rm_mcp.tools.read._read_document", new_callable=AsyncMock)
     @patch(_PATCH_CACHED)
-    async def test_search_limit_clamped(self, mock_get_cached):
-        """Test that search limit is clamped to max of 5."""
+    async def test_search_grep_fallback_reads_merge_in_order(self, mock_get_cached, mock_read):
+        """Test concurrent L2-miss reads are merged back in result order."""
         mock_client = Mock()
-
-        # Create 7 documents matching the query
         docs = []
-        for i in range(7):
+        for i in range(3):
             doc = Mock()
-            doc.VissibleName = f"Note {i}"
-            doc.ID = f"doc-{i}"
+            doc.VissibleName = f"Lab Notes {i}"
+            doc.ID = f"doc-lab-{i}"
             doc.Parent = ""
             doc.is_folder = False
             doc.is_cloud_archived = False
-            doc.ModifiedClient = f"2024-01-{10 + i:02d}T00:00:00Z"
+            doc.ModifiedClient = "2024-06-01T00:00:00Z"
             docs.append(doc)
+        mock_get_cached.return_value = (mock_client, docs)
+
+        async def fake_read(client, doc, doc_path, file_type, document, **kwargs):
+            if document.endswith("1"):
+                return {"_error": {"type": "read_failed", "message": "boom"}}
+            return {"content": f"{document} result", "grep_matches": 2}
+
+        mock_read.side_effect = fake_read
+
+        result = await mcp.call_tool("remarkable_search", {"query": "Lab Notes", "grep": "x"})
+        data = _loads(result[0][0].text)
+
+        assert [d["name"] for d in data["documents"]] == [
+            "Lab Notes 0",
+            "Lab Notes 1",
+            "Lab Notes 2",
+        ]
+        assert data["documents"][0]["content"] == "/Lab Notes 0 result"
+        assert data["documents"][1]["error"] == "boom"
+        assert data["documents"][2]["grep_matches"] == 2
+        assert data["_hint"].startswith("Found 2 document(s) with 4 grep match(es).")
+        assert mock_read.await_count == 3
+
+    @patch(_PATCH_CACHED)
+    async def test_search_limit_clamped(self, mock_get_cached):
+        """Test that search limit is clamped to max of 5."""
+        mock_client = Mock()
+
+        # Create 7 documents matching the query
+        docs = [
+            FakeItem(f"Note {i}", f"doc-{i}", ModifiedClient=f"2024-01-{10 + i:02d}T00:00:00Z")
+            for i in range(7)
+        ]
 
         mock_get_cached.return_value = (mock_client, docs)
 
         result = await mcp.call_tool("remarkable_search", {"query": "Note", "limit": 10})
-        data = json.loads(result[0][0].text)
+        data = _loads(result[0][0].text)
 
         # Even though limit=10 was passed, max is 5
         assert data["count"] <= 5
@@ -2026,7 +2308,6 @@ class TestRemarkableSearch:
 class TestRemarkableReadHappyPath:
     """Test remarkable_read tool with actual content extraction."""
 
-    @pytest.mark.asyncio
     @patch("rm_mcp.tools._helpers._get_file_type_cached")
     @patch("rm_mcp.tools._helpers.extract_text_from_document_zip")
     @patch(_PATCH_CACHED)
@@ -2036,14 +2317,7 @@ class TestRemarkableReadHappyPath:
         """Test reading a notebook with typed text content."""
         mock_client = Mock()
 
-        doc = Mock()
-        doc.VissibleName = "Typed Notes"
-        doc.ID = "doc-typed"
-        doc.Parent = ""
-        doc.is_folder = False
-        doc.is_cloud_archived = False
-        doc.ModifiedClient = "2024-05-01T12:00:00Z"
-        doc.Type = "DocumentType"
+        doc = FakeItem("Typed Notes", "doc-typed", ModifiedClient="2024-05-01T12:00:00Z")
 
         mock_get_cached.return_value = (mock_client, [doc])
         mock_file_type.return_value = "notebook"
@@ -2061,7 +2335,7 @@ class TestRemarkableReadHappyPath:
         }
 
         result = await mcp.call_tool("remarkable_read", {"document": "Typed Notes"})
-        data = json.loads(result[0][0].text)
+        data = _loads(result[0][0].text)
 
         assert "content" in data
         assert "Hello world" in data["content"]
@@ -2071,7 +2345,6 @@ class TestRemarkableReadHappyPath:
         assert "total_pages" in data
         assert "_hint" in data
 
-    @pytest.mark.asyncio
     @patch("rm_mcp.tools._helpers._get_file_type_cached")
     @patch("rm_mcp.tools._helpers.extract_text_from_document_zip")
     @patch(_PATCH_CACHED)
@@ -2079,14 +2352,7 @@ class TestRemarkableReadHappyPath:
         """Test reading a PDF document with annotation content."""
         mock_client = Mock()
 
-        doc = Mock()
-        doc.VissibleName = "Report.pdf"
-        doc.ID = "doc-pdf"
-        doc.Parent = ""
-        doc.is_folder = False
-        doc.is_cloud_archived = False
-        doc.ModifiedClient = "2024-04-01T09:00:00Z"
-        doc.Type = "DocumentType"
+        doc = FakeItem("Report.pdf", "doc-pdf", ModifiedClient="2024-04-01T09:00:00Z")
 
         mock_get_cached.return_value = (mock_client, [doc])
         mock_file_type.return_value = "pdf"
@@ -2101,13 +2367,12 @@ class TestRemarkableReadHappyPath:
         }
 
         result = await mcp.call_tool("remarkable_read", {"document": "Report.pdf"})
-        data = json.loads(result[0][0].text)
+        data = _loads(result[0][0].text)
 
         assert data["file_type"] == "pdf"
         assert "Annotation on the PDF report" in data["content"]
         assert data["name"] == "Report.pdf"
 
-    @pytest.mark.asyncio
     @patch("rm_mcp.tools._helpers._get_file_type_cached")
     @patch("rm_mcp.tools._helpers.extract_text_from_document_zip")
     @patch(_PATCH_CACHED)
@@ -2115,14 +2380,7 @@ class TestRemarkableReadHappyPath:
         """Test reading a page that doesn't exist returns page_out_of_range error."""
         mock_client = Mock()
 
-        doc = Mock()
-        doc.VissibleName = "Short Doc"
-        doc.ID = "doc-short"
-        doc.Parent = ""
-        doc.is_folder = False
-        doc.is_cloud_archived = False
-        doc.ModifiedClient = "2024-01-01T00:00:00Z"
-        doc.Type = "DocumentType"
+        doc = FakeItem("Short Doc", "doc-short", ModifiedClient="2024-01-01T00:00:00Z")
 
         mock_get_cached.return_value = (mock_client, [doc])
         mock_file_type.return_value = "notebook"
@@ -2137,7 +2395,7 @@ class TestRemarkableReadHappyPath:
         }
 
         result = await mcp.call_tool("remarkable_read", {"document": "Short Doc", "page": 999})
-        data = json.loads(result[0][0].text)
+        data = _loads(result[0][0].text)
 
         assert "_error" in data
         assert data["_error"]["type"] == "page_out_of_range"
@@ -2151,7 +2409,6 @@ class TestRemarkableReadHappyPath:
 class TestRemarkableReadGrep:
     """Test grep functionality in remarkable_read."""
 
-    @pytest.mark.asyncio
     @patch("rm_mcp.tools._helpers._get_file_type_cached")
     @patch("rm_mcp.tools._helpers.extract_text_from_document_zip")
     @patch(_PATCH_CACHED)
@@ -2186,13 +2443,12 @@ class TestRemarkableReadGrep:
             "remarkable_read",
             {"document": "Searchable Doc", "grep": "installation"},
         )
-        data = json.loads(result[0][0].text)
+        data = _loads(result[0][0].text)
 
         assert "grep_matches" in data
         assert data["grep_matches"] > 0
         assert data["grep"] == "installation"
 
-    @pytest.mark.asyncio
     @patch("rm_mcp.tools._helpers._get_file_type_cached")
     @patch("rm_mcp.tools._helpers.extract_text_from_document_zip")
     @patch(_PATCH_CACHED)
@@ -2224,12 +2480,11 @@ class TestRemarkableReadGrep:
             "remarkable_read",
             {"document": "Some Document", "grep": "quantum_physics"},
         )
-        data = json.loads(result[0][0].text)
+        data = _loads(result[0][0].text)
 
         # grep with no matches should result in empty content
         assert data.get("content") == "" or data.get("grep_matches", 0) == 0
 
-    @pytest.mark.asyncio
     @patch("rm_mcp.tools._helpers._get_file_type_cached")
     @patch("rm_mcp.tools._helpers.extract_text_from_document_zip")
     @patch(_PATCH_CACHED)
@@ -2261,7 +2516,7 @@ class TestRemarkableReadGrep:
             "remarkable_read",
             {"document": "Regex Test Doc", "grep": "[invalid"},
         )
-        data = json.loads(result[0][0].text)
+        data = _loads(result[0][0].text)
 
         assert "_error" in data
         assert data["_error"]["type"] == "invalid_grep"
@@ -2275,7 +2530,6 @@ class TestRemarkableReadGrep:
 class TestBrowseAutoRedirect:
     """Test that remarkable_browse auto-redirects to remarkable_read for documents."""
 
-    @pytest.mark.asyncio
     @patch("rm_mcp.tools.read.remarkable_read", new_callable=AsyncMock)
     @patch(_PATCH_CACHED)
     async def test_browse_redirects_to_read_for_document_path(self, mock_get_cached, mock_read):
@@ -2307,7 +2561,7 @@ class TestBrowseAutoRedirect:
         )
 
         result = await mcp.call_tool("remarkable_browse", {"path": "/My Report"})
-        data = json.loads(result[0][0].text)
+        data = _loads(result[0][0].text)
 
         assert "_redirected_from" in data
         assert data["_redirected_from"] == "browse:/My Report"
@@ -2343,6 +2597,43 @@ class TestDocumentIndex:
         assert "pages_fts" in table_names
         idx.close()
 
+    def test_file_connection_pragmas(self, tmp_path):
+        """Test that on-disk indexes use WAL with relaxed sync."""
+        from rm_mcp.index import DocumentIndex
+
+        idx = DocumentIndex(str(tmp_path / "index.db"))
+        conn = idx._get_connection()
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+        assert conn.execute("PRAGMA busy_timeout").fetchone()[0] == 5000
+        assert conn.execute("PRAGMA foreign_keys").fetchone()[0] == 1
+        idx.close()
+
+    def test_close_closes_connections_from_all_threads(self, tmp_path):
+        """Test that close() also closes connections opened on worker threads."""
+        import sqlite3
+        import threading
+
+        from rm_mcp.index import DocumentIndex
+
+        idx = DocumentIndex(str(tmp_path / "index.db"))
+        main_conn = idx._get_connection()
+        assert idx._get_connection() is main_conn
+
+        opened = []
+        worker = threading.Thread(target=lambda: opened.append(idx._get_connection()))
+        worker.start()
+        worker.join()
+        assert opened[0] is not main_conn
+
+        idx.close()
+        for conn in (main_conn, opened[0]):
+            with pytest.raises(sqlite3.ProgrammingError):
+                conn.execute("SELECT 1")
+        # The index stays usable with a fresh connection
+        assert idx._get_connection() is not main_conn
+        idx.close()
+
     def test_upsert_and_get_document_hash(self):
         """Test upserting a document and retrieving its hash."""
         idx = self._make_index()
@@ -2388,6 +2679,22 @@ class TestDocumentIndex:
         assert idx.get_page_ocr("doc-1", 1) is None
         idx.close()
 
+    def test_page_count_dropped_when_document_modified(self):
+        """Test a stored page count does not carry over to a newer version."""
+        idx = self._make_index()
+        idx.upsert_document(doc_id="doc-1", modified_at="1", page_count=5)
+        assert idx.get_page_count("doc-1", "1") == 5
+
+        # Metadata-only refresh for a new version (no count yet)
+        idx.upsert_document(doc_id="doc-1", modified_at="2")
+        assert idx.get_page_count("doc-1", "2") is None
+
+        # Same-version updates without a count keep the recorded one
+        idx.upsert_document(doc_id="doc-1", modified_at="2", page_count=7)
+        idx.upsert_document(doc_id="doc-1", modified_at="2", name="Renamed")
+        assert idx.get_page_count("doc-1", "2") == 7
+        idx.close()
+
     def test_upsert_and_get_page_ocr(self):
         """Test upserting a page and retrieving OCR content."""
         idx = self._make_index()
@@ -2528,6 +2835,71 @@ class TestDocumentIndex:
         assert len(idx.search("cats")) == 0
         idx.close()
 
+    def test_upsert_pages_bulk_single_commit(self):
+        """Test that upsert_pages_bulk writes and re-indexes all rows at once."""
+        idx = self._make_index()
+        idx.upsert_document(doc_id="doc-1", doc_hash="h1", name="Notes", path="/Notes")
+        idx.upsert_page("doc-1", 0, "stale content about cats", "typed_text")
+        version = idx.version
+
+        idx.upsert_pages_bulk(
+            [
+                ("doc-1", 0, "typed_text", "fresh content about dogs", None),
+                ("doc-1", 1, "ocr", "handwritten note about birds", "sampling"),
+            ]
+        )
+
+        assert idx.version == version + 1
+        assert len(idx.search("cats")) == 0
+        assert len(idx.search("dogs")) == 1
+        assert len(idx.search("birds")) == 1
+        assert idx.get_page_ocr("doc-1", 1, "sampling") == "handwritten note about birds"
+        idx.close()
+
+    def test_upsert_pages_bulk_duplicate_keys_keep_last(self):
+        """Test that a key repeated within one batch keeps its last row."""
+        idx = self._make_index()
+        idx.upsert_document(doc_id="d1", doc_hash="h1", name="Notes", path="/Notes")
+
+        idx.upsert_pages_bulk(
+            [
+                ("d1", 1, "ocr", "first draft about cats", "sampling"),
+                ("d1", 1, "ocr", "final text about dogs", "sampling"),
+            ]
+        )
+
+        conn = idx._get_connection()
+        assert not conn.in_transaction
+        assert idx.get_page_ocr("d1", 1, "sampling") == "final text about dogs"
+        assert len(idx.search("dogs")) == 1
+        assert len(idx.search("cats")) == 0
+        assert conn.execute("SELECT COUNT(*) FROM pages_fts").fetchone()[0] == 1
+        idx.close()
+
+    def test_upsert_pages_bulk_rolls_back_on_error(self):
+        """Test that a failed batch leaves no half-applied writes behind."""
+        import sqlite3
+
+        idx = self._make_index()
+        idx.upsert_document(doc_id="d1", doc_hash="h1")
+        idx.upsert_page("d1", 0, "kept", "typed_text")
+
+        with pytest.raises(sqlite3.IntegrityError):
+            # The unknown document fails its foreign key after d1's FTS
+            # entry was already deleted and its page rewritten
+            idx.upsert_pages_bulk(
+                [
+                    ("d1", 0, "typed_text", "replaced", None),
+                    ("ghost", 0, "typed_text", "orphan", None),
+                ]
+            )
+
+        conn = idx._get_connection()
+        assert not conn.in_transaction
+        assert conn.execute("SELECT COUNT(*) FROM pages_fts").fetchone()[0] == 1
+        assert len(idx.search("kept")) == 1
+        idx.close()
+
     def test_get_stats(self):
         """Test get_stats returns correct counts."""
         idx = self._make_index()
@@ -2613,7 +2985,6 @@ class TestDocumentIndexSingleton:
 class TestSearchWithFTS:
     """Test remarkable_search tool with FTS5 integration."""
 
-    @pytest.mark.asyncio
     @patch("rm_mcp.tools.read.remarkable_read")
     @patch(_PATCH_CACHED)
     async def test_search_returns_fts_content_matches(self, mock_get_cached, mock_read):
@@ -2661,7 +3032,7 @@ class TestSearchWithFTS:
             )
 
             result = await mcp.call_tool("remarkable_search", {"query": "budget"})
-            data = json.loads(result[0][0].text)
+            data = _loads(result[0][0].text)
 
             assert data["count"] >= 1
             match_types = [d.get("match_type") for d in data["documents"]]
@@ -2675,7 +3046,6 @@ class TestSearchWithFTS:
             index_mod.close()
             index_mod._instance = saved
 
-    @pytest.mark.asyncio
     @patch(_PATCH_CACHED)
     async def test_search_fts_only_results(self, mock_get_cached):
         """Test search returns FTS results even when no name matches exist."""
@@ -2703,7 +3073,7 @@ class TestSearchWithFTS:
             mock_get_cached.return_value = (mock_client, [])
 
             result = await mcp.call_tool("remarkable_search", {"query": "photosynthesis"})
-            data = json.loads(result[0][0].text)
+            data = _loads(result[0][0].text)
 
             assert data["count"] == 1
             assert data["documents"][0]["match_type"] == "content"
@@ -2716,7 +3086,6 @@ class TestSearchWithFTS:
 class TestStatusWithIndex:
     """Test remarkable_status shows index stats."""
 
-    @pytest.mark.asyncio
     @patch(_PATCH_CACHED)
     async def test_status_includes_index_stats(self, mock_get_cached):
         """Test that status includes index statistics when index is available."""
@@ -2733,7 +3102,7 @@ class TestStatusWithIndex:
             mock_get_cached.return_value = (mock_client, [])
 
             result = await mcp.call_tool("remarkable_status", {})
-            data = json.loads(result[0][0].text)
+            data = _loads(result[0][0].text)
 
             assert data["authenticated"] is True
             assert "index_documents" in data
@@ -2826,6 +3195,116 @@ class TestCacheL2Integration:
             index_mod.close()
             index_mod._instance = saved
 
+    def test_page_count_l2_round_trip(self):
+        """Test that page counts are written to L2 and invalidated on modification."""
+        import rm_mcp.index as index_mod
+        from rm_mcp.cache import _page_count_cache, cache_page_count, get_cached_page_count
+
+        saved = index_mod._instance
+        index_mod._instance = None
+        idx = index_mod.initialize(":memory:")
+        try:
+            cache_page_count("doc-1", "2024-01-15T10:30:00Z", 12)
+            assert idx.get_page_count("doc-1", "2024-01-15T10:30:00Z") == 12
+
+            # L1 miss falls back to L2
+            _page_count_cache.pop("doc-1", None)
+            assert get_cached_page_count("doc-1", "2024-01-15T10:30:00Z") == 12
+
+            # A newer version of the document is a miss
+            assert get_cached_page_count("doc-1", "2024-02-01T00:00:00Z") is None
+        finally:
+            _page_count_cache.pop("doc-1", None)
+            index_mod.close()
+            index_mod._instance = saved
+
+    @patch(_PATCH_CACHED)
+    async def test_sampling_cache_hit_skips_download(self, mock_get_cached):
+        """Test that cached page OCR plus cached page count avoids a download."""
+        from rm_mcp.cache import (
+            _page_count_cache,
+            _page_ocr_cache,
+            cache_page_count,
+            cache_page_ocr,
+        )
+        from rm_mcp.tools.read import remarkable_read
+
+        mock_client = Mock()
+        doc = Mock()
+        doc.VissibleName = "Handwritten"
+        doc.ID = "doc-pc"
+        doc.Parent = ""
+        doc.is_folder = False
+        doc.ModifiedClient = "2024-01-15T10:30:00Z"
+        mock_get_cached.return_value = (mock_client, [doc])
+
+        cache_page_ocr("doc-pc", 2, "sampling", "Cached OCR text")
+        cache_page_count("doc-pc", doc.ModifiedClient, 3)
+        try:
+            with (
+                patch("rm_mcp.tools._helpers._get_file_type_cached", return_value="notebook"),
+                patch("rm_mcp.tools._helpers.should_use_sampling_ocr", return_value=True),
+            ):
+                result = await remarkable_read("Handwritten", page=2, include_ocr=True, ctx=Mock())
+            data = json.loads(result)
+        finally:
+            _page_ocr_cache.pop(("doc-pc", 2, "sampling"), None)
+            _page_count_cache.pop("doc-pc", None)
+
+        mock_client.download.assert_not_called()
+        assert data["content"] == "Cached OCR text"
+        assert data["total_pages"] == 3
+
+    async def _read_all_with_sampling(self, page_text: str, page_count: int = 200):
+        """Read pages='all' of a sampling-OCR notebook, counting OCR requests."""
+        from rm_mcp.tools.read import remarkable_read
+
+        mock_client = Mock()
+        mock_client.download.return_value = b"fake-zip"
+        doc = FakeItem("Long Notebook", "doc-long", ModifiedClient="2024-01-15T10:30:00Z")
+        ocr_calls = []
+
+        async def fake_ocr(ctx, png_data):
+            ocr_calls.append(png_data)
+            return page_text
+
+        with (
+            patch(_PATCH_CACHED, return_value=(mock_client, [doc])),
+            patch("rm_mcp.tools._helpers._get_file_type_cached", return_value="notebook"),
+            patch("rm_mcp.tools._helpers.should_use_sampling_ocr", return_value=True),
+            patch("rm_mcp.tools._helpers.get_document_page_count", return_value=page_count),
+            patch("rm_mcp.tools._helpers.render_page_from_document_zip", return_value=b"png"),
+            patch("rm_mcp.tools._helpers.ocr_via_sampling", side_effect=fake_ocr),
+        ):
+            result = await remarkable_read(
+                "Long Notebook", pages="all", include_ocr=True, ctx=Mock()
+            )
+        return _loads(result), len(ocr_calls)
+
+    async def test_sampling_multi_page_stops_at_output_cap(self):
+        """Test that multi-page sampling OCR stops once the output cap is covered."""
+        from rm_mcp.tools import _helpers
+
+        with patch.object(_helpers, "MAX_OUTPUT_CHARS", 3000):
+            data, calls = await self._read_all_with_sampling("x" * 1000)
+
+        # Three pages cover the cap; only the batch that crossed it ran
+        assert calls == _helpers._MAX_CONCURRENT_SAMPLING
+        assert data["truncated"] is True
+        assert data["pages"] == [1, 2, 3]
+
+    async def test_sampling_multi_page_defers_pages_past_budget(self):
+        """Test that short pages stop at the per-read OCR budget, with a hint to continue."""
+        from rm_mcp.tools.read import _MAX_SAMPLING_PAGES_PER_READ
+
+        data, calls = await self._read_all_with_sampling("short")
+
+        assert calls == _MAX_SAMPLING_PAGES_PER_READ
+        assert data["pages"] == list(range(1, _MAX_SAMPLING_PAGES_PER_READ + 1))
+        assert data["truncated"] is True
+        next_page = _MAX_SAMPLING_PAGES_PER_READ + 1
+        assert f"pages='{next_page}-200'" in data["_hint"]
+
 
 # =============================================================================
 # Test Compact Mode
@@ -2842,6 +3321,12 @@ class TestCompactMode:
         assert parsed["key"] == "value"
         assert "_hint" not in parsed
 
+    def test_make_response_compact_drops_none_fields(self):
+        """Test that compact responses drop None fields and indentation."""
+        result = make_response({"key": "value", "grep": None}, "hint", compact=True)
+        assert json.loads(result) == {"key": "value"}
+        assert "\n" not in result
+
     def test_make_response_non_compact_includes_hint(self):
         """Test that make_response with compact=False includes _hint."""
         result = make_response({"key": "value"}, "This is a hint", compact=False)
@@ -2882,15 +3367,10 @@ class TestCompactMode:
         with patch.dict(os.environ, {"REMARKABLE_COMPACT": "0"}):
             assert is_compact(False) is False
 
-    @pytest.mark.asyncio
-    @patch(_PATCH_CACHED)
-    async def test_tool_with_compact_output(self, mock_get_cached):
+    async def test_tool_with_compact_output(self, mock_cached_empty):
         """Test that a tool with compact_output=True omits _hint."""
-        mock_client = Mock()
-        mock_get_cached.return_value = (mock_client, [])
-
         result = await mcp.call_tool("remarkable_status", {"compact_output": True})
-        data = json.loads(result[0][0].text)
+        data = _loads(result[0][0].text)
 
         assert data["authenticated"] is True
         assert "_hint" not in data
@@ -2907,44 +3387,204 @@ class TestParsePages:
     def test_all(self):
         from rm_mcp.tools._helpers import parse_pages
 
-        assert parse_pages("all", 5) == [1, 2, 3, 4, 5]
+        assert list(parse_pages("all", 5)) == [1, 2, 3, 4, 5]
 
     def test_range(self):
         from rm_mcp.tools._helpers import parse_pages
 
-        assert parse_pages("1-3", 10) == [1, 2, 3]
+        assert list(parse_pages("1-3", 10)) == [1, 2, 3]
 
     def test_individual(self):
         from rm_mcp.tools._helpers import parse_pages
 
-        assert parse_pages("2,4,5", 10) == [2, 4, 5]
+        assert list(parse_pages("2,4,5", 10)) == [2, 4, 5]
 
     def test_mixed(self):
         from rm_mcp.tools._helpers import parse_pages
 
-        assert parse_pages("1-3,5", 10) == [1, 2, 3, 5]
+        assert list(parse_pages("1-3,5", 10)) == [1, 2, 3, 5]
 
     def test_out_of_range_clamped(self):
         from rm_mcp.tools._helpers import parse_pages
 
         result = parse_pages("1-100", 5)
-        assert result == [1, 2, 3, 4, 5]
+        assert list(result) == [1, 2, 3, 4, 5]
 
     def test_invalid_input(self):
         from rm_mcp.tools._helpers import parse_pages
 
-        assert parse_pages("abc", 5) == []
+        assert list(parse_pages("abc", 5)) == []
 
     def test_empty_string(self):
         from rm_mcp.tools._helpers import parse_pages
 
-        assert parse_pages("", 5) == []
+        assert list(parse_pages("", 5)) == []
 
     def test_below_range(self):
         from rm_mcp.tools._helpers import parse_pages
 
         result = parse_pages("0", 5)
-        assert result == []
+        assert list(result) == []
+
+    def test_contiguous_specs_return_range(self):
+        from rm_mcp.tools._helpers import parse_pages
+
+        assert parse_pages("all", 500) == range(1, 501)
+        assert parse_pages("2-4", 10) == range(2, 5)
+        assert parse_pages("2,4", 10) == (2, 4)
+
+    def test_results_are_cached(self):
+        from rm_mcp.tools._helpers import parse_pages
+
+        assert parse_pages("1-3,5", 10) is parse_pages("1-3,5", 10)
+
+
+class TestGrepWindows:
+    """Test grep matching and context windows."""
+
+    def test_literal_matches_regex_spans(self):
+        import re
+
+        from rm_mcp.tools._helpers import _is_literal_pattern, _match_spans
+
+        text = "TODO: first\nnothing\ntodo second todo"
+        assert _is_literal_pattern("todo")
+        expected = [m.span() for m in re.finditer("todo", text, re.IGNORECASE)]
+        assert list(_match_spans(text, "todo")) == expected
+
+    def test_regex_pattern_uses_regex(self):
+        from rm_mcp.tools._helpers import _is_literal_pattern, _match_spans
+
+        assert not _is_literal_pattern("fi.st")
+        assert list(_match_spans("first fist", "fi.st")) == [(0, 5)]
+
+    def test_empty_pattern_terminates(self):
+        from rm_mcp.tools._helpers import _is_literal_pattern, count_grep_matches
+
+        assert not _is_literal_pattern("")
+        # Zero-width matches at each position, as re.findall gives
+        assert count_grep_matches("abc", "") == 4
+
+    def test_count_grep_matches_agrees_with_findall(self):
+        import re
+
+        from rm_mcp.tools._helpers import count_grep_matches
+
+        text = "TODO: first\nnothing\ntodo second todo"
+        for grep in ["todo", "t.do", "^todo"]:
+            expected = len(re.findall(grep, text, re.IGNORECASE | re.MULTILINE))
+            assert count_grep_matches(text, grep) == expected
+
+    def test_compile_prefers_re2(self):
+        import rm_mcp.tools._helpers as helpers_mod
+
+        fake_re2 = Mock()
+        fake_re2.error = ValueError
+        helpers_mod.compile_grep.cache_clear()
+        with patch.object(helpers_mod, "re2", fake_re2):
+            assert helpers_mod.compile_grep("a+b") is fake_re2.compile.return_value
+        helpers_mod.compile_grep.cache_clear()
+        fake_re2.compile.assert_called_once_with("(?im)a+b")
+
+    def test_compile_falls_back_when_re2_rejects(self):
+        import re
+
+        import rm_mcp.tools._helpers as helpers_mod
+
+        fake_re2 = Mock()
+        fake_re2.error = ValueError
+        fake_re2.compile.side_effect = ValueError("backreferences not supported")
+        helpers_mod.compile_grep.cache_clear()
+        with patch.object(helpers_mod, "re2", fake_re2):
+            pattern = helpers_mod.compile_grep(r"(a)\1")
+        helpers_mod.compile_grep.cache_clear()
+        assert isinstance(pattern, re.Pattern)
+        assert pattern.search("xAA")
+
+    def test_compiled_patterns_are_cached(self):
+        from rm_mcp.tools._helpers import compile_grep
+
+        assert compile_grep("cach(e|ed)") is compile_grep("cach(e|ed)")
+
+    def test_invalid_regex_raises(self):
+        import re
+
+        from rm_mcp.tools._helpers import _match_spans
+
+        with pytest.raises(re.error):
+            list(_match_spans("text", "[unclosed"))
+
+    def test_max_matches_stops_counting_once_full(self):
+        from rm_mcp.tools._helpers import grep_windows
+
+        text = " ".join(["match"] * 100)
+        combined, count, truncated = grep_windows(
+            text, "match", window=0, max_chars=20, max_matches=30
+        )
+        assert truncated is True
+        assert count == 30
+        assert combined.startswith("match...")
+
+    def test_min_length(self):
+        from rm_mcp.tools._helpers import grep_min_length, grep_windows
+
+        assert grep_min_length("installation") == 12
+        assert grep_min_length("(ab|c)d?") == 1
+        assert grep_min_length("x*") == 0
+        assert grep_min_length("[unclosed") == 0
+        assert grep_windows("install", "installation") == ("", 0, False)
+
+    def test_windows_with_ellipses_and_separator(self):
+        from rm_mcp.tools._helpers import grep_windows
+
+        text = "a" * 20 + "needle" + "b" * 20 + "needle"
+        combined, count, truncated = grep_windows(text, "needle", window=5)
+        assert combined == "...aaaaaneedlebbbbb...\n\n---\n\n...bbbbbneedle"
+        assert count == 2
+        assert truncated is False
+
+    def test_windows_capped_but_still_counted(self):
+        from rm_mcp.tools._helpers import grep_windows
+
+        text = " ".join(["match"] * 10)
+        combined, count, truncated = grep_windows(text, "match", window=0, max_chars=20)
+        assert count == 10
+        assert truncated is True
+        assert len(combined) <= 20
+        assert combined.startswith("match...")
+
+    def test_oversized_first_window_is_shrunk_not_dropped(self):
+        from rm_mcp.tools._helpers import grep_windows
+
+        text = "x" * 5000 + "needle" + "y" * 5000
+        combined, count, truncated = grep_windows(text, "needle", window=3000, max_chars=2000)
+        assert count == 1
+        assert truncated is True
+        assert len(combined) == 2000
+        assert "needle" in combined
+        assert combined.startswith("...") and combined.endswith("...")
+
+
+class TestSliceParts:
+    """Test slicing combined text parts without joining them."""
+
+    def test_matches_joined_slice(self):
+        from rm_mcp.tools.read import _part_offsets, _slice_parts
+
+        parts = ["alpha", "", "bravo charlie", "d"]
+        joined = "\n\n".join(parts)
+        starts, total = _part_offsets(parts)
+        assert total == len(joined)
+        for start in range(total + 2):
+            for end in range(start, total + 3):
+                assert _slice_parts(parts, starts, start, end) == joined[start:end]
+
+    def test_empty_parts(self):
+        from rm_mcp.tools.read import _part_offsets, _slice_parts
+
+        starts, total = _part_offsets([])
+        assert total == 0
+        assert _slice_parts([], starts, 0, 10) == ""
 
 
 # =============================================================================
@@ -2955,7 +3595,6 @@ class TestParsePages:
 class TestMultiPageRead:
     """Test multi-page read functionality."""
 
-    @pytest.mark.asyncio
     @patch("rm_mcp.tools._helpers._get_file_type_cached")
     @patch("rm_mcp.tools._helpers.extract_text_from_document_zip")
     @patch(_PATCH_CACHED)
@@ -2986,7 +3625,7 @@ class TestMultiPageRead:
         result = await mcp.call_tool(
             "remarkable_read", {"document": "Multi Page Notes", "pages": "all"}
         )
-        data = json.loads(result[0][0].text)
+        data = _loads(result[0][0].text)
 
         assert "pages" in data
         assert data["pages"] == [1, 2, 3]
@@ -2994,8 +3633,12 @@ class TestMultiPageRead:
         assert "Page one content" in data["content"]
         assert "Page two content" in data["content"]
         assert "Page three content" in data["content"]
+        assert data["content"] == (
+            "--- Page 1 ---\nPage one content\n\n"
+            "--- Page 2 ---\nPage two content\n\n"
+            "--- Page 3 ---\nPage three content"
+        )
 
-    @pytest.mark.asyncio
     @patch("rm_mcp.tools._helpers._get_file_type_cached")
     @patch("rm_mcp.tools._helpers.extract_text_from_document_zip")
     @patch(_PATCH_CACHED)
@@ -3023,7 +3666,7 @@ class TestMultiPageRead:
         }
 
         result = await mcp.call_tool("remarkable_read", {"document": "Range Notes", "pages": "2-4"})
-        data = json.loads(result[0][0].text)
+        data = _loads(result[0][0].text)
 
         assert data["pages"] == [2, 3, 4]
         assert "P2" in data["content"]
@@ -3031,7 +3674,6 @@ class TestMultiPageRead:
         assert "P4" in data["content"]
         assert "P1" not in data["content"]
 
-    @pytest.mark.asyncio
     @patch("rm_mcp.tools._helpers._get_file_type_cached")
     @patch("rm_mcp.tools._helpers.extract_text_from_document_zip")
     @patch(_PATCH_CACHED)
@@ -3059,11 +3701,45 @@ class TestMultiPageRead:
         }
 
         result = await mcp.call_tool("remarkable_read", {"document": "Full PDF", "pages": "all"})
-        data = json.loads(result[0][0].text)
+        data = _loads(result[0][0].text)
 
         assert data["more"] is False
         assert "Full PDF annotation content" in data["content"]
 
+    @patch("rm_mcp.tools._helpers.MAX_OUTPUT_CHARS", 30)
+    @patch("rm_mcp.tools._helpers._get_file_type_cached")
+    @patch("rm_mcp.tools._helpers.extract_text_from_document_zip")
+    @patch(_PATCH_CACHED)
+    async def test_pdf_pages_all_truncated(self, mock_get_cached, mock_extract, mock_file_type):
+        """Test pages='all' on a PDF is cut at the output character limit."""
+        mock_client = Mock()
+
+        doc = Mock()
+        doc.VissibleName = "Long PDF"
+        doc.ID = "doc-longpdf"
+        doc.Parent = ""
+        doc.is_folder = False
+        doc.is_cloud_archived = False
+        doc.ModifiedClient = "2024-01-01T00:00:00Z"
+
+        mock_get_cached.return_value = (mock_client, [doc])
+        mock_file_type.return_value = "pdf"
+        mock_client.download.return_value = b"fake-zip"
+
+        parts = ["First annotation block", "Second annotation block", "Third block"]
+        mock_extract.return_value = {
+            "typed_text": parts,
+            "highlights": [],
+            "handwritten_text": [],
+            "pages": 1,
+        }
+
+        result = await mcp.call_tool("remarkable_read", {"document": "Long PDF", "pages": "all"})
+        data = _loads(result[0][0].text)
+
+        assert data["content"] == "\n\n".join(parts)[:30]
+        assert data["truncated"] is True
+
 
 # =============================================================================
 # Test Grep Auto-Redirect
@@ -3073,7 +3749,6 @@ class TestMultiPageRead:
 class TestGrepAutoRedirect:
     """Test grep auto-redirect functionality in remarkable_read."""
 
-    @pytest.mark.asyncio
     @patch("rm_mcp.tools._helpers._get_file_type_cached")
     @patch("rm_mcp.tools._helpers.extract_text_from_document_zip")
     @patch(_PATCH_CACHED)
@@ -3110,7 +3785,7 @@ class TestGrepAutoRedirect:
             "remarkable_read",
             {"document": "Redirect Test", "page": 1, "grep": "keyword"},
         )
-        data = json.loads(result[0][0].text)
+        data = _loads(result[0][0].text)
 
         # Should auto-redirect to page 3 (where "keyword" is found)
         assert data["page"] == 3
@@ -3118,7 +3793,6 @@ class TestGrepAutoRedirect:
         assert data["grep_matches"] > 0
         assert "keyword" in data["content"]
 
-    @pytest.mark.asyncio
     @patch("rm_mcp.tools._helpers._get_file_type_cached")
     @patch("rm_mcp.tools._helpers.extract_text_from_document_zip")
     @patch(_PATCH_CACHED)
@@ -3151,7 +3825,7 @@ class TestGrepAutoRedirect:
             "remarkable_read",
             {"document": "No Match Doc", "grep": "nonexistent_term_xyz"},
         )
-        data = json.loads(result[0][0].text)
+        data = _loads(result[0][0].text)
 
         assert "_error" in data
         assert data["_error"]["type"] == "no_grep_matches"
@@ -3165,7 +3839,6 @@ class TestGrepAutoRedirect:
 class TestSearchPerformance:
     """Test that search avoids unnecessary downloads."""
 
-    @pytest.mark.asyncio
     @patch(_PATCH_CACHED)
     async def test_search_without_grep_no_download(self, mock_get_cached):
         """Test that search without grep does not call remarkable_read or download."""
@@ -3182,7 +3855,7 @@ class TestSearchPerformance:
         mock_get_cached.return_value = (mock_client, [doc])
 
         result = await mcp.call_tool("remarkable_search", {"query": "Test"})
-        data = json.loads(result[0][0].text)
+        data = _loads(result[0][0].text)
 
         assert data["count"] == 1
         assert data["documents"][0]["match_type"] == "name"
@@ -3190,8 +3863,7 @@ class TestSearchPerformance:
         assert "content" not in data["documents"][0]
         mock_client.download.assert_not_called()
 
-    @pytest.mark.asyncio
-    @patch("rm_mcp.tools.read.remarkable_read")
+    @patch("rm_mcp.tools.read._read_document")
     @patch(_PATCH_CACHED)
     async def test_search_with_grep_downloads(self, mock_get_cached, mock_read):
         """Test that search with grep falls back to download when no L2 cache."""
@@ -3207,19 +3879,17 @@ class TestSearchPerformance:
 
         mock_get_cached.return_value = (mock_client, [doc])
 
-        mock_read.return_value = json.dumps(
-            {
-                "content": "Found the pattern here",
-                "total_pages": 1,
-                "name": "Grep Doc",
-                "path": "/Grep Doc",
-                "grep": "pattern",
-                "grep_matches": 1,
-            }
-        )
+        mock_read.return_value = {
+            "content": "Found the pattern here",
+            "total_pages": 1,
+            "name": "Grep Doc",
+            "path": "/Grep Doc",
+            "grep": "pattern",
+            "grep_matches": 1,
+        }
 
         result = await mcp.call_tool("remarkable_search", {"query": "Grep", "grep": "pattern"})
-        data = json.loads(result[0][0].text)
+        data = _loads(result[0][0].text)
 
         assert data["count"] == 1
         assert data["documents"][0].get("grep_matches", 0) >= 0
@@ -3233,7 +3903,6 @@ class TestSearchPerformance:
 class TestL2Preview:
     """Test L2 index preview for recent and search."""
 
-    @pytest.mark.asyncio
     @patch(_PATCH_CACHED)
     async def test_recent_preview_from_index(self, mock_get_cached):
         """Test that recent uses L2 index for preview."""
@@ -3263,7 +3932,7 @@ class TestL2Preview:
                 result = await mcp.call_tool(
                     "remarkable_recent", {"limit": 5, "include_preview": True}
                 )
-                data = json.loads(result[0][0].text)
+                data = _loads(result[0][0].text)
 
             assert data["count"] == 1
             assert "preview" in data["documents"][0]
@@ -3274,6 +3943,41 @@ class TestL2Preview:
             index_mod.close()
             index_mod._instance = saved
 
+    @patch(_PATCH_CACHED)
+    async def test_search_grep_from_index_flags_capped_count(self, mock_get_cached):
+        """Test that L2 grep reports a capped match count as capped."""
+        import rm_mcp.index as index_mod
+
+        saved = index_mod._instance
+        index_mod._instance = None
+        idx = index_mod.initialize(":memory:")
+        try:
+            mock_client = Mock()
+            busy = FakeItem("Busy Doc", "doc-busy", ModifiedClient="2024-06-01T00:00:00Z")
+            quiet = FakeItem("Busy Log", "doc-quiet", ModifiedClient="2024-06-01T00:00:00Z")
+            mock_get_cached.return_value = (mock_client, [busy, quiet])
+
+            idx.upsert_document(doc_id="doc-busy", doc_hash="h1")
+            idx.upsert_page("doc-busy", 0, "hit " * 600, "typed_text")
+            idx.upsert_document(doc_id="doc-quiet", doc_hash="h2")
+            idx.upsert_page("doc-quiet", 0, "hit " * 500, "typed_text")
+
+            with patch("rm_mcp.tools._helpers._get_file_type_cached", return_value="notebook"):
+                result = await mcp.call_tool("remarkable_search", {"query": "Busy", "grep": "hit"})
+                data = _loads(result[0][0].text)
+
+            docs = {d["name"]: d for d in data["documents"]}
+            assert docs["Busy Doc"]["grep_matches"] == 500
+            assert docs["Busy Doc"]["grep_matches_capped"] is True
+            # Exactly at the cap is still an exact count
+            assert docs["Busy Log"]["grep_matches"] == 500
+            assert "grep_matches_capped" not in docs["Busy Log"]
+            assert "at least 1000 grep match(es)" in data["_hint"]
+            mock_client.download.assert_not_called()
+        finally:
+            index_mod.close()
+            index_mod._instance = saved
+
 
 # =============================================================================
 # Test Index New Methods
@@ -3317,6 +4021,19 @@ class TestIndexNewMethods:
         assert len(snippet) == 10
         idx.close()
 
+    def test_get_content_snippets_batch(self):
+        idx = self._make_index()
+        idx.upsert_document(doc_id="d1", doc_hash="h1")
+        idx.upsert_document(doc_id="d2", doc_hash="h2")
+        idx.upsert_document(doc_id="d3", doc_hash="h3")
+        idx.upsert_page("d1", 1, "Second page", "typed_text")
+        idx.upsert_page("d1", 0, "First page", "typed_text")
+        idx.upsert_page("d2", 0, "Other doc", "typed_text")
+        snippets = idx.get_content_snippets(["d1", "d2", "d3", "missing"], max_chars=100)
+        assert snippets == {"d1": idx.get_content_snippet("d1", 100), "d2": "Other doc"}
+        assert snippets["d1"] == "First page\n\nSecond page"
+        assert idx.get_content_snippets([]) == {}
+
     def test_get_content_snippet_none_when_empty(self):
         idx = self._make_index()
         idx.upsert_document(doc_id="d1", doc_hash="h1")
@@ -3336,6 +4053,47 @@ class TestIndexNewMethods:
         assert idx.get_indexed_document_count() == 2
         idx.close()
 
+    def test_counts_cached_until_next_write(self):
+        idx = self._make_index()
+        idx.upsert_document(doc_id="d1", doc_hash="h1")
+        idx.upsert_page("d1", 0, "content", "typed_text")
+        assert idx.get_indexed_document_count() == 1
+        assert idx.get_stats()["index_pages"] == 1
+
+        statements = []
+        idx._get_connection().set_trace_callback(statements.append)
+        assert idx.get_indexed_document_count() == 1
+        assert idx.get_stats()["index_documents"] == 1
+        idx._get_connection().set_trace_callback(None)
+        assert not [sql for sql in statements if "COUNT" in sql]
+
+        stats = idx.get_stats()
+        stats["index_pages"] = 99  # callers get a copy
+        assert idx.get_stats()["index_pages"] == 1
+
+        idx.clear()
+        assert idx.get_indexed_document_count() == 0
+        assert idx.get_stats()["index_pages"] == 0
+        idx.close()
+
+    def test_counts_see_writes_from_other_connections(self, tmp_path):
+        from rm_mcp.index import DocumentIndex
+
+        db_path = str(tmp_path / "index.db")
+        reader = DocumentIndex(db_path)
+        writer = DocumentIndex(db_path)
+        assert reader.get_indexed_document_count() == 0
+
+        writer.upsert_document(doc_id="d1", doc_hash="h1")
+        writer.upsert_page("d1", 0, "content", "typed_text")
+        assert reader.get_indexed_document_count() == 1
+        reader_stats = reader.get_stats()
+
+        writer.upsert_page("d1", 1, "more", "typed_text")
+        assert reader.get_stats()["index_pages"] == reader_stats["index_pages"] + 1
+        reader.close()
+        writer.close()
+
 
 # =============================================================================
 # Test Auto-OCR Opt-Out
@@ -3345,7 +4103,6 @@ class TestIndexNewMethods:
 class TestAutoOcrOptOut:
     """Test auto_ocr=False prevents OCR auto-retry."""
 
-    @pytest.mark.asyncio
     @patch("rm_mcp.tools._helpers._get_file_type_cached")
     @patch("rm_mcp.tools._helpers.extract_text_from_document_zip")
     @patch(_PATCH_CACHED)
@@ -3378,7 +4135,7 @@ class TestAutoOcrOptOut:
             "remarkable_read",
             {"document": "Empty Notebook", "auto_ocr": False},
         )
-        data = json.loads(result[0][0].text)
+        data = _loads(result[0][0].text)
 
         # Should return empty content without OCR auto-retry
         assert data.get("content") == ""
@@ -3454,15 +4211,10 @@ class TestSuggestForError:
 class TestStatusConfig:
     """Test that status tool includes configuration details."""
 
-    @pytest.mark.asyncio
-    @patch(_PATCH_CACHED)
-    async def test_status_includes_config(self, mock_get_cached):
+    async def test_status_includes_config(self, mock_cached_empty):
         """Test that authenticated status includes config section."""
-        mock_client = Mock()
-        mock_get_cached.return_value = (mock_client, [])
-
         result = await mcp.call_tool("remarkable_status", {})
-        data = json.loads(result[0][0].text)
+        data = _loads(result[0][0].text)
 
         assert data["authenticated"] is True
         assert "config" in data
@@ -3473,15 +4225,10 @@ class TestStatusConfig:
         assert "cache_ttl_seconds" in config
         assert "compact_mode" in config
 
-    @pytest.mark.asyncio
-    @patch(_PATCH_CACHED)
-    async def test_status_config_values(self, mock_get_cached):
+    async def test_status_config_values(self, mock_cached_empty):
         """Test that config values are sensible defaults."""
-        mock_client = Mock()
-        mock_get_cached.return_value = (mock_client, [])
-
         result = await mcp.call_tool("remarkable_status", {})
-        data = json.loads(result[0][0].text)
+        data = _loads(result[0][0].text)
 
         config = data["config"]
         assert config["ocr_backend"] == "sampling"
@@ -3499,7 +4246,6 @@ class TestStatusConfig:
 class TestOCRUnavailableMessage:
     """Test differentiated OCR failure messages in image tool."""
 
-    @pytest.mark.asyncio
     @patch("rm_mcp.tools._helpers.should_use_sampling_ocr", return_value=False)
     @patch("rm_mcp.tools._helpers.render_page_from_document_zip")
     @patch("rm_mcp.tools._helpers.get_document_page_count", return_value=3)
@@ -3550,7 +4296,6 @@ class TestOCRUnavailableMessage:
 class TestAnnotationsMode:
     """Test remarkable_read with content_type='annotations'."""
 
-    @pytest.mark.asyncio
     @patch("rm_mcp.tools._helpers._get_file_type_cached")
     @patch("rm_mcp.tools._helpers.extract_text_from_document_zip")
     @patch(_PATCH_CACHED)
@@ -3584,7 +4329,7 @@ class TestAnnotationsMode:
             "remarkable_read",
             {"document": "Annotated Doc", "content_type": "annotations"},
         )
-        data = json.loads(result[0][0].text)
+        data = _loads(result[0][0].text)
 
         assert "content" in data
         assert data["content_type"] == "annotations"
@@ -3594,7 +4339,6 @@ class TestAnnotationsMode:
         # annotations mode should NOT have the "=== Annotations ===" separator
         assert "=== Annotations ===" not in data["content"]
 
-    @pytest.mark.asyncio
     @patch("rm_mcp.tools._helpers._get_file_type_cached")
     @patch("rm_mcp.tools._helpers.extract_text_from_document_zip")
     @patch(_PATCH_CACHED)
@@ -3626,7 +4370,7 @@ class TestAnnotationsMode:
             "remarkable_read",
             {"document": "Empty Annot Doc", "content_type": "annotations"},
         )
-        data = json.loads(result[0][0].text)
+        data = _loads(result[0][0].text)
 
         assert data["content"] == ""
         assert data["content_type"] == "annotations"
@@ -3641,7 +4385,6 @@ class TestAnnotationsMode:
 class TestImageSVG:
     """Test remarkable_image with SVG output format."""
 
-    @pytest.mark.asyncio
     @patch("rm_mcp.tools._helpers.render_page_from_document_zip_svg")
     @patch("rm_mcp.tools._helpers.get_document_page_count", return_value=3)
     @patch(_PATCH_CACHED)
@@ -3673,7 +4416,6 @@ class TestImageSVG:
         assert data["page"] == 1
         assert data["total_pages"] == 3
 
-    @pytest.mark.asyncio
     @patch("rm_mcp.tools._helpers.render_page_from_document_zip_svg")
     @patch("rm_mcp.tools._helpers.get_document_page_count", return_value=2)
     @patch(_PATCH_CACHED)
@@ -3708,7 +4450,6 @@ class TestImageSVG:
         assert hasattr(result[1], "resource")
         assert result[1].resource.mimeType == "image/svg+xml"
 
-    @pytest.mark.asyncio
     @patch("rm_mcp.tools._helpers.render_page_from_document_zip_svg")
     @patch("rm_mcp.tools._helpers.get_document_page_count", return_value=1)
     @patch(_PATCH_CACHED)
@@ -3776,7 +4517,6 @@ class TestCacheValidity:
 class TestNotebookPageCount:
     """Test that notebooks with no text still report the correct total_pages."""
 
-    @pytest.mark.asyncio
     @patch("rm_mcp.tools._helpers._get_file_type_cached")
     @patch("rm_mcp.tools._helpers.extract_text_from_document_zip")
     @patch(_PATCH_CACHED)
@@ -3811,13 +4551,12 @@ class TestNotebookPageCount:
             "remarkable_read",
             {"document": "Prototyper Design", "auto_ocr": False},
         )
-        data = json.loads(result[0][0].text)
+        data = _loads(result[0][0].text)
 
         assert data["total_pages"] == 16
         assert data["total_chars"] == 0
         assert data["page"] == 1
 
-    @pytest.mark.asyncio
     @patch("rm_mcp.tools._helpers._get_file_type_cached")
     @patch("rm_mcp.tools._helpers.extract_text_from_document_zip")
     @patch(_PATCH_CACHED)
@@ -3851,7 +4590,7 @@ class TestNotebookPageCount:
             "remarkable_read",
             {"document": "Prototyper Design", "page": 20, "auto_ocr": False},
         )
-        data = json.loads(result[0][0].text)
+        data = _loads(result[0][0].text)
 
         assert data["_error"]["type"] == "page_out_of_range"
         assert "16 page(s)" in data["_error"]["message"]